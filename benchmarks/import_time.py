@@ -0,0 +1,48 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['pandas', 'pyarrow', 'openpyxl', 'playwright', 'aiohttp', 'fake_useragent', 'tkinter']
+
+SNIPPETS = {
+    'import main': 'import main',
+    'HHApiClient()': 'import main; main.HHApiClient(areas_path=None)',
+    'HHParser()': 'import main; main.HHParser(cache_path=None)',
+}
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+{snippet}
+elapsed = time.perf_counter() - started
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(f"{{elapsed * 1000:.1f}} {{','.join(heavy)}}")
+"""
+
+def measure(snippet, runs):
+    timings = []
+    heavy = ''
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(snippet=snippet, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        elapsed, _, heavy = output.partition(' ')
+        timings.append(float(elapsed))
+    return timings, heavy
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Время импорта main.py в новом процессе')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    args = arg_parser.parse_args()
+    
+    for name, snippet in SNIPPETS.items():
+        timings, heavy = measure(snippet, args.runs)
+        print(f"{name:<16} медиана {statistics.median(timings):7.1f} мс, мин {min(timings):7.1f} мс"
+              f"   загружены: {heavy or '—'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import copy
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RESULTS_CAP = 2000
+SERP_SUFFIX = ' официальный сайт'
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read() if name.endswith('.html') else json.load(f)
+
+def stable_fraction(text):
+    return zlib.crc32(text.encode('utf-8')) % 10000 / 10000
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_HEAD(self):
+        self.dispatch(head=True)
+    
+    def do_GET(self):
+        self.dispatch(head=False)
+    
+    def dispatch(self, head):
+        mock = self.server.mock
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        kind = mock.route_kind(url.path)
+        mock.count(kind)
+        mock.delay(kind)
+        
+        if kind != 'site' and mock.should_fail():
+            return self.respond(500, b'{"errors": [{"type": "mock"}]}', 'application/json', head)
+        
+        if kind == 'vacancies':
+            return self.respond_json(mock.vacancy_page(params), head)
+        if kind == 'areas':
+            return self.respond_json(mock.areas, head)
+        if kind == 'employers':
+            return self.respond_json(mock.employer(url.path.rsplit('/', 1)[-1]), head)
+        if kind == 'serp':
+            return self.respond(200, mock.serp_page(params.get('text', '')).encode('utf-8'), 'text/html; charset=utf-8', head)
+        if kind == 'site':
+            if mock.should_fail():
+                return self.respond(500, b'', 'text/html', head)
+            host = unquote(url.path[len('/site/'):]).split('/', 1)[0]
+            status = 200 if mock.site_exists(host) else 404
+            return self.respond(status, b'<html><body>ok</body></html>', 'text/html', head)
+        return self.respond(404, b'', 'text/plain', head)
+    
+    def respond_json(self, payload, head):
+        self.respond(200, json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json', head)
+    
+    def respond(self, status, body, content_type, head):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+class MockServer:
+    def __init__(self, vacancies=2000, companies=200, api_latency=0.0, site_latency=0.0, serp_latency=0.0,
+                 jitter=0.0, error_rate=0.0, site_hit_rate=1.0, employer_site_rate=0.5, seed=1):
+        self.vacancies = vacancies
+        self.companies = max(1, companies)
+        self.latency = {'vacancies': api_latency, 'areas': api_latency, 'employers': api_latency,
+                        'site': site_latency, 'serp': serp_latency}
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.site_hit_rate = site_hit_rate
+        self.employer_site_rate = employer_site_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.requests = {}
+        self.requests_lock = threading.Lock()
+        
+        self.page_template = load_fixture('vacancies.json')
+        self.areas = load_fixture('areas.json')
+        self.serp_template = load_fixture('serp.html')
+        self.server = None
+    
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def start(self):
+        self.server = MockHTTPServer(('127.0.0.1', 0), MockHandler)
+        self.server.mock = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base_url
+    
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def route_kind(self, path):
+        if path == '/vacancies':
+            return 'vacancies'
+        if path == '/areas':
+            return 'areas'
+        if path.startswith('/employers/'):
+            return 'employers'
+        if path.startswith('/search'):
+            return 'serp'
+        if path.startswith('/site/'):
+            return 'site'
+        return 'other'
+    
+    def count(self, kind):
+        with self.requests_lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+    
+    def reset_counts(self):
+        with self.requests_lock:
+            self.requests = {}
+    
+    def delay(self, kind):
+        latency = self.latency.get(kind, 0.0)
+        if self.jitter:
+            with self.random_lock:
+                latency += self.random.uniform(0, self.jitter)
+        if latency > 0:
+            time.sleep(latency)
+    
+    def should_fail(self):
+        if not self.error_rate:
+            return False
+        with self.random_lock:
+            return self.random.random() < self.error_rate
+    
+    def vacancy_page(self, params):
+        text = params.get('text', '')
+        page = int(params.get('page', 0))
+        per_page = int(params.get('per_page', 20))
+        available = min(self.vacancies, RESULTS_CAP)
+        start = page * per_page
+        
+        return {
+            'items': [self.vacancy(text, index) for index in range(start, min(available, start + per_page))],
+            'found': self.vacancies,
+            'pages': math.ceil(available / per_page) if per_page else 0,
+            'page': page,
+            'per_page': per_page,
+        }
+    
+    def vacancy(self, text, index):
+        items = self.page_template['items']
+        item = copy.deepcopy(items[index % len(items)])
+        vacancy_id = f"{zlib.crc32(text.encode('utf-8')) % 1000:03d}{index:07d}"
+        employer_id = str(index % self.companies + 1)
+        
+        item['id'] = vacancy_id
+        item['url'] = f"https://api.hh.ru/vacancies/{vacancy_id}?host=hh.ru"
+        item['alternate_url'] = f"https://hh.ru/vacancy/{vacancy_id}"
+        item['employer'] = dict(item['employer'], id=employer_id, name=f"{item['employer']['name']} {employer_id}")
+        return item
+    
+    def employer(self, employer_id):
+        site_url = ''
+        if stable_fraction(f"employer:{employer_id}") < self.employer_site_rate:
+            site_url = f"http://www.employer{employer_id}.ru/"
+        return {'id': employer_id, 'name': f"Работодатель {employer_id}", 'site_url': site_url, 'trusted': True}
+    
+    def site_exists(self, host):
+        return stable_fraction(host) < self.site_hit_rate
+    
+    def serp_page(self, text):
+        company = text[:-len(SERP_SUFFIX)] if text.endswith(SERP_SUFFIX) else text
+        slug = re.sub(r'[^a-z0-9]+', '', company.lower()) or f"company{zlib.crc32(company.encode('utf-8')) % 100000}"
+        return self.serp_template.format(
+            query=text, company=company, site=f"{slug}.ru", employer=zlib.crc32(company.encode('utf-8')) % 1000000
+        )
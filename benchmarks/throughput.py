@@ -0,0 +1,241 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main
+from mock_server import MockServer
+
+KEYWORDS = ['python', 'java', 'аналитик', 'devops']
+MOCK_HOST_RATE = 100000
+
+class OfflineWebsiteFinder(main.CompanyWebsiteFinder):
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+    
+    def local_url(self, url):
+        parsed = urlparse(url)
+        return f"{self.base_url}/site/{quote(parsed.hostname or '')}{parsed.path}"
+    
+    def known_website_candidates(self, company_name):
+        return [self.local_url(url) for url in super().known_website_candidates(company_name)]
+    
+    def generated_website_candidates(self, company_name):
+        return [self.local_url(url) for url in super().generated_website_candidates(company_name)]
+    
+    def build_search_url(self, company_name, strategy):
+        return f"{self.base_url}/search/?{urlparse(super().build_search_url(company_name, strategy)).query}"
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+def summarize(name, rows, elapsed, samples, unit='строк'):
+    return {
+        'name': name,
+        'rows': rows,
+        'unit': unit,
+        'elapsed': round(elapsed, 4),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        'operations': len(samples),
+        'p50_ms': round(percentile(samples, 0.5) * 1000, 2),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 2),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+    }
+
+@contextlib.contextmanager
+def quiet(verbose):
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def make_parser(mock, workdir, args, **options):
+    parser = main.HHParser(
+        cache_path=None,
+        state_path=os.path.join(workdir, 'state.sqlite3'),
+        api_rate_limit=args.api_rate,
+        max_workers=args.workers,
+        playwright_budget=playwright_budget(args),
+        **options
+    )
+    parser.api_client.base_url = mock.base_url
+    parser.host_limiter.rates['127.0.0.1'] = MOCK_HOST_RATE
+    parser.website_finder = make_finder(mock, parser.host_limiter, parser.browser_pool, playwright_budget(args))
+    return parser
+
+def make_finder(mock, host_limiter, browser_pool=None, budget=main.PLAYWRIGHT_BUDGET):
+    return OfflineWebsiteFinder(mock.base_url, browser_pool=browser_pool, host_limiter=host_limiter,
+                                playwright_budget=budget)
+
+def playwright_budget(args):
+    return main.PLAYWRIGHT_BUDGET if args.serp else -1
+
+def bench_search_via_api(mock, workdir, args):
+    parser = make_parser(mock, workdir, args)
+    rows = 0
+    samples = []
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        for keyword in KEYWORDS:
+            call_started = time.perf_counter()
+            rows += len(parser.search_via_api(keyword, 113, args.per_keyword))
+            samples.append(time.perf_counter() - call_started)
+    return summarize('search_via_api', rows, time.perf_counter() - started, samples)
+
+def bench_find_company_website(mock, workdir, args):
+    host_limiter = main.HostRateLimiter({'127.0.0.1': MOCK_HOST_RATE})
+    rows = 0
+    found = 0
+    samples = []
+    
+    def lookup(company_name):
+        call_started = time.perf_counter()
+        website = finder.find_company_website(company_name)
+        samples.append(time.perf_counter() - call_started)
+        return website
+    
+    started = time.perf_counter()
+    for run in range(args.runs):
+        finder = make_finder(mock, host_limiter, budget=playwright_budget(args))
+        companies = [f"{mock.vacancy('', index)['employer']['name']} {run}" for index in range(args.companies)]
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            websites = list(executor.map(lookup, companies))
+        rows += len(websites)
+        found += sum(1 for website in websites if website)
+    
+    summary = summarize('find_company_website', rows, time.perf_counter() - started, samples, unit='компаний')
+    summary['hit_rate'] = round(found / rows, 3) if rows else 0.0
+    return summary
+
+def bench_save_to_excel(mock, workdir, args):
+    parser = make_parser(mock, workdir, args)
+    results = [
+        dict(parser.process_api_vacancy(mock.vacancy('python', index), 'python'),
+             Сайт_компании=f"https://company{index % args.companies}.ru")
+        for index in range(args.rows)
+    ]
+    rows = 0
+    samples = []
+    started = time.perf_counter()
+    for run in range(args.runs):
+        call_started = time.perf_counter()
+        success, path = parser.save_to_excel(KEYWORDS, f"bench_{run}.xlsx", rows=results)
+        samples.append(time.perf_counter() - call_started)
+        if not success:
+            raise RuntimeError('save_to_excel не сохранил файл')
+        rows += len(results)
+    return summarize('save_to_excel', rows, time.perf_counter() - started, samples)
+
+def bench_run_parser(mock, workdir, args):
+    rows = 0
+    samples = []
+    started = time.perf_counter()
+    for run in range(args.runs):
+        parser = make_parser(mock, workdir, args, engine=args.engine)
+        output = os.path.join(workdir, 'results', f"run_{run}.csv")
+        call_started = time.perf_counter()
+        vacancies_count, success, filepath = parser.run_parser(KEYWORDS, 113, per_keyword=args.per_keyword,
+                                                               outputs=[output])
+        samples.append(time.perf_counter() - call_started)
+        rows += vacancies_count
+    return summarize(f"run_parser ({args.engine})", rows, time.perf_counter() - started, samples)
+
+REGION_QUERIES = ['Москва', 'мск', 'спб', 'екб', 'нижний новгород', 'Новосибирск', 'йошкар', 'минск', 'Свердловская']
+
+def bench_find_regions(mock, workdir, args):
+    api_client = main.HHApiClient(rate_limit=args.api_rate, areas_path=os.path.join(workdir, 'areas.json'))
+    api_client.base_url = mock.base_url
+    samples = []
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        call_started = time.perf_counter()
+        api_client.load_regions(refresh=True)
+        samples.append(time.perf_counter() - call_started)
+        for query in REGION_QUERIES * 10:
+            call_started = time.perf_counter()
+            api_client.find_regions(query)
+            samples.append(time.perf_counter() - call_started)
+    return summarize('find_regions', len(samples), time.perf_counter() - started, samples, unit='запросов')
+
+CASES = {
+    'find_regions': bench_find_regions,
+    'search_via_api': bench_search_via_api,
+    'find_company_website': bench_find_company_website,
+    'save_to_excel': bench_save_to_excel,
+    'run_parser': bench_run_parser,
+}
+
+def print_summary(summary):
+    extra = f", найдено {summary['hit_rate']:.0%}" if 'hit_rate' in summary else ''
+    print(f"{summary['name']:<26} {summary['rows_per_second']:>10.1f} {summary['unit']}/с   "
+          f"p50 {summary['p50_ms']:>9.2f} мс   p99 {summary['p99_ms']:>9.2f} мс   "
+          f"({summary['rows']} {summary['unit']} за {summary['elapsed']:.2f}с{extra})")
+
+def main_cli(argv=None):
+    arg_parser = argparse.ArgumentParser(description='Офлайн-бенчмарк парсера на локальной заглушке hh.ru/Яндекса/сайтов')
+    arg_parser.add_argument('--case', action='append', choices=sorted(CASES), help='Какие замеры запускать (по умолчанию все)')
+    arg_parser.add_argument('--runs', type=int, default=3)
+    arg_parser.add_argument('--vacancies', type=int, default=2000, help='Сколько вакансий отдает /vacancies')
+    arg_parser.add_argument('--companies', type=int, default=200, help='Сколько разных работодателей в выдаче')
+    arg_parser.add_argument('--per-keyword', type=int, default=500)
+    arg_parser.add_argument('--rows', type=int, default=5000, help='Строк для save_to_excel')
+    arg_parser.add_argument('--workers', type=int, default=8)
+    arg_parser.add_argument('--engine', choices=['threads', 'async'], default='threads')
+    arg_parser.add_argument('--api-rate', type=float, default=1000, help='Лимит запросов к API в секунду')
+    arg_parser.add_argument('--api-latency', type=float, default=0.02, help='Задержка ответа API, с')
+    arg_parser.add_argument('--site-latency', type=float, default=0.01, help='Задержка ответа сайтов, с')
+    arg_parser.add_argument('--serp-latency', type=float, default=0.2, help='Задержка выдачи Яндекса, с')
+    arg_parser.add_argument('--jitter', type=float, default=0.0, help='Случайная добавка к задержке, с')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов с ошибкой 5xx')
+    arg_parser.add_argument('--site-hit-rate', type=float, default=0.9, help='Доля сгенерированных адресов, которые "существуют"')
+    arg_parser.add_argument('--serp', action='store_true', help='Включить Playwright-поиск (нужен установленный Chromium)')
+    arg_parser.add_argument('--seed', type=int, default=1)
+    arg_parser.add_argument('--json', help='Сохранить результаты в JSON (для CI)')
+    arg_parser.add_argument('--verbose', action='store_true', help='Не скрывать вывод парсера')
+    args = arg_parser.parse_args(argv)
+    
+    mock = MockServer(vacancies=args.vacancies, companies=args.companies, api_latency=args.api_latency,
+                      site_latency=args.site_latency, serp_latency=args.serp_latency, jitter=args.jitter,
+                      error_rate=args.error_rate, site_hit_rate=args.site_hit_rate, seed=args.seed)
+    summaries = []
+    with mock, tempfile.TemporaryDirectory() as workdir:
+        previous_dir = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name in args.case or list(CASES):
+                mock.reset_counts()
+                with quiet(args.verbose):
+                    summary = CASES[name](mock, workdir, args)
+                summary['requests'] = dict(mock.requests)
+                summaries.append(summary)
+                print_summary(summary)
+        finally:
+            os.chdir(previous_dir)
+    
+    if args.json:
+        directory = os.path.dirname(args.json)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': summaries}, f, ensure_ascii=False, indent=2)
+    return summaries
+
+if __name__ == '__main__':
+    main_cli()
@@ -1,1173 +1,5199 @@
-import requests
-import pandas as pd
-import time
-import re
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import threading
-import os
-from urllib.parse import urlparse, quote_plus
-from datetime import datetime
-from fake_useragent import UserAgent
-from playwright.sync_api import sync_playwright
-import random
-
-class HHApiClient:
-    def __init__(self):
-        self.base_url = "https://api.hh.ru"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json, text/plain, */*',
-        })
-        self.regions_cache = None
-    
-    def load_regions(self):
-        if self.regions_cache is not None:
-            return self.regions_cache
-            
-        try:
-            print("🔄 Загружаем список регионов...")
-            response = self.session.get(f"{self.base_url}/areas", timeout=10)
-            if response.status_code == 200:
-                regions_data = response.json()
-                regions_dict = {}
-                
-                def parse_areas(areas):
-                    for area in areas:
-                        area_name = area['name'].lower()
-                        regions_dict[area_name] = area['id']
-                        if area['id'] == '1':
-                            regions_dict['мск'] = '1'
-                            regions_dict['moscow'] = '1'
-                        elif area['id'] == '2':
-                            regions_dict['спб'] = '2'
-                            regions_dict['питер'] = '2'
-                        elif area['id'] == '3':
-                            regions_dict['екб'] = '3'
-                        elif area['id'] == '4':
-                            regions_dict['нск'] = '4'
-                        elif area['id'] == '66':
-                            regions_dict['нн'] = '66'
-                        
-                        if 'areas' in area and area['areas']:
-                            parse_areas(area['areas'])
-                
-                parse_areas(regions_data)
-                self.regions_cache = regions_dict
-                print(f"✅ Загружено регионов: {len(regions_dict)}")
-                return regions_dict
-            else:
-                print("❌ Ошибка загрузки регионов")
-                return {}
-        except Exception as e:
-            print(f"❌ Ошибка при загрузке регионов: {e}")
-            return {}
-    
-    def search_vacancies(self, text, area=113, page=0, per_page=100):
-        url = f"{self.base_url}/vacancies"
-        params = {
-            'text': text,
-            'area': area,
-            'page': page,
-            'per_page': per_page,
-        }
-        
-        try:
-            response = self.session.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return None
-        except Exception as e:
-            print(f"❌ Ошибка API: {e}")
-            return None
-
-class CompanyWebsiteFinder:
-    def __init__(self):
-        self.session = requests.Session()
-        self.ua = UserAgent()
-        self.update_headers()
-        self.website_cache = {}
-        
-        self.known_websites = {
-            'совкомбанк': 'sovcombank.ru', 'neoflex': 'neoflex.ru', 'aston': 'aston.ru',
-            'т-банк': 'tbank.ru', 'ibs': 'ibs.ru', 'алабуга': 'alabuga.ru', 'тинькофф': 'tinkoff.ru',
-            'сбер': 'sber.ru', 'яндекс': 'yandex.ru', 'mail.ru': 'mail.ru', 'vkontakte': 'vk.com',
-            'ozon': 'ozon.ru', 'wildberries': 'wildberries.ru', 'avito': 'avito.ru', 'dns': 'dns-shop.ru',
-            'mvideo': 'mvideo.ru', 'ситилинк': 'citilink.ru', 'газпром': 'gazprom.ru', 'лукойл': 'lukoil.ru',
-            'ржд': 'rzd.ru', 'ростех': 'rostec.ru', 'росатом': 'rosatom.ru', 'мегафон': 'megafon.ru',
-            'мтс': 'mts.ru', 'билайн': 'beeline.ru', 'tele2': 'tele2.ru', 'топ': 'top-academy.ru',
-            'idf': 'idfeurasia.com', 'eurasia': 'idfeurasia.com',
-            'альфа': 'alfabank.ru', 'втб': 'vtb.ru', 'открытие': 'open.ru', 'росбанк': 'rosbank.ru',
-            'qiwi': 'qiwi.com', 'лаборатория': 'kaspersky.ru', 'касперский': 'kaspersky.ru',
-            '1с': '1c.ru', 'битрикс': 'bitrix24.ru', 'агвир': 'agvir.ru', 'медиалогия': 'mlg.ru',
-            'контур': 'kontur.ru', 'скайенг': 'skyeng.ru', 'нетология': 'netology.ru',
-            'гедеон': 'gideon.ru', 'сибинтек': 'sibintek.ru', 'фактор': 'factor.ru',
-            'тема': 'tema.ru', 'телеком': 'tema.ru'
-        }
-    
-    def update_headers(self):
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        })
-    
-    def find_company_website(self, company_name):
-        if not company_name or company_name == "Не указано":
-            return None
-        
-        if company_name in self.website_cache:
-            return self.website_cache[company_name]
-        
-        start_time = time.time()
-        print(f"🔍 Поиск сайта для: {company_name}")
-        
-        known_site = self.check_known_websites(company_name)
-        if known_site:
-            print(f"✅ Найден через известные сайты: {known_site}")
-            self.website_cache[company_name] = known_site
-            return known_site
-        
-        generated_site = self.fast_generate_website_url(company_name)
-        if generated_site:
-            print(f"✅ Найден через генерацию: {generated_site}")
-            self.website_cache[company_name] = generated_site
-            return generated_site
-        
-        playwright_site = self.playwright_search_ultra_fast(company_name)
-        if playwright_site:
-            print(f"✅ Найден через Playwright: {playwright_site}")
-            self.website_cache[company_name] = playwright_site
-            return playwright_site
-        
-        print(f"❌ Сайт не найден для: {company_name} (поиск занял {time.time()-start_time:.2f}с)")
-        self.website_cache[company_name] = None
-        return None
-    
-    def check_known_websites(self, company_name):
-        clean_name = company_name.lower().strip()
-        for known_company, domain in self.known_websites.items():
-            if known_company in clean_name:
-                url = f"https://{domain}"
-                if self.ultra_fast_site_check(url):
-                    return url
-        return None
-    
-    def fast_generate_website_url(self, company_name):
-        if not company_name:
-            return None
-        
-        clean_name = re.sub(r'[\(\)\[\]\{\}]', '', company_name)
-        clean_name = re.sub(r'[^\w\s]', ' ', clean_name).strip()
-        if len(clean_name) < 2:
-            return None
-        
-        name_variants = set()
-        
-        words = clean_name.split()
-        if len(words) > 3:
-            main_name = ' '.join(words[:2])
-            name_variants.add(main_name.lower().replace(' ', ''))
-            name_variants.add(main_name.lower().replace(' ', '-'))
-        
-        name_variants.add(clean_name.lower().replace(' ', ''))
-        name_variants.add(clean_name.lower().replace(' ', '-'))
-        
-        translit_name = self.transliterate_cyrillic(clean_name)
-        if translit_name:
-            name_variants.add(translit_name.replace(' ', ''))
-            name_variants.add(translit_name.replace(' ', '-'))
-        
-        domains = ['.ru', '.com', '.org', '.net']
-        
-        checked = 0
-        for name in list(name_variants):
-            for domain in domains:
-                if checked >= 6:
-                    break
-                    
-                url = f"https://{name}{domain}"
-                if self.ultra_fast_site_check(url) and self.is_valid_company_site(url):
-                    return url
-                
-                url_www = f"https://www.{name}{domain}"
-                if self.ultra_fast_site_check(url_www) and self.is_valid_company_site(url_www):
-                    return url_www
-                
-                checked += 1
-        
-        return None
-    
-    def transliterate_cyrillic(self, text):
-        brand_exceptions = {
-            'авито': 'avito', 'яндекс': 'yandex', 'сбер': 'sber', 'тинькофф': 'tinkoff',
-            'мегафон': 'megafon', 'мтс': 'mts', 'билайн': 'beeline', 'теле2': 'tele2',
-            'озон': 'ozon', 'вк': 'vk', 'маил': 'mail', 'топ': 'top', 'академия': 'academy',
-            'eurasia': 'eurasia', 'idf': 'idf', 'альфа': 'alfa', 'втб': 'vtb',
-            'qiwi': 'qiwi', 'лаборатория': 'kaspersky', 'касперский': 'kaspersky',
-            'битрикс': 'bitrix', 'агвир': 'agvir', 'медиалогия': 'mlg',
-            'контур': 'kontur', 'скайенг': 'skyeng', 'нетология': 'netology',
-            'гедеон': 'gideon', 'сибинтек': 'sibintek', 'фактор': 'factor',
-            'тема': 'tema', 'телеком': 'telecom', 'сдэк': 'cdek', 'почта': 'pochta',
-            'алгоритмика': 'algorithmika', 'монолит': 'monolit'
-        }
-        
-        text_lower = text.lower()
-        for cyrillic, latin in brand_exceptions.items():
-            if cyrillic in text_lower:
-                return latin
-        
-        translit_dict = {
-            'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
-            'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
-            'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
-            'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch', 'ъ': '',
-            'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
-        }
-        
-        result = []
-        for char in text.lower():
-            if char in translit_dict:
-                result.append(translit_dict[char])
-            elif char in 'abcdefghijklmnopqrstuvwxyz0123456789 -_':
-                result.append(char)
-            elif char == ' ':
-                result.append(' ')
-        
-        return ''.join(result)
-    
-    def ultra_fast_site_check(self, url):
-        try:
-            response = requests.head(url, timeout=0.5, allow_redirects=True)
-            return response.status_code == 200
-        except:
-            return False
-    
-    def playwright_search_ultra_fast(self, company_name):
-        start_time = time.time()
-        
-        strategies = [
-            self._playwright_strategy_stealth,
-            self._playwright_strategy_humanized,
-            self._playwright_strategy_fast_headless
-        ]
-        
-        for strategy in strategies:
-            if time.time() - start_time > 2:
-                break
-                
-            try:
-                result = strategy(company_name)
-                if result:
-                    return result
-            except:
-                continue
-        
-        return None
-    
-    def _playwright_strategy_stealth(self, company_name):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,  # ИЗМЕНЕНО: было False, стало True
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding',
-                    '--disable-ipc-flooding-protection',
-                    '--disable-hang-monitor',
-                    '--disable-popup-blocking',
-                    '--disable-prompt-on-repost',
-                    '--disable-back-forward-cache',
-                    '--disable-component-extensions-with-background-pages',
-                    '--disable-default-apps',
-                    '--disable-extensions',
-                    '--disable-plugins',
-                    '--disable-translate',
-                    '--disable-web-security',
-                    '--allow-running-insecure-content',
-                    '--no-first-run',
-                    '--no-default-browser-check',
-                    '--disable-client-side-phishing-detection',
-                    '--disable-cookie-encryption',
-                    '--disable-domain-reliability',
-                    '--disable-print-preview',
-                    '--disable-speech-api',
-                    '--disable-sync',
-                    '--disable-webaudio',
-                    '--disable-webgl',
-                    '--disable-webrtc',
-                    '--force-color-profile=srgb',
-                    '--metrics-recording-only',
-                    '--mute-audio',
-                    '--use-mock-keychain',
-                    '--hide-scrollbars',
-                    '--ignore-certificate-errors',
-                    '--ignore-ssl-errors',
-                    '--ignore-certificate-errors-spki-list',
-                    '--log-level=3',
-                    '--silent'
-                ]
-            )
-            
-            user_agents = [
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            ]
-            
-            viewports = [
-                {'width': 1920, 'height': 1080},
-                {'width': 1366, 'height': 768},
-                {'width': 1536, 'height': 864},
-                {'width': 1280, 'height': 720}
-            ]
-            
-            config = {
-                'user_agent': random.choice(user_agents),
-                'viewport': random.choice(viewports),
-                'locale': 'ru-RU',
-                'timezone_id': 'Europe/Moscow',
-                'geolocation': {'latitude': 55.7558, 'longitude': 37.6173},
-                'permissions': ['geolocation']
-            }
-            
-            context = browser.new_context(
-                viewport=config['viewport'],
-                user_agent=config['user_agent'],
-                locale=config['locale'],
-                timezone_id=config['timezone_id'],
-                geolocation=config['geolocation'],
-                permissions=config['permissions']
-            )
-            
-            context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-                Object.defineProperty(navigator, 'languages', {get: () => ['ru-RU', 'ru', 'en-US', 'en']});
-                Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 8});
-                Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});
-                Object.defineProperty(screen, 'width', {get: () => 1920});
-                Object.defineProperty(screen, 'height', {get: () => 1080});
-                Object.defineProperty(screen, 'colorDepth', {get: () => 24});
-                Object.defineProperty(Notification, 'permission', {get: () => 'default'});
-                window.chrome = {runtime: {}};
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-            """)
-            
-            page = context.new_page()
-            
-            page.set_extra_http_headers({
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            })
-            
-            try:
-                clean_company = re.sub(r'[\(\)\[\]\{\}]', '', company_name)
-                clean_company = re.sub(r'ИП\s+\w+\s+\w+', '', clean_company).strip()
-                
-                search_query = f"{clean_company} официальный сайт"
-                search_url = f"https://yandex.ru/search/?text={quote_plus(search_query)}&lr=213"
-                
-                page.goto(search_url, wait_until='domcontentloaded', timeout=2000)
-                
-                page.wait_for_timeout(100)
-                
-                if page.query_selector('form[action*="checkcaptcha"], .captcha, .CheckboxCaptcha'):
-                    browser.close()
-                    return None
-                
-                found_urls = []
-                
-                organic_selectors = [
-                    'a.organic__greenurl',
-                    '.serp-item a[href*="http"]',
-                    '.organic a[href*="http"]',
-                    '[data-cid] a[href*="http"]',
-                    '.Path-Item a[href*="http"]',
-                    '.organic__path a',
-                    '[data-log-node*="organic"] a',
-                    '.Organic a[href*="http"]'
-                ]
-                
-                for selector in organic_selectors:
-                    links = page.query_selector_all(selector)
-                    for link in links[:5]:
-                        try:
-                            href = link.get_attribute('href')
-                            text = link.text_content().strip() if link.text_content() else ""
-                            
-                            if href:
-                                real_url = self.extract_real_url(href)
-                                if real_url and self.is_valid_company_site_strict(real_url, company_name):
-                                    if self.is_relevant_link(text, company_name):
-                                        found_urls.append(real_url)
-                        except:
-                            continue
-                
-                if not found_urls:
-                    all_links = page.query_selector_all('a[href*="http"]')
-                    for link in all_links[:10]:
-                        try:
-                            href = link.get_attribute('href')
-                            text = link.text_content().strip() if link.text_content() else ""
-                            
-                            if (href and 
-                                not href.startswith('https://yandex.ru') and
-                                not href.startswith('https://google.ru')):
-                                
-                                company_words = company_name.lower().split()
-                                text_lower = text.lower()
-                                
-                                relevant = any(word in text_lower for word in company_words if len(word) > 2)
-                                
-                                if relevant:
-                                    real_url = self.extract_real_url(href)
-                                    if real_url and self.is_valid_company_site_strict(real_url, company_name):
-                                        found_urls.append(real_url)
-                        except:
-                            continue
-                
-                unique_urls = list(set(found_urls))
-                
-                if unique_urls:
-                    best_url = self.choose_best_url(unique_urls, company_name)
-                    browser.close()
-                    return best_url
-                
-                browser.close()
-                return None
-                
-            except Exception as e:
-                browser.close()
-                return None
-    
-    def _playwright_strategy_humanized(self, company_name):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,  # ИЗМЕНЕНО: было False, стало True
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-background-timer-throttling'
-                ]
-            )
-            
-            context = browser.new_context(
-                viewport={'width': 1366, 'height': 768},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='ru-RU'
-            )
-            
-            context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-            """)
-            
-            page = context.new_page()
-            
-            try:
-                clean_company = re.sub(r'[\(\)\[\]\{\}]', '', company_name)
-                clean_company = re.sub(r'ИП\s+\w+\s+\w+', '', clean_company).strip()
-                
-                search_query = f"{clean_company} официальный сайт"
-                search_url = f"https://yandex.ru/search/?text={quote_plus(search_query)}"
-                
-                page.goto(search_url, wait_until='domcontentloaded', timeout=2000)
-                
-                if page.query_selector('form[action*="checkcaptcha"]'):
-                    browser.close()
-                    return None
-                
-                found_urls = []
-                
-                organic_selectors = [
-                    'a.organic__greenurl',
-                    '.serp-item a[href*="http"]',
-                    '.organic a[href*="http"]'
-                ]
-                
-                for selector in organic_selectors:
-                    links = page.query_selector_all(selector)
-                    for link in links[:3]:
-                        try:
-                            href = link.get_attribute('href')
-                            if href:
-                                real_url = self.extract_real_url(href)
-                                if real_url and self.is_valid_company_site_strict(real_url, company_name):
-                                    found_urls.append(real_url)
-                        except:
-                            continue
-                
-                unique_urls = list(set(found_urls))
-                
-                if unique_urls:
-                    best_url = self.choose_best_url(unique_urls, company_name)
-                    browser.close()
-                    return best_url
-                
-                browser.close()
-                return None
-                
-            except Exception:
-                browser.close()
-                return None
-    
-    def _playwright_strategy_fast_headless(self, company_name):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,  # ИЗМЕНЕНО: было True, осталось True
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled'
-                ]
-            )
-            
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            
-            page = context.new_page()
-            
-            try:
-                clean_company = re.sub(r'[\(\)\[\]\{\}]', '', company_name)
-                clean_company = re.sub(r'ИП\s+\w+\s+\w+', '', clean_company).strip()
-                
-                search_query = f"{clean_company} официальный сайт"
-                search_url = f"https://yandex.ru/search/?text={quote_plus(search_query)}"
-                
-                page.goto(search_url, wait_until='domcontentloaded', timeout=20000)
-                
-                found_urls = []
-                
-                links = page.query_selector_all('a[href*="http"]')
-                for link in links[:8]:
-                    try:
-                        href = link.get_attribute('href')
-                        if href and not href.startswith('https://yandex.ru'):
-                            real_url = self.extract_real_url(href)
-                            if real_url and self.is_valid_company_site_strict(real_url, company_name):
-                                found_urls.append(real_url)
-                    except:
-                        continue
-                
-                unique_urls = list(set(found_urls))
-                
-                if unique_urls:
-                    best_url = self.choose_best_url(unique_urls, company_name)
-                    browser.close()
-                    return best_url
-                
-                browser.close()
-                return None
-                
-            except Exception:
-                browser.close()
-                return None
-    
-    def extract_real_url(self, url):
-        if 'yandex.ru/redir/' in url or 'clck' in url:
-            try:
-                return url
-            except Exception:
-                pass
-        
-        return url
-    
-    def is_relevant_link(self, link_text, company_name):
-        if not link_text:
-            return False
-        
-        company_words = company_name.lower().split()
-        clean_company = re.sub(r'[\(\)\[\]\{\}]', '', company_name).lower()
-        
-        ignore_words = [
-            'яндекс', 'yandex', 'google', 'карты', 'images', 'видео', 'новости',
-            'маркет', 'перевести', 'найти', 'search', 'ещё', 'more', 'еще',
-            'знакомства', 'расписания', 'погода', 'афиша', 'работа', 'вакансии',
-            'резюме', 'hh.ru', 'headhunter', 'отзывы', 'рейтинг', 'купить', 'цена'
-        ]
-        
-        if any(word in link_text.lower() for word in ignore_words):
-            return False
-        
-        for word in company_words:
-            if len(word) > 2 and word in link_text.lower():
-                return True
-        
-        return False
-    
-    def choose_best_url(self, urls, company_name):
-        if not urls:
-            return None
-        
-        company_keywords = company_name.lower().split()
-        best_score = 0
-        best_url = urls[0]
-        
-        for url in urls:
-            score = 0
-            domain = urlparse(url).netloc.lower()
-            
-            for keyword in company_keywords:
-                if len(keyword) > 2 and keyword in domain:
-                    score += 3
-            
-            if domain.endswith('.ru'):
-                score += 1
-            if 'www.' in domain:
-                score += 1
-            
-            if score > best_score:
-                best_score = score
-                best_url = url
-        
-        return best_url
-    
-    def is_valid_company_site(self, url):
-        try:
-            domain = urlparse(url).netloc.lower()
-            
-            blacklist = [
-                'yandex.ru', 'yandex.com', 'ya.ru', 'google.com', 'google.ru',
-                'vk.com', 'facebook.com', 'instagram.com', 'hh.ru', 'rabota.ru', 
-                'superjob.ru', 'mail.ru', 'rambler.ru', '2gis.ru', 'gosuslugi.ru'
-            ]
-            
-            if domain in blacklist:
-                return False
-                
-            if any(bad in domain for bad in ['yandex.', 'google.']):
-                return False
-            
-            return True
-            
-        except:
-            return False
-    
-    def is_valid_company_site_strict(self, url, company_name=None):
-        try:
-            domain = urlparse(url).netloc.lower()
-            
-            blacklist = [
-                'yandex.ru', 'yandex.com', 'ya.ru', 'google.com', 'google.ru',
-                'vk.com', 'facebook.com', 'instagram.com', 'hh.ru', 'rabota.ru', 
-                'superjob.ru', 'mail.ru', 'rambler.ru', '2gis.ru', 'gosuslugi.ru',
-                'yandex.net', 'yastatic.net', 'yandex.st', 'yandex.ua', 'yandex.kz',
-                'yandex.by', 'yandex.az', 'yandex.com.tr', 'kinopoisk.ru', 'market.yandex.ru',
-                'youtube.com', 'twitter.com', 'linkedin.com', 't.me', 'telegram.me',
-                'whatsapp.com', 'viber.com', 'skype.com', 'zoom.us', 'avito.ru',
-                'cian.ru', 'irr.ru', 'banki.ru', 'sravni.ru'
-            ]
-            
-            if domain in blacklist:
-                return False
-                
-            if any(bad in domain for bad in [
-                'yandex.', 'google.', 'mail.', 'rambler.', 'search.', 'images.',
-                'video.', 'maps.', 'news.', 'market.', 'kinopoisk.', 'social.',
-                'chat.', 'messenger.', 'app.', 'api.', 'cdn.', 'static.', 'ad.',
-                'ads.', 'analytic', 'tracking'
-            ]):
-                return False
-            
-            main_domain = domain.split('.')[0]
-            if len(main_domain) < 3:
-                return False
-            
-            if company_name:
-                company_lower = company_name.lower()
-                company_words = [word for word in company_lower.split() if len(word) > 2]
-                domain_matches = any(word in domain for word in company_words)
-                
-                if domain_matches:
-                    return True
-            
-            return True
-            
-        except:
-            return False
-
-class HHParser:
-    def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.api_client = HHApiClient()
-        self.website_finder = CompanyWebsiteFinder()
-        self.results = []
-    
-    def search_vacancies_hybrid(self, keywords, area=113, total_vacancies=None, per_keyword=None):
-        all_vacancies = []
-        
-        if per_keyword and per_keyword > 0:
-            for keyword in keywords:
-                print(f"🔍 Поиск вакансий по ключевому слову: '{keyword}' (лимит: {per_keyword})")
-                api_vacancies = self.search_via_api(keyword, area, per_keyword)
-                if api_vacancies:
-                    all_vacancies.extend(api_vacancies)
-                    print(f"✅ Найдено вакансий для '{keyword}': {len(api_vacancies)}")
-        elif total_vacancies and total_vacancies > 0:
-            vacancies_per_keyword = max(1, total_vacancies // len(keywords))
-            print(f"🔍 Общий лимит: {total_vacancies} вакансий (~{vacancies_per_keyword} на ключевое слово)")
-            
-            for keyword in keywords:
-                print(f"🔍 Поиск вакансий по ключевому слову: '{keyword}'")
-                api_vacancies = self.search_via_api(keyword, area, vacancies_per_keyword)
-                if api_vacancies:
-                    all_vacancies.extend(api_vacancies)
-                    print(f"✅ Найдено вакансий для '{keyword}': {len(api_vacancies)}")
-        else:
-            for keyword in keywords:
-                print(f"🔍 Поиск вакансий по ключевому слову: '{keyword}' (без лимита)")
-                api_vacancies = self.search_via_api(keyword, area, 100)
-                if api_vacancies:
-                    all_vacancies.extend(api_vacancies)
-                    print(f"✅ Найдено вакансий для '{keyword}': {len(api_vacancies)}")
-        
-        unique_vacancies = []
-        seen_urls = set()
-        for vacancy in all_vacancies:
-            url = vacancy.get('Ссылка_на_вакансию', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_vacancies.append(vacancy)
-        
-        print(f"📊 Итого уникальных вакансий: {len(unique_vacancies)}")
-        return unique_vacancies
-    
-    def search_via_api(self, keyword, area=113, per_page=100):
-        vacancies_data = []
-        page = 0
-        
-        try:
-            while len(vacancies_data) < per_page:
-                data = self.api_client.search_vacancies(text=keyword, area=area, page=page, per_page=min(100, per_page - len(vacancies_data)))
-                if not data or 'items' not in data or not data['items']:
-                    break
-                
-                items = data['items']
-                for vacancy in items:
-                    if len(vacancies_data) >= per_page:
-                        break
-                    vacancy_info = self.process_api_vacancy(vacancy, keyword)
-                    if vacancy_info:
-                        vacancies_data.append(vacancy_info)
-                
-                page += 1
-                if page >= data.get('pages', 1):
-                    break
-            
-        except Exception as e:
-            print(f"❌ Ошибка поиска вакансий: {e}")
-        
-        return vacancies_data
-    
-    def process_api_vacancy(self, vacancy, keyword):
-        try:
-            title = vacancy.get('name', 'Не указано')
-            company_info = vacancy.get('employer', {})
-            company_name = company_info.get('name', 'Не указано')
-            vacancy_url = vacancy.get('alternate_url', '')
-            
-            company_website = self.website_finder.find_company_website(company_name)
-            
-            vacancy_data = {
-                'Название_вакансии': title,
-                'Ключевое_слово': keyword,
-                'Компания': company_name,
-                'Ссылка_на_вакансию': vacancy_url,
-                'Сайт_компании': company_website if company_website else 'Не найден',
-                'Город': self.extract_area(vacancy),
-            }
-            
-            return vacancy_data
-            
-        except Exception as e:
-            print(f"❌ Ошибка обработки вакансии: {e}")
-            return None
-    
-    def extract_area(self, vacancy):
-        area_info = vacancy.get('area', {})
-        return area_info.get('name', 'Не указан')
-    
-    def generate_filename(self, keywords):
-        main_keyword = keywords[0] if keywords else "vacancies"
-        clean_keyword = re.sub(r'[<>:"/\\|?*]', '', main_keyword).replace(' ', '_')[:50]
-        current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        return f"{clean_keyword}_{current_time}.xlsx"
-    
-    def save_to_excel(self, keywords, custom_filename=None):
-        if not self.results:
-            print("❌ Нет данных для сохранения")
-            return False, None
-        
-        try:
-            df = pd.DataFrame(self.results)
-            
-            if not os.path.exists('results'):
-                os.makedirs('results')
-            
-            filename = custom_filename if custom_filename else self.generate_filename(keywords)
-            filepath = os.path.join('results', filename)
-            
-            column_mapping = {
-                'Название_вакансии': 'Название вакансии',
-                'Ключевое_слово': 'Ключевое слово', 
-                'Компания': 'Компания',
-                'Ссылка_на_вакансию': 'Ссылка на вакансию',
-                'Сайт_компании': 'Сайт компании',
-                'Город': 'Город'
-            }
-            
-            df = df.rename(columns=column_mapping)
-            
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Вакансии')
-                
-                workbook = writer.book
-                worksheet = writer.sheets['Вакансии']
-                
-                from openpyxl.styles import Font
-                link_font = Font(color="0563C1", underline="single")
-                
-                for row in range(2, len(df) + 2):
-                    cell = worksheet[f'D{row}']
-                    if cell.value and str(cell.value).startswith('http'):
-                        cell.hyperlink = cell.value
-                        cell.font = link_font
-                    
-                    cell = worksheet[f'E{row}']
-                    if cell.value and str(cell.value).startswith('http'):
-                        cell.hyperlink = cell.value
-                        cell.font = link_font
-            
-            full_path = os.path.abspath(filepath)
-            print(f"💾 Файл сохранен: {full_path}")
-            print(f"📝 Сохранено записей: {len(df)}")
-            
-            sites_found = sum(1 for r in self.results if r.get('Сайт_компании') not in [None, 'Не найден'])
-            print(f"🌐 Найдено сайтов компаний: {sites_found}")
-            
-            return True, full_path
-            
-        except Exception as e:
-            print(f"❌ Ошибка при сохранении: {e}")
-            return False, None
-    
-    def run_parser(self, keywords, area=113, total_vacancies=None, per_keyword=None):
-        print("🚀 ЗАПУСК ПАРСЕРА HH.RU")
-        print("=" * 50)
-        
-        self.results = self.search_vacancies_hybrid(keywords, area, total_vacancies, per_keyword)
-        
-        if self.results:
-            success, filepath = self.save_to_excel(keywords)
-            
-            if success:
-                print("✅ ПАРСИНГ УСПЕШНО ЗАВЕРШЕН!")
-                print(f"📊 Найдено вакансий: {len(self.results)}")
-                
-                keyword_stats = {}
-                for result in self.results:
-                    keyword = result.get('Ключевое_слово', 'Неизвестно')
-                    keyword_stats[keyword] = keyword_stats.get(keyword, 0) + 1
-                
-                print("📈 Статистика по ключевым словам:")
-                for keyword, count in keyword_stats.items():
-                    print(f"   '{keyword}': {count} вакансий")
-                
-            return len(self.results), success, filepath
-        else:
-            print("❌ Вакансии не найдены")
-            return 0, False, None
-
-def get_region_id(region_name, api_client):
-    if not region_name:
-        return "113"
-    
-    regions = api_client.load_regions()
-    if not regions:
-        return "113"
-    
-    clean_name = region_name.lower().strip()
-    
-    if clean_name in regions:
-        return regions[clean_name]
-    
-    for region_key in regions:
-        if clean_name in region_key or region_key in clean_name:
-            return regions[region_key]
-    
-    return "113"
-
-class HHParserGUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("HH.ru Parser")
-        self.root.minsize(700, 600)
-        self.center_window()
-        
-        self.parser = HHParser()
-        self.setup_ui()
-        self.load_regions_on_start()
-    
-    def center_window(self):
-        self.root.update_idletasks()
-        width = self.root.winfo_reqwidth()
-        height = self.root.winfo_reqheight()
-        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.root.winfo_screenheight() // 2) - (height // 2)
-        self.root.geometry(f"{width}x{height}+{x}+{y}")
-    
-    def load_regions_on_start(self):
-        self.progress_var.set("Загружаем регионы...")
-        threading.Thread(target=self._load_regions_thread, daemon=True).start()
-    
-    def _load_regions_thread(self):
-        try:
-            regions = self.parser.api_client.load_regions()
-            self.root.after(0, lambda: self.regions_loaded(regions))
-        except Exception as e:
-            self.root.after(0, lambda: self.regions_load_failed())
-    
-    def regions_loaded(self, regions):
-        if regions:
-            self.progress_var.set(f"Загружено {len(regions)} регионов")
-    
-    def regions_load_failed(self):
-        self.progress_var.set("Ошибка загрузки регионов")
-    
-    def setup_ui(self):
-        main_frame = ttk.Frame(self.root, padding="15")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(9, weight=1)
-        
-        title_label = ttk.Label(main_frame, text="Поиск вакансий на HH.ru", font=('Arial', 14, 'bold'))
-        title_label.grid(row=0, column=0, columnspan=2, pady=(0, 15))
-        
-        ttk.Label(main_frame, text="Ключевые слова для поиска:", font=('Arial', 10)).grid(row=1, column=0, sticky=tk.W, pady=5)
-        
-        self.keywords_text = tk.Text(main_frame, height=5, width=70)
-        self.keywords_text.grid(row=2, column=0, columnspan=2, pady=5, sticky=(tk.W, tk.E))
-        self.keywords_text.insert(tk.END, "python\nменеджер\nаналитик\nразработчик")
-        
-        settings_frame = ttk.LabelFrame(main_frame, text="Настройки поиска")
-        settings_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
-        settings_frame.columnconfigure(1, weight=1)
-        
-        ttk.Label(settings_frame, text="Выберите регион:", font=('Arial', 10, 'bold')).grid(row=0, column=0, columnspan=2, sticky=tk.W, padx=5, pady=8)
-        
-        self.region_buttons_frame = ttk.Frame(settings_frame)
-        self.region_buttons_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=5)
-        self.region_buttons_frame.columnconfigure(0, weight=1)
-        self.region_buttons_frame.columnconfigure(1, weight=1)
-        self.region_buttons_frame.columnconfigure(2, weight=1)
-        
-        self.region_var = tk.StringVar(value="113")
-        
-        self.russia_rb = ttk.Radiobutton(self.region_buttons_frame, text="Вся Россия", variable=self.region_var, value="113")
-        self.russia_rb.grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        
-        self.moscow_rb = ttk.Radiobutton(self.region_buttons_frame, text="Москва", variable=self.region_var, value="1")
-        self.moscow_rb.grid(row=0, column=1, sticky=tk.W, padx=(0, 10))
-        
-        self.spb_rb = ttk.Radiobutton(self.region_buttons_frame, text="Санкт-Петербург", variable=self.region_var, value="2")
-        self.spb_rb.grid(row=0, column=2, sticky=tk.W)
-        
-        ttk.Label(settings_frame, text="Или введите город вручную:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=8)
-        self.custom_region_var = tk.StringVar()
-        self.custom_region_entry = ttk.Entry(settings_frame, textvariable=self.custom_region_var, width=30)
-        self.custom_region_entry.grid(row=2, column=1, sticky=tk.W, padx=5, pady=8)
-        
-        if hasattr(self.custom_region_var, 'trace_add'):
-            self.custom_region_var.trace_add('write', self.on_custom_region_change)
-        else:
-            self.custom_region_var.trace('w', self.on_custom_region_change)
-        
-        limits_frame = ttk.LabelFrame(main_frame, text="Лимиты вакансий")
-        limits_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
-        limits_frame.columnconfigure(1, weight=1)
-        
-        self.limit_mode = tk.StringVar(value="none")
-        
-        ttk.Radiobutton(limits_frame, text="Без лимита", variable=self.limit_mode, value="none").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        ttk.Radiobutton(limits_frame, text="Общее количество вакансий:", variable=self.limit_mode, value="total").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
-        self.total_vacancies_var = tk.StringVar(value="100")
-        self.total_vacancies_entry = ttk.Entry(limits_frame, textvariable=self.total_vacancies_var, width=10)
-        self.total_vacancies_entry.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
-        
-        ttk.Radiobutton(limits_frame, text="На каждое ключевое слово:", variable=self.limit_mode, value="per_keyword").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
-        self.per_keyword_var = tk.StringVar(value="50")
-        self.per_keyword_entry = ttk.Entry(limits_frame, textvariable=self.per_keyword_var, width=10)
-        self.per_keyword_entry.grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
-        
-        stats_frame = ttk.LabelFrame(main_frame, text="Статистика поиска")
-        stats_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
-        
-        self.stats_var = tk.StringVar(value="Вакансий найдено: 0")
-        stats_label = ttk.Label(stats_frame, textvariable=self.stats_var, font=('Arial', 11, 'bold'))
-        stats_label.grid(row=0, column=0, sticky=tk.W, padx=10, pady=8)
-        
-        self.progress_var = tk.StringVar(value="Загрузка регионов...")
-        progress_label = ttk.Label(stats_frame, textvariable=self.progress_var, font=('Arial', 9))
-        progress_label.grid(row=1, column=0, sticky=tk.W, padx=10, pady=4)
-        
-        button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=6, column=0, columnspan=2, pady=15)
-        
-        self.parse_btn = ttk.Button(button_frame, text="Начать поиск", command=self.start_parsing, width=15)
-        self.parse_btn.pack(side=tk.LEFT, padx=5)
-        
-        self.export_btn = ttk.Button(button_frame, text="Экспорт в Excel", command=self.export_to_excel, width=15)
-        self.export_btn.pack(side=tk.LEFT, padx=5)
-        
-        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
-        self.progress.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
-    
-    def on_custom_region_change(self, *args):
-        custom_text = self.custom_region_var.get().strip()
-        if custom_text:
-            self.region_buttons_frame.grid_remove()
-        else:
-            self.region_buttons_frame.grid()
-    
-    def get_selected_region(self):
-        if self.custom_region_var.get().strip():
-            region_name = self.custom_region_var.get().strip()
-            return get_region_id(region_name, self.parser.api_client)
-        else:
-            return self.region_var.get()
-    
-    def get_vacancies_limits(self):
-        limit_mode = self.limit_mode.get()
-        
-        if limit_mode == "total":
-            try:
-                total = int(self.total_vacancies_var.get())
-                return total, None
-            except:
-                return None, None
-        elif limit_mode == "per_keyword":
-            try:
-                per_keyword = int(self.per_keyword_var.get())
-                return None, per_keyword
-            except:
-                return None, None
-        else:
-            return None, None
-    
-    def start_parsing(self):
-        keywords_text = self.keywords_text.get(1.0, tk.END).strip()
-        if not keywords_text:
-            messagebox.showerror("Ошибка", "Введите ключевые слова")
-            return
-        
-        keywords = [k.strip() for k in keywords_text.split('\n') if k.strip()]
-        area = self.get_selected_region()
-        total_vacancies, per_keyword = self.get_vacancies_limits()
-        
-        region_name = "Вся Россия"
-        if area == "1":
-            region_name = "Москва"
-        elif area == "2":
-            region_name = "Санкт-Петербург"
-        elif self.custom_region_var.get().strip():
-            region_name = self.custom_region_var.get().strip()
-        
-        limit_info = ""
-        if total_vacancies:
-            limit_info = f" (общий лимит: {total_vacancies})"
-        elif per_keyword:
-            limit_info = f" (на ключевое слово: {per_keyword})"
-        
-        self.stats_var.set("Идет поиск вакансий...")
-        self.progress_var.set(f"Регион: {region_name}{limit_info}")
-        
-        thread = threading.Thread(target=self.run_parser, args=(keywords, area, total_vacancies, per_keyword))
-        thread.daemon = True
-        thread.start()
-        
-        self.parse_btn.config(state='disabled')
-        self.progress.start()
-    
-    def run_parser(self, keywords, area, total_vacancies, per_keyword):
-        try:
-            vacancies_count, success, filepath = self.parser.run_parser(keywords, int(area), total_vacancies, per_keyword)
-            self.root.after(0, lambda: self.parsing_completed(vacancies_count, success, filepath))
-        except Exception as e:
-            self.root.after(0, lambda: self.parsing_failed())
-    
-    def parsing_completed(self, vacancies_count, success, filepath):
-        self.progress.stop()
-        self.parse_btn.config(state='normal')
-        
-        self.stats_var.set(f"Вакансий найдено: {vacancies_count}")
-        
-        if success:
-            self.progress_var.set("Поиск завершен!")
-            
-            if vacancies_count > 0:
-                messagebox.showinfo("Успех", f"Найдено {vacancies_count} вакансий\nФайл сохранен: {os.path.basename(filepath)}")
-            else:
-                messagebox.showinfo("Результат", "Вакансии не найдены")
-        else:
-            self.progress_var.set("Ошибка при сохранении")
-            messagebox.showerror("Ошибка", "Ошибка при сохранении данных")
-    
-    def parsing_failed(self):
-        self.progress.stop()
-        self.parse_btn.config(state='normal')
-        self.stats_var.set("Вакансий найдено: 0")
-        self.progress_var.set("Ошибка при поиске")
-        messagebox.showerror("Ошибка", "Произошла ошибка при поиске")
-    
-    def export_to_excel(self):
-        if not self.parser.results:
-            messagebox.showwarning("Предупреждение", "Нет данных для экспорта")
-            return
-        
-        keywords_text = self.keywords_text.get(1.0, tk.END).strip()
-        keywords = [k.strip() for k in keywords_text.split('\n') if k.strip()]
-        default_filename = self.parser.generate_filename(keywords)
-        
-        filename = filedialog.asksaveasfilename(
-            defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-            initialfile=default_filename
-        )
-        
-        if filename:
-            success, filepath = self.parser.save_to_excel(keywords, filename)
-            if success:
-                messagebox.showinfo("Успех", f"Данные экспортированы в:\n{filepath}")
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = HHParserGUI(root)
-    
-    try:
-        root.mainloop()
-    finally:
-        pass
\ No newline at end of file
+import requests
+from requests.adapters import HTTPAdapter
+import time
+import re
+import threading
+import asyncio
+import queue
+import atexit
+import os
+import sys
+import socket
+import sqlite3
+import argparse
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+import multiprocessing
+from urllib.parse import urlparse, quote_plus
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from collections import deque
+from bisect import bisect_left
+import random
+import math
+import csv
+import json
+import copy
+import pickle
+import hashlib
+import shutil
+
+tk = ttk = filedialog = messagebox = None
+
+CACHE_DIR = 'cache'
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+HH_RESULTS_CAP = 2000
+DNS_TIMEOUT = 1.0
+DNS_NEGATIVE_TTL = 3600
+DNS_WORKERS = 32
+PROBE_WORKERS = 32
+PROBE_TIMEOUT = 0.5
+PROBE_POOL_HOSTS = 64
+PROBE_CONNECTIONS_PER_HOST = 4
+HEAD_REJECTED_STATUSES = (403, 405, 501)
+GENERATED_NAME_LIMIT = 6
+PLAYWRIGHT_BUDGET = 2
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+user_agent_source = None
+user_agent_lock = threading.Lock()
+
+def random_user_agent():
+    global user_agent_source
+    with user_agent_lock:
+        if user_agent_source is None:
+            from fake_useragent import UserAgent
+            user_agent_source = UserAgent()
+        return user_agent_source.random
+
+def normalize_company_name(company_name):
+    if not company_name:
+        return ''
+    
+    clean_name = company_name.lower().replace('ё', 'е')
+    clean_name = re.sub(r'[«»"\'`“”„]', ' ', clean_name)
+    clean_name = re.sub(r'\b(ооо|оао|зао|пао|ао|ип|нко|ано|llc|ltd|inc|gmbh)\b', ' ', clean_name)
+    clean_name = re.sub(r'[^\w\s-]', ' ', clean_name)
+    return ' '.join(clean_name.split())
+
+class WebsiteCache:
+    def __init__(self, path=os.path.join(CACHE_DIR, 'websites.sqlite3'), positive_ttl=30 * 24 * 3600,
+                 negative_ttl=3 * 24 * 3600, max_entries=200000):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.writes_since_eviction = 0
+        
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS websites (
+                key TEXT PRIMARY KEY,
+                company_name TEXT,
+                website TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS websites_accessed_at ON websites (accessed_at)')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS employer_sites (
+                employer_id TEXT PRIMARY KEY,
+                site_url TEXT,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+    
+    def make_key(self, company_name, employer_id=None):
+        if employer_id:
+            return f"id:{employer_id}"
+        return f"name:{normalize_company_name(company_name)}"
+    
+    def is_expired(self, website, created_at, now):
+        ttl = self.positive_ttl if website else self.negative_ttl
+        return now - created_at > ttl
+    
+    def get(self, company_name, employer_id=None):
+        key = self.make_key(company_name, employer_id)
+        now = time.time()
+        
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT website, created_at FROM websites WHERE key = ?', (key,)
+            ).fetchone()
+            if not row:
+                return False, None
+            
+            website, created_at = row
+            if self.is_expired(website, created_at, now):
+                self.conn.execute('DELETE FROM websites WHERE key = ?', (key,))
+                self.conn.commit()
+                return False, None
+            
+            self.conn.execute('UPDATE websites SET accessed_at = ? WHERE key = ?', (now, key))
+            self.conn.commit()
+            return True, website
+    
+    def set(self, company_name, website, employer_id=None):
+        key = self.make_key(company_name, employer_id)
+        now = time.time()
+        
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO websites (key, company_name, website, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, company_name, website, now, now)
+            )
+            self.writes_since_eviction += 1
+            if self.writes_since_eviction >= 100:
+                self._evict()
+            self.conn.commit()
+    
+    def get_employer_site(self, employer_id):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT site_url, fetched_at FROM employer_sites WHERE employer_id = ?', (str(employer_id),)
+            ).fetchone()
+        if not row or self.is_expired(row[0], row[1], time.time()):
+            return False, None
+        return True, row[0]
+    
+    def set_employer_sites(self, sites):
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO employer_sites (employer_id, site_url, fetched_at) VALUES (?, ?, ?)',
+                [(str(employer_id), site_url, now) for employer_id, site_url in sites.items()]
+            )
+            self.conn.commit()
+    
+    def _evict(self):
+        self.writes_since_eviction = 0
+        total = self.conn.execute('SELECT COUNT(*) FROM websites').fetchone()[0]
+        if total > self.max_entries:
+            self.conn.execute(
+                'DELETE FROM websites WHERE key IN '
+                '(SELECT key FROM websites ORDER BY accessed_at ASC LIMIT ?)',
+                (total - self.max_entries,)
+            )
+    
+    def stats(self):
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute('SELECT website, created_at FROM websites').fetchall()
+        
+        stats = {'total': len(rows), 'positive': 0, 'negative': 0, 'expired': 0}
+        for website, created_at in rows:
+            if self.is_expired(website, created_at, now):
+                stats['expired'] += 1
+            elif website:
+                stats['positive'] += 1
+            else:
+                stats['negative'] += 1
+        return stats
+    
+    def entries(self, search=None, limit=50):
+        query = 'SELECT key, company_name, website, created_at, accessed_at FROM websites'
+        params = []
+        if search:
+            query += ' WHERE company_name LIKE ? OR website LIKE ? OR key = ?'
+            params = [f"%{search}%", f"%{search}%", search]
+        query += ' ORDER BY accessed_at DESC LIMIT ?'
+        params.append(limit)
+        
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        
+        return [
+            {
+                'key': key,
+                'company_name': company_name,
+                'website': website,
+                'created_at': datetime.fromtimestamp(created_at).isoformat(timespec='seconds'),
+                'accessed_at': datetime.fromtimestamp(accessed_at).isoformat(timespec='seconds'),
+            }
+            for key, company_name, website, created_at, accessed_at in rows
+        ]
+    
+    def purge(self, mode='expired', search=None):
+        now = time.time()
+        with self.lock:
+            if mode == 'all':
+                cursor = self.conn.execute('DELETE FROM websites')
+                self.conn.execute('DELETE FROM employer_sites')
+            elif mode == 'negative':
+                cursor = self.conn.execute('DELETE FROM websites WHERE website IS NULL')
+                self.conn.execute('DELETE FROM employer_sites WHERE site_url IS NULL')
+            elif mode == 'match':
+                cursor = self.conn.execute(
+                    'DELETE FROM websites WHERE company_name LIKE ? OR website LIKE ? OR key = ?',
+                    (f"%{search}%", f"%{search}%", search)
+                )
+            else:
+                cursor = self.conn.execute(
+                    'DELETE FROM websites WHERE (website IS NOT NULL AND created_at < ?) '
+                    'OR (website IS NULL AND created_at < ?)',
+                    (now - self.positive_ttl, now - self.negative_ttl)
+                )
+                self.conn.execute(
+                    'DELETE FROM employer_sites WHERE (site_url IS NOT NULL AND fetched_at < ?) '
+                    'OR (site_url IS NULL AND fetched_at < ?)',
+                    (now - self.positive_ttl, now - self.negative_ttl)
+                )
+            self.conn.commit()
+            return cursor.rowcount
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class VacancyStateStore:
+    def __init__(self, path=os.path.join(CACHE_DIR, 'state.sqlite3'), retention_days=90):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self.path = path
+        self.retention_days = retention_days
+        self.lock = threading.Lock()
+        
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS vacancies (
+                keyword TEXT NOT NULL,
+                area TEXT NOT NULL,
+                vacancy_id TEXT NOT NULL,
+                published_at REAL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (keyword, area, vacancy_id)
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS vacancies_published_at ON vacancies (keyword, area, published_at)')
+        self.conn.commit()
+    
+    def parse_published_at(self, published_at):
+        if not published_at:
+            return None
+        try:
+            return datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%S%z').timestamp()
+        except ValueError:
+            return None
+    
+    def last_published_at(self, keyword, area):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT MAX(published_at) FROM vacancies WHERE keyword = ? AND area = ?',
+                (keyword, str(area))
+            ).fetchone()
+        return row[0] if row else None
+    
+    def known_ids(self, keyword, area, since=None):
+        query = 'SELECT vacancy_id FROM vacancies WHERE keyword = ? AND area = ?'
+        params = [keyword, str(area)]
+        if since:
+            query += ' AND published_at >= ?'
+            params.append(since)
+        
+        with self.lock:
+            return {row[0] for row in self.conn.execute(query, params)}
+    
+    def record(self, entries):
+        now = time.time()
+        rows = [
+            (keyword, str(area), str(vacancy_id), self.parse_published_at(published_at), now)
+            for keyword, area, vacancy_id, published_at in entries
+            if vacancy_id
+        ]
+        
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO vacancies (keyword, area, vacancy_id, published_at, seen_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            self.conn.execute(
+                'DELETE FROM vacancies WHERE seen_at < ?',
+                (now - self.retention_days * 24 * 3600,)
+            )
+            self.conn.commit()
+        return len(rows)
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+QUEUE_LEASE_SECONDS = 300
+QUEUE_MAX_ATTEMPTS = 3
+QUEUE_RETRY_DELAY = 10
+QUEUE_POLL_INTERVAL = 1.0
+QUEUE_EMPLOYER_BATCH = 25
+
+class WorkQueue:
+    def __init__(self, path=os.path.join(CACHE_DIR, 'queue.sqlite3'), lease_seconds=QUEUE_LEASE_SECONDS,
+                 max_attempts=QUEUE_MAX_ATTEMPTS):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=DELETE')
+        self.conn.execute('PRAGMA synchronous=FULL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                settings TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                finished_at REAL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                task_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                available_at REAL NOT NULL DEFAULT 0,
+                lease_until REAL,
+                error TEXT,
+                updated_at REAL,
+                UNIQUE (run_id, task_key)
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, available_at)')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS task_rows (
+                run_id TEXT NOT NULL,
+                task_key TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                row TEXT NOT NULL,
+                PRIMARY KEY (run_id, task_key, position)
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS employer_websites (
+                run_id TEXT NOT NULL,
+                employer_key TEXT NOT NULL,
+                website TEXT,
+                PRIMARY KEY (run_id, employer_key)
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                seen_at REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+    
+    def create_run(self, run_id, settings):
+        settings = json.loads(json.dumps(settings, ensure_ascii=False))
+        with self.lock:
+            row = self.conn.execute('SELECT settings FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+            if row is None:
+                self.conn.execute(
+                    "INSERT INTO runs (run_id, settings, status, created_at) VALUES (?, ?, 'running', ?)",
+                    (run_id, json.dumps(settings, ensure_ascii=False), time.time())
+                )
+                self.conn.commit()
+                return False
+            
+            if json.loads(row[0]) != settings:
+                raise ValueError(f"Запуск {run_id} уже есть в очереди с другими настройками - укажите другой --run-id")
+            
+            retried = self.conn.execute(
+                "UPDATE tasks SET status = 'pending', attempts = 0, available_at = 0, error = NULL, updated_at = ? "
+                "WHERE run_id = ? AND status = 'failed'", (time.time(), run_id)
+            ).rowcount
+            self.conn.execute("UPDATE runs SET status = 'running', finished_at = NULL WHERE run_id = ?", (run_id,))
+            self.conn.commit()
+        
+        if retried:
+            print(f"🔁 Возвращено в очередь неудачных задач: {retried}")
+        return True
+    
+    def discard_tasks(self, run_id, kind, keep_keys):
+        keep_keys = set(keep_keys)
+        with self.lock:
+            stale = [task_key for task_key, in self.conn.execute(
+                "SELECT task_key FROM tasks WHERE run_id = ? AND kind = ? AND status != 'leased'", (run_id, kind)
+            ) if task_key not in keep_keys]
+            for task_key in stale:
+                self.conn.execute('DELETE FROM tasks WHERE run_id = ? AND task_key = ?', (run_id, task_key))
+                self.conn.execute('DELETE FROM task_rows WHERE run_id = ? AND task_key = ?', (run_id, task_key))
+            self.conn.commit()
+        return len(stale)
+    
+    def finish_run(self, run_id):
+        with self.lock:
+            self.conn.execute("UPDATE runs SET status = 'finished', finished_at = ? WHERE run_id = ?",
+                              (time.time(), run_id))
+            self.conn.commit()
+    
+    def add_tasks(self, run_id, kind, tasks):
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.executemany(
+                'INSERT OR IGNORE INTO tasks (run_id, kind, task_key, payload, updated_at) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, kind, task_key, json.dumps(payload, ensure_ascii=False), now) for task_key, payload in tasks]
+            )
+            self.conn.commit()
+        return cursor.rowcount
+    
+    def lease(self, worker_id, run_id=None):
+        now = time.time()
+        query = ("SELECT id, run_id, kind, task_key, payload, attempts FROM tasks "
+                 "WHERE ((status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_until < ?))")
+        params = [now, now]
+        if run_id:
+            query += ' AND run_id = ?'
+            params.append(run_id)
+        query += ' ORDER BY id LIMIT 1'
+        
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = 'lease expired', lease_until = NULL, updated_at = ? "
+                    "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts)
+                )
+                row = self.conn.execute(query, params).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                        "updated_at = ? WHERE id = ?",
+                        (worker_id, now + self.lease_seconds, now, row[0])
+                    )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        
+        if row is None:
+            return None
+        task_id, task_run_id, kind, task_key, payload, attempts = row
+        return {'id': task_id, 'run_id': task_run_id, 'kind': kind, 'key': task_key,
+                'payload': json.loads(payload), 'attempts': attempts + 1}
+    
+    def extend(self, task_id, worker_id):
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, task_id, worker_id)
+            )
+            self.conn.commit()
+        return cursor.rowcount > 0
+    
+    def complete(self, task_id, worker_id):
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE tasks SET status = 'done', lease_until = NULL, error = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time(), task_id, worker_id)
+            )
+            self.conn.commit()
+        return cursor.rowcount > 0
+    
+    def fail(self, task_id, worker_id, error):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "available_at = ? + ? * attempts, lease_until = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, now, QUEUE_RETRY_DELAY, str(error)[:500], now, task_id, worker_id)
+            )
+            self.conn.commit()
+    
+    def store_rows(self, run_id, task_key, keyword, rows):
+        with self.lock:
+            self.conn.execute('DELETE FROM task_rows WHERE run_id = ? AND task_key = ?', (run_id, task_key))
+            self.conn.executemany(
+                'INSERT INTO task_rows (run_id, task_key, position, keyword, row) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, task_key, position, keyword, json.dumps(row, ensure_ascii=False))
+                 for position, row in enumerate(rows)]
+            )
+            self.conn.commit()
+    
+    def store_websites(self, run_id, websites):
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO employer_websites (run_id, employer_key, website) VALUES (?, ?, ?)',
+                [(run_id, str(key), website) for key, website in websites.items()]
+            )
+            self.conn.commit()
+    
+    def rows(self, run_id):
+        rows_by_task = {}
+        with self.lock:
+            for task_key, row in self.conn.execute(
+                'SELECT task_key, row FROM task_rows WHERE run_id = ? ORDER BY task_key, position', (run_id,)
+            ):
+                rows_by_task.setdefault(task_key, []).append(json.loads(row))
+        return rows_by_task
+    
+    def websites(self, run_id):
+        with self.lock:
+            return dict(self.conn.execute(
+                'SELECT employer_key, website FROM employer_websites WHERE run_id = ?', (run_id,)
+            ))
+    
+    def counts(self, run_id=None, kind=None):
+        query = 'SELECT status, COUNT(*) FROM tasks WHERE 1 = 1'
+        params = []
+        if run_id:
+            query += ' AND run_id = ?'
+            params.append(run_id)
+        if kind:
+            query += ' AND kind = ?'
+            params.append(kind)
+        query += ' GROUP BY status'
+        
+        with self.lock:
+            counts = dict(self.conn.execute(query, params))
+        return {status: counts.get(status, 0) for status in ('pending', 'leased', 'done', 'failed')}
+    
+    def failures(self, run_id, limit=5):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT kind, task_key, attempts, error FROM tasks WHERE run_id = ? AND status = 'failed' "
+                "ORDER BY id LIMIT ?", (run_id, limit)
+            ).fetchall()
+    
+    def run_settings(self, run_id):
+        with self.lock:
+            row = self.conn.execute('SELECT settings FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+    
+    def touch_worker(self, worker_id):
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO workers (worker_id, seen_at) VALUES (?, ?)', (worker_id, time.time()))
+            self.conn.commit()
+    
+    def remove_worker(self, worker_id):
+        with self.lock:
+            self.conn.execute('DELETE FROM workers WHERE worker_id = ?', (worker_id,))
+            self.conn.commit()
+    
+    def active_workers(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM workers WHERE seen_at >= ?',
+                                     (time.time() - self.lease_seconds,)).fetchone()[0]
+    
+    def runs(self, limit=10):
+        with self.lock:
+            return self.conn.execute(
+                'SELECT run_id, status, created_at, finished_at FROM runs ORDER BY created_at DESC LIMIT ?', (limit,)
+            ).fetchall()
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+JOURNAL_CHECKPOINT_INTERVAL = 5
+JOURNAL_CHECKPOINT_BATCH = 50
+JOURNAL_MAX_AGE = 24 * 3600
+
+class RunJournal:
+    def __init__(self, path=os.path.join(CACHE_DIR, 'journal.sqlite3')):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self.path = path
+        self.run_key = None
+        self.lock = threading.Lock()
+        self.pending_pages = []
+        self.pending_websites = []
+        self.last_checkpoint = time.time()
+        
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS journal_runs (
+                run_key TEXT PRIMARY KEY,
+                searched INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        columns = [column[1] for column in self.conn.execute('PRAGMA table_info(journal_runs)')]
+        if 'created_at' not in columns:
+            self.conn.execute('ALTER TABLE journal_runs ADD COLUMN created_at REAL NOT NULL DEFAULT 0')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS journal_pages (
+                run_key TEXT NOT NULL,
+                request TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (run_key, request)
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS journal_vacancies (
+                run_key TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                row TEXT NOT NULL,
+                PRIMARY KEY (run_key, position)
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS journal_websites (
+                run_key TEXT NOT NULL,
+                employer_key TEXT NOT NULL,
+                website TEXT,
+                PRIMARY KEY (run_key, employer_key)
+            )
+        ''')
+        self.conn.commit()
+    
+    def request_key(self, params):
+        return json.dumps(params, ensure_ascii=False, sort_keys=True)
+    
+    def clear(self, run_key):
+        for table in ('journal_runs', 'journal_pages', 'journal_vacancies', 'journal_websites'):
+            self.conn.execute(f'DELETE FROM {table} WHERE run_key = ?', (run_key,))
+    
+    def start(self, run_key, resume=False):
+        now = time.time()
+        with self.lock:
+            self.run_key = run_key
+            expired = [key for key, in self.conn.execute('SELECT run_key FROM journal_runs WHERE created_at < ?',
+                                                         (now - JOURNAL_MAX_AGE,))]
+            if resume and run_key in expired:
+                print(f"⚠️ Контрольная точка старше {JOURNAL_MAX_AGE // 3600} ч - начинаем заново")
+            for key in expired:
+                self.clear(key)
+            if not resume:
+                self.clear(run_key)
+            
+            resumed = self.conn.execute('SELECT 1 FROM journal_runs WHERE run_key = ?', (run_key,)).fetchone() is not None
+            if resumed:
+                self.conn.execute('UPDATE journal_runs SET updated_at = ? WHERE run_key = ?', (now, run_key))
+            else:
+                self.conn.execute('INSERT INTO journal_runs (run_key, created_at, updated_at) VALUES (?, ?, ?)',
+                                  (run_key, now, now))
+            self.conn.commit()
+        return resumed
+    
+    def attach(self, run_key):
+        with self.lock:
+            self.run_key = run_key
+    
+    def page(self, params):
+        request = self.request_key(params)
+        with self.lock:
+            for pending_request, data in self.pending_pages:
+                if pending_request == request:
+                    return json.loads(data)
+            row = self.conn.execute('SELECT data FROM journal_pages WHERE run_key = ? AND request = ?',
+                                    (self.run_key, request)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def record_page(self, params, data):
+        with self.lock:
+            self.pending_pages.append((self.request_key(params), json.dumps(data, ensure_ascii=False)))
+        self.checkpoint()
+    
+    def record_website(self, employer_key, website):
+        with self.lock:
+            self.pending_websites.append((str(employer_key), website))
+        self.checkpoint()
+    
+    def checkpoint(self, force=False):
+        with self.lock:
+            pending = len(self.pending_pages) + len(self.pending_websites)
+            if not pending:
+                return
+            if not force and pending < JOURNAL_CHECKPOINT_BATCH and time.time() - self.last_checkpoint < JOURNAL_CHECKPOINT_INTERVAL:
+                return
+            
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO journal_pages (run_key, request, data) VALUES (?, ?, ?)',
+                [(self.run_key, request, data) for request, data in self.pending_pages]
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO journal_websites (run_key, employer_key, website) VALUES (?, ?, ?)',
+                [(self.run_key, employer_key, website) for employer_key, website in self.pending_websites]
+            )
+            self.conn.execute('UPDATE journal_runs SET updated_at = ? WHERE run_key = ?', (time.time(), self.run_key))
+            self.conn.commit()
+            self.pending_pages = []
+            self.pending_websites = []
+            self.last_checkpoint = time.time()
+    
+    def record_vacancies(self, vacancies):
+        self.checkpoint(force=True)
+        with self.lock:
+            self.conn.execute('DELETE FROM journal_vacancies WHERE run_key = ?', (self.run_key,))
+            self.conn.executemany(
+                'INSERT INTO journal_vacancies (run_key, position, row) VALUES (?, ?, ?)',
+                [(self.run_key, position, json.dumps(vacancy, ensure_ascii=False))
+                 for position, vacancy in enumerate(vacancies)]
+            )
+            self.conn.execute('UPDATE journal_runs SET searched = 1, updated_at = ? WHERE run_key = ?',
+                              (time.time(), self.run_key))
+            self.conn.commit()
+    
+    def vacancies(self):
+        with self.lock:
+            row = self.conn.execute('SELECT searched FROM journal_runs WHERE run_key = ?', (self.run_key,)).fetchone()
+            if not row or not row[0]:
+                return None
+            return [json.loads(vacancy) for vacancy, in self.conn.execute(
+                'SELECT row FROM journal_vacancies WHERE run_key = ? ORDER BY position', (self.run_key,)
+            )]
+    
+    def websites(self):
+        self.checkpoint(force=True)
+        with self.lock:
+            return dict(self.conn.execute(
+                'SELECT employer_key, website FROM journal_websites WHERE run_key = ?', (self.run_key,)
+            ))
+    
+    def finish(self):
+        with self.lock:
+            self.pending_pages = []
+            self.pending_websites = []
+            self.clear(self.run_key)
+            self.conn.commit()
+    
+    def close(self):
+        self.checkpoint(force=True)
+        with self.lock:
+            self.conn.close()
+
+HOST_RATE_LIMITS = {'api.hh.ru': 8, 'yandex.ru': 1}
+DEFAULT_HOST_RATE = 10
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_COOLDOWN = 5
+CAPTCHA_COOLDOWN = 120
+SERP_MAX_WAIT = 2
+PROBE_MAX_WAIT = 1
+RETRY_AFTER_MAX = 60
+RETRY_AFTER_LIMITS = {'api.hh.ru': 900}
+
+def retry_after_seconds(headers):
+    value = (headers or {}).get('Retry-After')
+    if not value:
+        return None
+    
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        return max(0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    def __init__(self, rate=8, burst=None, min_rate=None):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate else rate / 16
+        self.increase = rate / 20
+        self.capacity = burst if burst else max(1, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self, max_delay=None):
+        with self.lock:
+            now = time.monotonic()
+            if now > self.updated_at:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+            
+            delay = self.updated_at - now
+            if self.tokens < 1:
+                delay += (1 - self.tokens) / self.rate
+            if max_delay is not None and delay > max_delay:
+                return None
+            
+            self.tokens -= 1
+            return delay
+    
+    def wait(self, max_delay=None):
+        delay = self.reserve(max_delay)
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+    
+    def set_rate(self, rate):
+        with self.lock:
+            self.max_rate = rate
+            self.rate = min(self.rate, rate)
+            self.min_rate = rate / 16
+            self.increase = rate / 20
+            self.capacity = max(1, rate)
+            self.tokens = min(self.tokens, self.capacity)
+    
+    def on_success(self):
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+    
+    def on_throttle(self, cooldown=0):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            resume_at = time.monotonic() + cooldown
+            if resume_at > self.updated_at:
+                self.updated_at = resume_at
+                self.tokens = min(self.tokens, 0)
+
+class HostRateLimiter:
+    def __init__(self, rates=None, default_rate=DEFAULT_HOST_RATE):
+        self.rates = dict(HOST_RATE_LIMITS)
+        self.rates.update(rates or {})
+        self.default_rate = default_rate
+        self.limiters = {}
+        self.lock = threading.Lock()
+    
+    def host_key(self, url):
+        host = (urlparse(url).hostname if '://' in url else url) or ''
+        host = host.lower()
+        for configured_host in self.rates:
+            if host == configured_host or host.endswith('.' + configured_host):
+                return configured_host
+        return host[4:] if host.startswith('www.') else host
+    
+    def for_host(self, url):
+        key = self.host_key(url)
+        with self.lock:
+            limiter = self.limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(self.rates.get(key, self.default_rate))
+                self.limiters[key] = limiter
+            return limiter
+    
+    def wait(self, url, max_delay=None):
+        return self.for_host(url).wait(max_delay)
+    
+    def reserve(self, url, max_delay=None):
+        return self.for_host(url).reserve(max_delay)
+    
+    def report(self, url, status=None, headers=None, captcha=False):
+        limiter = self.for_host(url)
+        if captcha:
+            limiter.on_throttle(CAPTCHA_COOLDOWN)
+            print(f"🛑 Капча на {self.host_key(url)}: пауза {CAPTCHA_COOLDOWN}с, скорость снижена до {limiter.rate:.2f} запр/с")
+            return True
+        
+        if status in THROTTLE_STATUSES:
+            host = self.host_key(url)
+            cooldown = retry_after_seconds(headers)
+            cooldown = THROTTLE_COOLDOWN if cooldown is None else min(cooldown, RETRY_AFTER_LIMITS.get(host, RETRY_AFTER_MAX))
+            limiter.on_throttle(cooldown)
+            print(f"⏳ {host} ответил {status}: пауза {cooldown:.0f}с, скорость снижена до {limiter.rate:.2f} запр/с")
+            return True
+        
+        if status is not None and status < 400:
+            limiter.on_success()
+        return False
+
+REGION_ALIASES = {
+    'мск': '1', 'moscow': '1', 'спб': '2', 'питер': '2', 'екб': '3', 'нск': '4', 'нн': '66'
+}
+
+def normalize_region_name(name):
+    clean_name = name.lower().replace('ё', 'е').replace('-', ' ')
+    clean_name = re.sub(r'[^\w\s]', ' ', clean_name)
+    return ' '.join(clean_name.split())
+
+def name_trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class RegionIndex:
+    def __init__(self, areas_tree):
+        self.areas = {}
+        self.children = {}
+        self.regions = {}
+        self.names = {}
+        self.words = {}
+        self.trigrams = {}
+        self.trigram_counts = {}
+        
+        pending = [(area, None, 0) for area in reversed(areas_tree)]
+        while pending:
+            area, parent_id, depth = pending.pop()
+            child_areas = area.get('areas') or []
+            self.areas[area['id']] = {'id': area['id'], 'name': area['name'], 'parent_id': parent_id,
+                                      'depth': depth, 'order': len(self.areas)}
+            self.children[area['id']] = [child['id'] for child in child_areas]
+            self.regions[area['name'].lower()] = area['id']
+            self.add_name(normalize_region_name(area['name']), area['id'])
+            pending.extend((child, area['id'], depth + 1) for child in reversed(child_areas))
+        
+        for alias, area_id in REGION_ALIASES.items():
+            if area_id in self.areas:
+                self.regions[alias] = area_id
+                self.add_name(alias, area_id)
+        
+        for area_ids in self.names.values():
+            area_ids.sort(key=self.rank_key)
+        self.sorted_names = sorted(self.names)
+    
+    def add_name(self, name, area_id):
+        if not name:
+            return
+        
+        if name not in self.names:
+            self.names[name] = []
+            for word in name.split():
+                self.words.setdefault(word, set()).add(name)
+            trigrams = name_trigrams(name)
+            self.trigram_counts[name] = len(trigrams)
+            for trigram in trigrams:
+                self.trigrams.setdefault(trigram, set()).add(name)
+        if area_id not in self.names[name]:
+            self.names[name].append(area_id)
+    
+    def rank_key(self, area_id):
+        area = self.areas[area_id]
+        return area['depth'], area['order']
+    
+    def path(self, area_id):
+        names = []
+        while area_id:
+            area = self.areas[area_id]
+            names.append(area['name'])
+            area_id = area['parent_id']
+        return ' / '.join(reversed(names))
+    
+    def search(self, query, limit=5):
+        clean_query = normalize_region_name(query or '')
+        if not clean_query:
+            return []
+        
+        scores = {}
+        
+        def add(name, score):
+            for area_id in self.names[name]:
+                if score > scores.get(area_id, 0):
+                    scores[area_id] = score
+        
+        if clean_query in self.names:
+            add(clean_query, 1.0)
+        
+        start = bisect_left(self.sorted_names, clean_query)
+        end = bisect_left(self.sorted_names, clean_query + '\uffff', start)
+        for name in self.sorted_names[start:end]:
+            add(name, 0.8 + 0.1 * len(clean_query) / len(name))
+        
+        query_words = clean_query.split()
+        for word in query_words:
+            for name in self.words.get(word, ()):
+                add(name, 0.6 + 0.2 * len(word) / len(name.replace(' ', '')))
+        
+        if len(scores) < limit:
+            query_trigrams = name_trigrams(clean_query)
+            overlaps = {}
+            for trigram in query_trigrams:
+                for name in self.trigrams.get(trigram, ()):
+                    overlaps[name] = overlaps.get(name, 0) + 1
+            for name, overlap in overlaps.items():
+                similarity = overlap / (len(query_trigrams) + self.trigram_counts[name] - overlap)
+                if similarity >= 0.35:
+                    add(name, 0.6 * similarity)
+        
+        ranked = sorted(scores, key=lambda area_id: (-scores[area_id],) + self.rank_key(area_id))
+        return [
+            {'id': area_id, 'name': self.areas[area_id]['name'], 'path': self.path(area_id), 'score': round(scores[area_id], 3)}
+            for area_id in ranked[:limit]
+        ]
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+    
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                print(f"🔌 {self.name}: эндпоинт снова отвечает")
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    print(f"🔌 {self.name}: {self.failures} ошибок подряд, запросы приостановлены на {self.reset_timeout}с")
+                self.opened_at = time.monotonic()
+
+class HHApiClient:
+    def __init__(self, rate_limit=8, host_limiter=None, max_retries=3, backoff_base=0.5, backoff_max=8,
+                 breaker_threshold=5, breaker_reset=30, areas_path=os.path.join(CACHE_DIR, 'areas.json'),
+                 areas_ttl=7 * 24 * 3600):
+        self.base_url = "https://api.hh.ru"
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'application/json, text/plain, */*',
+        })
+        self.host_limiter = host_limiter if host_limiter else HostRateLimiter({'api.hh.ru': rate_limit})
+        self.api_host = urlparse(self.base_url).hostname
+        self.rate_limiter = self.host_limiter.for_host(self.api_host)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.breakers = {}
+        self.journal = None
+        self.stats_lock = threading.Lock()
+        self.reset_stats()
+        self.areas_path = areas_path
+        self.areas_ttl = areas_ttl
+        self.regions_cache = None
+        self.region_index = None
+        self.area_children = {}
+        self.regions_lock = threading.Lock()
+    
+    def load_regions(self, refresh=False):
+        with self.regions_lock:
+            if self.regions_cache is not None and not refresh:
+                return self.regions_cache
+            
+            try:
+                areas_tree = self.load_areas_tree(refresh)
+                if areas_tree is not None:
+                    self.region_index = RegionIndex(areas_tree)
+                    self.area_children = self.region_index.children
+                    self.regions_cache = self.region_index.regions
+                    print(f"✅ Загружено регионов: {len(self.regions_cache)}")
+                    return self.regions_cache
+                else:
+                    print("❌ Ошибка загрузки регионов")
+                    return {}
+            except Exception as e:
+                print(f"❌ Ошибка при загрузке регионов: {e}")
+                return {}
+    
+    def read_areas_cache(self):
+        if not self.areas_path or not os.path.exists(self.areas_path):
+            return None
+        try:
+            with open(self.areas_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            return cached if isinstance(cached.get('areas'), list) else None
+        except (OSError, ValueError, AttributeError):
+            return None
+    
+    def write_areas_cache(self, areas_tree, etag):
+        if not self.areas_path:
+            return
+        
+        directory = os.path.dirname(self.areas_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        tmp_path = self.areas_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'etag': etag, 'fetched_at': time.time(), 'areas': areas_tree}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.areas_path)
+    
+    def load_areas_tree(self, refresh=False):
+        cached = self.read_areas_cache()
+        if cached and not refresh and time.time() - cached.get('fetched_at', 0) < self.areas_ttl:
+            return cached['areas']
+        
+        print("🔄 Загружаем список регионов...")
+        headers = {'If-None-Match': cached['etag']} if cached and cached.get('etag') else None
+        response = self.request(f"{self.base_url}/areas", headers=headers)
+        
+        if response is not None and response.status_code == 304 and cached:
+            areas_tree, etag = cached['areas'], cached['etag']
+        elif response is not None and response.status_code == 200:
+            areas_tree, etag = response.json(), response.headers.get('ETag')
+        elif cached:
+            print("⚠️ Используем сохраненный список регионов")
+            return cached['areas']
+        else:
+            return None
+        
+        self.write_areas_cache(areas_tree, etag)
+        return areas_tree
+    
+    def get_area_children(self, area_id):
+        self.load_regions()
+        return self.area_children.get(str(area_id), [])
+    
+    def find_regions(self, query, limit=5):
+        self.load_regions()
+        if self.region_index is None:
+            return []
+        return self.region_index.search(query, limit)
+    
+    def search_vacancies(self, text, area=113, page=0, per_page=100, **filters):
+        url = f"{self.base_url}/vacancies"
+        params = {
+            'text': text,
+            'area': area,
+            'page': page,
+            'per_page': per_page,
+        }
+        params.update(filters)
+        
+        if self.journal:
+            data = self.journal.page(params)
+            if data is not None:
+                return data
+        
+        try:
+            data = self.request_json(url, params)
+        except Exception as e:
+            print(f"❌ Ошибка API: {e}")
+            return None
+        
+        if self.journal and data is not None:
+            self.journal.record_page(params, data)
+        return data
+    
+    def get_employer(self, employer_id):
+        try:
+            return self.request_json(f"{self.base_url}/employers/{employer_id}")
+        except Exception as e:
+            print(f"❌ Ошибка API работодателя {employer_id}: {e}")
+            return None
+    
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+            self.failed_requests = []
+    
+    def count(self, stat):
+        with self.stats_lock:
+            self.stats[stat] += 1
+    
+    def merge_stats(self, stats, failed_requests):
+        with self.stats_lock:
+            for stat, value in stats.items():
+                self.stats[stat] = self.stats.get(stat, 0) + value
+            self.failed_requests.extend(failed_requests)
+    
+    def record_failure(self, url, params, reason):
+        with self.stats_lock:
+            self.stats['failures'] += 1
+            self.failed_requests.append({'url': url, 'params': dict(params or {}), 'reason': reason})
+    
+    def breaker_for(self, url):
+        path = urlparse(url).path.strip('/')
+        endpoint = '/' + path.split('/')[0] if path else '/'
+        with self.stats_lock:
+            breaker = self.breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(f"API {endpoint}", self.breaker_threshold, self.breaker_reset)
+                self.breakers[endpoint] = breaker
+            return breaker
+    
+    def backoff_delay(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    def classify_response(self, status, headers):
+        if self.host_limiter.report(self.api_host, status, headers):
+            return 'throttled'
+        if status >= 500:
+            return 'retry'
+        if status in (200, 304):
+            return 'ok'
+        return 'failed' if status != 404 else 'missing'
+    
+    def request_json(self, url, params=None):
+        response = self.request(url, params)
+        if response is not None and response.status_code == 200:
+            return response.json()
+        return None
+    
+    def request(self, url, params=None, headers=None):
+        breaker = self.breaker_for(url)
+        reason = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                reason = 'circuit open'
+                break
+            
+            if attempt:
+                self.count('retries')
+            self.count('requests')
+            self.rate_limiter.wait()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=10)
+            except requests.RequestException as e:
+                breaker.record_failure()
+                reason = f"{type(e).__name__}: {e}"
+                time.sleep(self.backoff_delay(attempt))
+                continue
+            
+            outcome = self.classify_response(response.status_code, response.headers)
+            reason = f"HTTP {response.status_code}"
+            if outcome == 'throttled':
+                continue
+            if outcome == 'retry':
+                breaker.record_failure()
+                time.sleep(self.backoff_delay(attempt))
+                continue
+            
+            breaker.record_success()
+            if outcome == 'failed':
+                self.record_failure(url, params, reason)
+            return response
+        
+        self.record_failure(url, params, reason)
+        return None
+
+class VacancySlicePlanner:
+    def __init__(self, api_client, max_results=HH_RESULTS_CAP, lookback_days=30, min_window_minutes=10):
+        self.api_client = api_client
+        self.max_results = max_results
+        self.lookback_days = lookback_days
+        self.min_window = timedelta(minutes=min_window_minutes)
+    
+    def make_filters(self, date_from=None, date_to=None):
+        filters = {}
+        if date_from:
+            filters['date_from'] = date_from.strftime('%Y-%m-%dT%H:%M:%S%z')
+        if date_to:
+            filters['date_to'] = date_to.strftime('%Y-%m-%dT%H:%M:%S%z')
+        return filters
+    
+    def count(self, keyword, area, filters):
+        data = self.api_client.search_vacancies(keyword, area, 0, 1, **filters)
+        return data.get('found', 0) if data else 0
+    
+    def plan(self, keyword, area=113, limit=None):
+        found = self.count(keyword, area, {})
+        if found <= self.max_results:
+            return [{'area': area, 'filters': {}, 'found': found}]
+        
+        print(f"✂️ '{keyword}': найдено {found} вакансий (API отдает не больше {self.max_results}), разбиваем запрос")
+        date_to = datetime.now(timezone.utc).replace(microsecond=0)
+        slices = []
+        self._split(keyword, area, None, date_to, found, slices, limit)
+        print(f"✂️ '{keyword}': запрос разбит на {len(slices)} частей")
+        return slices
+    
+    def covered(self, slices, limit):
+        return limit is not None and sum(vacancy_slice['found'] for vacancy_slice in slices) >= limit
+    
+    def _split(self, keyword, area, date_from, date_to, found, slices, limit=None):
+        if self.covered(slices, limit):
+            return
+        if found <= self.max_results:
+            slices.append({'area': area, 'filters': self.make_filters(date_from, date_to), 'found': found})
+            return
+        
+        if date_from is None:
+            boundary = date_to - timedelta(days=self.lookback_days)
+            windows = [(boundary, date_to), (None, boundary)]
+        elif date_to - date_from > self.min_window:
+            middle = (date_from + (date_to - date_from) / 2).replace(microsecond=0)
+            windows = [(middle, date_to), (date_from, middle)]
+        else:
+            children = self.api_client.get_area_children(area)
+            if not children:
+                print(f"⚠️ '{keyword}': не удалось разбить срез ({found} вакансий), будет получено не больше {self.max_results}")
+                slices.append({'area': area, 'filters': self.make_filters(date_from, date_to), 'found': found})
+                return
+            windows = None
+        
+        if windows is None:
+            filters = self.make_filters(date_from, date_to)
+            for child_area in children:
+                if self.covered(slices, limit):
+                    return
+                child_found = self.count(keyword, child_area, filters)
+                if child_found:
+                    self._split(keyword, child_area, date_from, date_to, child_found, slices, limit)
+            return
+        
+        for window_from, window_to in windows:
+            if self.covered(slices, limit):
+                return
+            window_found = self.count(keyword, area, self.make_filters(window_from, window_to))
+            if window_found:
+                self._split(keyword, area, window_from, window_to, window_found, slices, limit)
+
+BROWSER_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=VizDisplayCompositor',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-ipc-flooding-protection',
+    '--disable-hang-monitor',
+    '--disable-popup-blocking',
+    '--disable-prompt-on-repost',
+    '--disable-back-forward-cache',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-default-apps',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-translate',
+    '--disable-web-security',
+    '--allow-running-insecure-content',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-client-side-phishing-detection',
+    '--disable-cookie-encryption',
+    '--disable-domain-reliability',
+    '--disable-print-preview',
+    '--disable-speech-api',
+    '--disable-sync',
+    '--disable-webaudio',
+    '--disable-webgl',
+    '--disable-webrtc',
+    '--force-color-profile=srgb',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--use-mock-keychain',
+    '--hide-scrollbars',
+    '--ignore-certificate-errors',
+    '--ignore-ssl-errors',
+    '--ignore-certificate-errors-spki-list',
+    '--log-level=3',
+    '--silent'
+]
+
+def stealth_context_options():
+    user_agents = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    ]
+    
+    viewports = [
+        {'width': 1920, 'height': 1080},
+        {'width': 1366, 'height': 768},
+        {'width': 1536, 'height': 864},
+        {'width': 1280, 'height': 720}
+    ]
+    
+    return {
+        'user_agent': random.choice(user_agents),
+        'viewport': random.choice(viewports),
+        'locale': 'ru-RU',
+        'timezone_id': 'Europe/Moscow',
+        'geolocation': {'latitude': 55.7558, 'longitude': 37.6173},
+        'permissions': ['geolocation'],
+        'extra_http_headers': {
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+    }
+
+STEALTH_PROFILE = {
+    'name': 'stealth',
+    'options': stealth_context_options,
+    'init_script': """
+        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+        Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+        Object.defineProperty(navigator, 'languages', {get: () => ['ru-RU', 'ru', 'en-US', 'en']});
+        Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 8});
+        Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});
+        Object.defineProperty(screen, 'width', {get: () => 1920});
+        Object.defineProperty(screen, 'height', {get: () => 1080});
+        Object.defineProperty(screen, 'colorDepth', {get: () => 24});
+        Object.defineProperty(Notification, 'permission', {get: () => 'default'});
+        window.chrome = {runtime: {}};
+        const originalQuery = window.navigator.permissions.query;
+        window.navigator.permissions.query = (parameters) => (
+            parameters.name === 'notifications' ?
+                Promise.resolve({ state: Notification.permission }) :
+                originalQuery(parameters)
+        );
+    """
+}
+
+HUMANIZED_PROFILE = {
+    'name': 'humanized',
+    'options': {
+        'viewport': {'width': 1366, 'height': 768},
+        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'locale': 'ru-RU'
+    },
+    'init_script': """
+        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    """
+}
+
+FAST_PROFILE = {
+    'name': 'fast',
+    'options': {
+        'viewport': {'width': 1920, 'height': 1080},
+        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    },
+    'init_script': None
+}
+
+SERP_LINKS_SCRIPT = """
+    (links, limit) => links.slice(0, limit).map(link => ({
+        href: link.getAttribute('href'),
+        text: (link.textContent || '').trim()
+    }))
+"""
+
+SERP_STRATEGIES = {
+    'stealth': {
+        'profile': STEALTH_PROFILE,
+        'region': 213,
+        'timeout': 2000,
+        'settle_ms': 100,
+        'captcha_selector': 'form[action*="checkcaptcha"], .captcha, .CheckboxCaptcha',
+        'selectors': [
+            'a.organic__greenurl',
+            '.serp-item a[href*="http"]',
+            '.organic a[href*="http"]',
+            '[data-cid] a[href*="http"]',
+            '.Path-Item a[href*="http"]',
+            '.organic__path a',
+            '[data-log-node*="organic"] a',
+            '.Organic a[href*="http"]'
+        ],
+        'links_per_selector': 5,
+        'skip_prefixes': (),
+        'require_relevant_text': True,
+        'fallback_links': 10
+    },
+    'humanized': {
+        'profile': HUMANIZED_PROFILE,
+        'region': None,
+        'timeout': 2000,
+        'settle_ms': 0,
+        'captcha_selector': 'form[action*="checkcaptcha"]',
+        'selectors': [
+            'a.organic__greenurl',
+            '.serp-item a[href*="http"]',
+            '.organic a[href*="http"]'
+        ],
+        'links_per_selector': 3,
+        'skip_prefixes': (),
+        'require_relevant_text': False,
+        'fallback_links': 0
+    },
+    'fast': {
+        'profile': FAST_PROFILE,
+        'region': None,
+        'timeout': 20000,
+        'settle_ms': 0,
+        'captcha_selector': None,
+        'selectors': ['a[href*="http"]'],
+        'links_per_selector': 8,
+        'skip_prefixes': ('https://yandex.ru',),
+        'require_relevant_text': False,
+        'fallback_links': 0
+    }
+}
+
+class CaptchaDetected(Exception):
+    pass
+
+class HostThrottled(Exception):
+    pass
+
+class SerpThrottled(HostThrottled):
+    pass
+
+def error_outcome(error):
+    if isinstance(error, CaptchaDetected):
+        return 'captcha'
+    if isinstance(error, HostThrottled):
+        return 'throttled'
+    if isinstance(error, TimeoutError) or 'Timeout' in type(error).__name__:
+        return 'timeout'
+    return 'error'
+
+class ResolutionProfiler:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self.lock:
+            self.timings = {}
+            self.outcomes = {}
+            self.values = {}
+    
+    def record(self, name, elapsed, outcome):
+        with self.lock:
+            entry = self.timings.get(name)
+            if entry is None:
+                entry = self.timings[name] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                              'buckets': [0] * (len(self.buckets) + 1)}
+            entry['count'] += 1
+            entry['total'] += elapsed
+            entry['max'] = max(entry['max'], elapsed)
+            entry['buckets'][bisect_left(self.buckets, elapsed)] += 1
+            outcomes = self.outcomes.setdefault(name, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    
+    def count(self, name, outcome):
+        with self.lock:
+            outcomes = self.outcomes.setdefault(name, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    
+    def observe(self, name, value):
+        with self.lock:
+            values = self.values.setdefault(name, {})
+            values[value] = values.get(value, 0) + 1
+    
+    def quantile(self, entry, q):
+        target = q * entry['count']
+        seen = 0
+        for index, count in enumerate(entry['buckets']):
+            seen += count
+            if count and seen >= target:
+                return min(self.buckets[index], round(entry['max'], 4)) if index < len(self.buckets) else round(entry['max'], 4)
+        return round(entry['max'], 4)
+    
+    def report(self):
+        with self.lock:
+            timings = {name: dict(entry, buckets=list(entry['buckets'])) for name, entry in self.timings.items()}
+            outcomes = {name: dict(counts) for name, counts in self.outcomes.items()}
+            values = {name: dict(counts) for name, counts in self.values.items()}
+        
+        report = {}
+        for name in sorted(outcomes):
+            counts = outcomes[name]
+            total = sum(counts.values())
+            stats = {'outcomes': counts, 'rates': {outcome: round(count / total, 3) for outcome, count in counts.items()}}
+            entry = timings.get(name)
+            if entry:
+                stats.update({
+                    'count': entry['count'],
+                    'mean': round(entry['total'] / entry['count'], 4),
+                    'p50': self.quantile(entry, 0.5),
+                    'p90': self.quantile(entry, 0.9),
+                    'p99': self.quantile(entry, 0.99),
+                    'max': round(entry['max'], 4),
+                    'histogram': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], entry['buckets'])),
+                })
+            report[name] = stats
+        
+        return {'timings': report, 'values': {name: dict(sorted(counts.items())) for name, counts in values.items()}}
+    
+    def print_report(self):
+        report = self.report()
+        if not report['timings']:
+            return
+        
+        print("⏱️ Профиль поиска сайтов:")
+        for name, stats in report['timings'].items():
+            outcomes = ", ".join(f"{outcome} {count}" for outcome, count in sorted(stats['outcomes'].items()))
+            if 'count' in stats:
+                print(f"   {name}: {stats['count']} шт., среднее {stats['mean']:.3f}с, "
+                      f"p50 ≤{stats['p50']}с, p90 ≤{stats['p90']}с, p99 ≤{stats['p99']}с, макс {stats['max']:.3f}с ({outcomes})")
+            else:
+                print(f"   {name}: {outcomes}")
+        for name, counts in report['values'].items():
+            print(f"   {name}: " + ", ".join(f"{value}: {count}" for value, count in counts.items()))
+
+class BrowserPool:
+    def __init__(self, size=2, max_uses=50, headless=True, launch_args=None):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.headless = headless
+        self.launch_args = launch_args if launch_args is not None else BROWSER_LAUNCH_ARGS
+        self.tasks = queue.Queue()
+        self.workers = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    def start(self):
+        with self.lock:
+            if self.workers:
+                return
+            for index in range(self.size):
+                worker = threading.Thread(target=self._worker_loop, name=f"browser-pool-{index}", daemon=True)
+                worker.start()
+                self.workers.append(worker)
+    
+    def run(self, profile, task, timeout=60):
+        self.start()
+        future = Future()
+        job = {'started': threading.Event(), 'started_at': None, 'abandoned': False}
+        submitted = time.perf_counter()
+        self.tasks.put((profile, task, future, job))
+        
+        if not job['started'].wait(timeout) and future.cancel():
+            self.local.queue_wait = time.perf_counter() - submitted
+            raise TimeoutError(f"Нет свободного браузера дольше {timeout}с")
+        job['started'].wait()
+        self.local.queue_wait = job['started_at'] - submitted
+        
+        try:
+            return future.result(timeout)
+        finally:
+            if not future.done():
+                job['abandoned'] = True
+    
+    def take_queue_wait(self):
+        queue_wait = getattr(self.local, 'queue_wait', 0)
+        self.local.queue_wait = 0
+        return queue_wait
+    
+    def _new_context(self, browser, profile):
+        options = profile['options']() if callable(profile['options']) else profile['options']
+        context = browser.new_context(**options)
+        if profile.get('init_script'):
+            context.add_init_script(profile['init_script'])
+        return context
+    
+    def _close_quietly(self, resource):
+        try:
+            resource.close()
+        except Exception:
+            pass
+    
+    def _worker_loop(self):
+        playwright = None
+        browser = None
+        contexts = {}
+        
+        try:
+            while True:
+                item = self.tasks.get()
+                if item is None:
+                    break
+                
+                profile, task, future, job = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                job['started_at'] = time.perf_counter()
+                job['started'].set()
+                
+                try:
+                    if playwright is None:
+                        from playwright.sync_api import sync_playwright
+                        playwright = sync_playwright().start()
+                    if browser is None or not browser.is_connected():
+                        browser = playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+                        contexts = {}
+                    
+                    entry = contexts.get(profile['name'])
+                    if entry is None:
+                        entry = {'context': self._new_context(browser, profile), 'uses': 0}
+                        contexts[profile['name']] = entry
+                    
+                    entry['uses'] += 1
+                    page = entry['context'].new_page()
+                    try:
+                        result = task(page)
+                    finally:
+                        self._close_quietly(page)
+                    
+                    if entry['uses'] >= self.max_uses:
+                        self._close_quietly(contexts.pop(profile['name'])['context'])
+                    
+                    future.set_result(result)
+                except CaptchaDetected as e:
+                    entry = contexts.pop(profile['name'], None)
+                    if entry:
+                        self._close_quietly(entry['context'])
+                    future.set_exception(e)
+                except Exception as e:
+                    future.set_exception(e)
+                
+                if job['abandoned']:
+                    for entry in contexts.values():
+                        self._close_quietly(entry['context'])
+                    contexts = {}
+                    if browser is not None:
+                        self._close_quietly(browser)
+                    browser = None
+        finally:
+            for entry in contexts.values():
+                self._close_quietly(entry['context'])
+            if browser is not None:
+                self._close_quietly(browser)
+            if playwright is not None:
+                try:
+                    playwright.stop()
+                except Exception:
+                    pass
+    
+    def close(self, timeout=10):
+        with self.lock:
+            workers = self.workers
+            self.workers = []
+            for _ in workers:
+                self.tasks.put(None)
+        
+        for worker in workers:
+            worker.join(timeout)
+
+BRAND_DATASETS = {
+    'known': (os.path.join(DATA_DIR, 'known_websites.csv'), 'domain'),
+    'exceptions': (os.path.join(DATA_DIR, 'brand_exceptions.csv'), 'latin'),
+}
+BRAND_INDEX_VERSION = 1
+DOMAIN_PATTERN = re.compile(r'^(?:[a-z0-9а-я](?:[a-z0-9а-я-]*[a-z0-9а-я])?\.)+[a-zа-я]{2,}$')
+LATIN_PATTERN = re.compile(r'^[a-z0-9][a-z0-9-]*$')
+
+def read_brand_entries(path):
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError(f"{path}: ожидается JSON-объект бренд → значение")
+        return [(str(brand), str(value)) for brand, value in loaded.items()]
+    
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    return [(row[0], row[1] if len(row) > 1 else '') for row in rows[1:] if row]
+
+def write_brand_entries(path, entries, value_column):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['brand', value_column])
+        writer.writerows(entries.items())
+    os.replace(tmp_path, path)
+
+def normalize_brand_entry(brand, value, value_column):
+    brand = ' '.join(brand.lower().replace('ё', 'е').split())
+    value = value.strip().lower()
+    if value_column == 'domain':
+        value = re.sub(r'^https?://', '', value).split('/')[0]
+        if value.startswith('www.'):
+            value = value[4:]
+    return brand, value
+
+def validate_brand_entries(rows, value_column):
+    pattern = DOMAIN_PATTERN if value_column == 'domain' else LATIN_PATTERN
+    entries = {}
+    problems = []
+    for line, (raw_brand, raw_value) in enumerate(rows, start=2):
+        brand, value = normalize_brand_entry(raw_brand, raw_value, value_column)
+        if len(brand) < 2:
+            problems.append(f"строка {line}: слишком короткий бренд {raw_brand!r}")
+        elif not pattern.match(value):
+            problems.append(f"строка {line}: некорректное значение {raw_value!r} для {raw_brand!r}")
+        elif brand in entries and entries[brand] != value:
+            problems.append(f"строка {line}: {brand!r} уже указан как {entries[brand]!r}, заменено на {value!r}")
+            entries[brand] = value
+        else:
+            entries[brand] = value
+    return entries, problems
+
+class BrandMatcher:
+    def __init__(self, entries=None):
+        self.entries = {}
+        for pattern, value in (entries or {}).items():
+            pattern = pattern.lower().replace('ё', 'е').strip()
+            if pattern and value:
+                self.entries[pattern] = value
+        self.build()
+    
+    @classmethod
+    def load(cls, path, index_dir=os.path.join(CACHE_DIR, 'brands')):
+        if not os.path.exists(path):
+            print(f"⚠️ Файл брендов не найден: {path}")
+            return cls()
+        
+        stat = os.stat(path)
+        signature = (BRAND_INDEX_VERSION, os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        index_path = cls.index_path(path, index_dir)
+        try:
+            with open(index_path, 'rb') as f:
+                cached_signature, matcher = pickle.load(f)
+            if cached_signature == signature:
+                return matcher
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            pass
+        
+        matcher = cls(dict(read_brand_entries(path)))
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            tmp_path = index_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((signature, matcher), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            print(f"⚠️ Не удалось сохранить индекс брендов {index_path}: {e}")
+        return matcher
+    
+    @staticmethod
+    def index_path(path, index_dir=os.path.join(CACHE_DIR, 'brands')):
+        return os.path.join(index_dir, os.path.splitext(os.path.basename(path))[0] + '.idx')
+    
+    def build(self):
+        self.transitions = [{}]
+        self.terminal = [None]
+        for pattern in self.entries:
+            node = 0
+            for char in pattern:
+                next_node = self.transitions[node].get(char)
+                if next_node is None:
+                    next_node = len(self.transitions)
+                    self.transitions[node][char] = next_node
+                    self.transitions.append({})
+                    self.terminal.append(None)
+                node = next_node
+            self.terminal[node] = pattern
+        
+        self.fail = [0] * len(self.transitions)
+        self.output_link = [0] * len(self.transitions)
+        pending = deque(self.transitions[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self.transitions[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                suffix = self.transitions[fallback].get(char, 0)
+                self.fail[child] = suffix
+                self.output_link[child] = suffix if self.terminal[suffix] else self.output_link[suffix]
+                pending.append(child)
+    
+    def find_all(self, text):
+        found = {}
+        node = 0
+        for index, char in enumerate(text.lower().replace('ё', 'е')):
+            while node and char not in self.transitions[node]:
+                node = self.fail[node]
+            node = self.transitions[node].get(char, 0)
+            match = node if self.terminal[node] else self.output_link[node]
+            while match:
+                pattern = self.terminal[match]
+                found.setdefault(pattern, index - len(pattern) + 1)
+                match = self.output_link[match]
+        
+        return sorted(found, key=lambda pattern: (-len(pattern), found[pattern]))
+    
+    def values(self, text):
+        return list(dict.fromkeys(self.entries[pattern] for pattern in self.find_all(text)))
+    
+    def best_value(self, text):
+        patterns = self.find_all(text)
+        return self.entries[patterns[0]] if patterns else None
+
+class CompanyWebsiteFinder:
+    def __init__(self, cache=None, browser_pool=None, known_websites_path=BRAND_DATASETS['known'][0],
+                 host_limiter=None, playwright_budget=PLAYWRIGHT_BUDGET):
+        self.session = requests.Session()
+        probe_adapter = HTTPAdapter(
+            pool_connections=PROBE_POOL_HOSTS,
+            pool_maxsize=PROBE_CONNECTIONS_PER_HOST,
+            pool_block=True,
+            max_retries=0
+        )
+        self.session.mount('http://', probe_adapter)
+        self.session.mount('https://', probe_adapter)
+        self.headers_ready = False
+        self.website_cache = {}
+        self.cache = cache
+        if browser_pool is None:
+            browser_pool = BrowserPool(size=1)
+            atexit.register(browser_pool.close)
+        self.browser_pool = browser_pool
+        self.host_limiter = host_limiter if host_limiter else HostRateLimiter()
+        self.playwright_budget = playwright_budget
+        self.profiler = ResolutionProfiler()
+        self.dns_cache = {}
+        self.dns_lock = threading.Lock()
+        self.probe_executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS)
+        atexit.register(self.probe_executor.shutdown, wait=False)
+        self.dns_executor = ThreadPoolExecutor(max_workers=DNS_WORKERS)
+        atexit.register(self.dns_executor.shutdown, wait=False)
+        
+        self.known_matcher = BrandMatcher.load(known_websites_path)
+        self.known_websites = self.known_matcher.entries
+        self.brand_matcher = BrandMatcher.load(BRAND_DATASETS['exceptions'][0])
+    
+    def prepare_session(self):
+        if not self.headers_ready:
+            self.update_headers()
+            self.headers_ready = True
+    
+    def update_headers(self):
+        self.session.headers.update({
+            'User-Agent': random_user_agent(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        })
+    
+    def find_company_website(self, company_name, employer_id=None, site_url=None):
+        return self.lookup_company_website(company_name, employer_id, site_url)[0]
+    
+    def lookup_company_website(self, company_name, employer_id=None, site_url=None):
+        if not company_name or company_name == "Не указано":
+            return None, 'skipped'
+        
+        hit, cached_site = self.cached_website(company_name, employer_id)
+        if hit:
+            return cached_site, 'cache'
+        
+        started = time.perf_counter()
+        website, tier = self.resolve_company_website(company_name, site_url)
+        self.profiler.record('resolve', time.perf_counter() - started, tier)
+        self.remember_website(company_name, website, employer_id)
+        return website, tier
+    
+    def cached_website(self, company_name, employer_id=None):
+        key = employer_id or company_name
+        if key in self.website_cache:
+            return True, self.website_cache[key]
+        
+        if self.cache is not None:
+            hit, cached_site = self.cache.get(company_name, employer_id)
+            if hit:
+                self.website_cache[key] = cached_site
+                return True, cached_site
+        
+        return False, None
+    
+    def remember_website(self, company_name, website, employer_id=None):
+        self.website_cache[employer_id or company_name] = website
+        if self.cache is not None:
+            self.cache.set(company_name, website, employer_id)
+    
+    def resolve_company_website(self, company_name, site_url=None):
+        if site_url:
+            print(f"✅ Найден в профиле работодателя: {company_name} → {site_url}")
+            return site_url, 'employer'
+        
+        start_time = time.time()
+        print(f"🔍 Поиск сайта для: {company_name}")
+        
+        known_site = self.timed_tier('known', self.check_known_websites, company_name)
+        if known_site:
+            print(f"✅ Найден через известные сайты: {known_site}")
+            return known_site, 'known'
+        
+        generated_site = self.timed_tier('generated', self.fast_generate_website_url, company_name)
+        if generated_site:
+            print(f"✅ Найден через генерацию: {generated_site}")
+            return generated_site, 'generated'
+        
+        playwright_site = self.timed_tier('playwright', self.playwright_search_ultra_fast, company_name)
+        if playwright_site:
+            print(f"✅ Найден через Playwright: {playwright_site}")
+            return playwright_site, 'playwright'
+        
+        print(f"❌ Сайт не найден для: {company_name} (поиск занял {time.time()-start_time:.2f}с)")
+        return None, 'not_found'
+    
+    def timed_tier(self, tier, resolver, company_name):
+        started = time.perf_counter()
+        website = resolver(company_name)
+        self.profiler.record(f'tier:{tier}', time.perf_counter() - started, 'hit' if website else 'miss')
+        return website
+    
+    def known_website_candidates(self, company_name):
+        return [f"https://{domain}" for domain in self.known_matcher.values(company_name.strip())]
+    
+    def check_known_websites(self, company_name):
+        return self.first_live_url(self.known_website_candidates(company_name))
+    
+    def generated_website_candidates(self, company_name):
+        if not company_name:
+            return []
+        
+        clean_name = re.sub(r'[\(\)\[\]\{\}]', '', company_name)
+        clean_name = re.sub(r'[^\w\s]', ' ', clean_name).strip()
+        if len(clean_name) < 2:
+            return []
+        
+        name_variants = set()
+        
+        words = clean_name.split()
+        if len(words) > 3:
+            main_name = ' '.join(words[:2])
+            name_variants.add(main_name.lower().replace(' ', ''))
+            name_variants.add(main_name.lower().replace(' ', '-'))
+        
+        name_variants.add(clean_name.lower().replace(' ', ''))
+        name_variants.add(clean_name.lower().replace(' ', '-'))
+        
+        translit_name = self.transliterate_cyrillic(clean_name)
+        if translit_name:
+            name_variants.add(translit_name.replace(' ', ''))
+            name_variants.add(translit_name.replace(' ', '-'))
+        
+        domains = ['.ru', '.com', '.org', '.net']
+        
+        candidates = []
+        checked = 0
+        for name in list(name_variants):
+            for domain in domains:
+                if checked >= GENERATED_NAME_LIMIT:
+                    break
+                
+                candidates.append(f"https://{name}{domain}")
+                candidates.append(f"https://www.{name}{domain}")
+                checked += 1
+        
+        return candidates
+    
+    def fast_generate_website_url(self, company_name):
+        candidates = self.generated_website_candidates(company_name)
+        website = self.first_live_url(candidates, self.is_valid_company_site)
+        self.observe_generated_rank(candidates, website)
+        return website
+    
+    def observe_generated_rank(self, candidates, website):
+        if website:
+            self.profiler.observe('generated_rank', candidates.index(website) // 2 + 1)
+    
+    def first_live_url(self, urls, validator=None):
+        self.prepare_session()
+        resolved = self.resolve_hostnames([urlparse(url).hostname for url in urls])
+        live_candidates = [url for url in urls if resolved.get(urlparse(url).hostname)]
+        if not live_candidates:
+            return None
+        
+        checks = list(self.probe_executor.map(self.ultra_fast_site_check, live_candidates))
+        for url, alive in zip(live_candidates, checks):
+            if alive and (validator is None or validator(url)):
+                return url
+        return None
+    
+    def cached_resolution(self, hostname):
+        with self.dns_lock:
+            entry = self.dns_cache.get(hostname)
+        if entry is None:
+            return None
+        
+        resolves, checked_at = entry
+        if not resolves and time.time() - checked_at > DNS_NEGATIVE_TTL:
+            return None
+        return resolves
+    
+    def remember_resolution(self, hostname, resolves):
+        with self.dns_lock:
+            self.dns_cache[hostname] = (resolves, time.time())
+    
+    def host_resolves(self, hostname):
+        try:
+            socket.getaddrinfo(hostname, 443, type=socket.SOCK_STREAM)
+            return True
+        except (socket.gaierror, UnicodeError):
+            return False
+    
+    def resolve_hostnames(self, hostnames):
+        results = {}
+        pending = []
+        for hostname in dict.fromkeys(h for h in hostnames if h):
+            cached = self.cached_resolution(hostname)
+            if cached is None:
+                pending.append(hostname)
+            else:
+                results[hostname] = cached
+        
+        if not pending:
+            return results
+        
+        started = {}
+        
+        def lookup(hostname):
+            started[hostname] = time.monotonic()
+            return self.host_resolves(hostname)
+        
+        futures = {self.dns_executor.submit(lookup, hostname): hostname for hostname in pending}
+        not_done = set(futures)
+        while not_done:
+            done, not_done = wait(not_done, timeout=DNS_TIMEOUT / 10)
+            for future in done:
+                hostname = futures[future]
+                try:
+                    resolves = future.result()
+                except OSError:
+                    results[hostname] = False
+                    continue
+                results[hostname] = resolves
+                self.remember_resolution(hostname, resolves)
+            
+            now = time.monotonic()
+            expired = {future for future in not_done if now - started.get(futures[future], now) >= DNS_TIMEOUT}
+            for future in expired:
+                results[futures[future]] = False
+            not_done -= expired
+        
+        return results
+    
+    def transliterate_cyrillic(self, text):
+        brand = self.brand_matcher.best_value(text)
+        if brand:
+            return brand
+        
+        translit_dict = {
+            'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+            'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+            'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+            'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch', 'ъ': '',
+            'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
+        }
+        
+        result = []
+        for char in text.lower():
+            if char in translit_dict:
+                result.append(translit_dict[char])
+            elif char in 'abcdefghijklmnopqrstuvwxyz0123456789 -_':
+                result.append(char)
+            elif char == ' ':
+                result.append(' ')
+        
+        return ''.join(result)
+    
+    def ultra_fast_site_check(self, url):
+        started = time.perf_counter()
+        try:
+            alive = self.probe_site(url)
+        except Exception as e:
+            self.profiler.record('probe', time.perf_counter() - started, error_outcome(e))
+            return False
+        
+        self.profiler.record('probe', time.perf_counter() - started, 'alive' if alive else 'dead')
+        return alive
+    
+    def probe_site(self, url):
+        if not self.host_limiter.wait(url, PROBE_MAX_WAIT):
+            raise HostThrottled(url)
+        with self.session.head(url, timeout=PROBE_TIMEOUT, allow_redirects=True) as response:
+            self.host_limiter.report(url, response.status_code, response.headers)
+            if response.status_code not in HEAD_REJECTED_STATUSES:
+                return response.status_code == 200
+        
+        if not self.host_limiter.wait(url, PROBE_MAX_WAIT):
+            raise HostThrottled(url)
+        with self.session.get(url, timeout=PROBE_TIMEOUT, allow_redirects=True,
+                              headers={'Range': 'bytes=0-0'}, stream=True) as response:
+            self.host_limiter.report(url, response.status_code, response.headers)
+            return response.status_code in (200, 206)
+    
+    def playwright_search_ultra_fast(self, company_name):
+        spent = 0
+        
+        strategies = [
+            ('stealth', self._playwright_strategy_stealth),
+            ('humanized', self._playwright_strategy_humanized),
+            ('fast', self._playwright_strategy_fast_headless)
+        ]
+        
+        for strategy_name, strategy in strategies:
+            if spent > self.playwright_budget:
+                self.profiler.count(f'strategy:{strategy_name}', 'over_budget')
+                continue
+            
+            strategy_start = time.perf_counter()
+            self.browser_pool.take_queue_wait()
+            try:
+                result = strategy(company_name)
+            except Exception as e:
+                self.profiler.record(f'strategy:{strategy_name}', time.perf_counter() - strategy_start, error_outcome(e))
+                continue
+            finally:
+                spent += time.perf_counter() - strategy_start - self.browser_pool.take_queue_wait()
+            
+            self.profiler.record(f'strategy:{strategy_name}', time.perf_counter() - strategy_start,
+                                 'hit' if result else 'miss')
+            if result:
+                return result
+        
+        return None
+    
+    def _playwright_strategy_stealth(self, company_name):
+        return self._run_serp_strategy(SERP_STRATEGIES['stealth'], company_name)
+    
+    def _playwright_strategy_humanized(self, company_name):
+        return self._run_serp_strategy(SERP_STRATEGIES['humanized'], company_name)
+    
+    def _playwright_strategy_fast_headless(self, company_name):
+        return self._run_serp_strategy(SERP_STRATEGIES['fast'], company_name)
+    
+    def _run_serp_strategy(self, strategy, company_name):
+        search_url = self.build_search_url(company_name, strategy)
+        if not self.host_limiter.wait(search_url, SERP_MAX_WAIT):
+            raise SerpThrottled(search_url)
+        
+        try:
+            return self.browser_pool.run(
+                strategy['profile'],
+                lambda page: self.serp_search(page, company_name, strategy)
+            )
+        except CaptchaDetected:
+            self.host_limiter.report(search_url, captcha=True)
+            raise
+    
+    def serp_search(self, page, company_name, strategy):
+        search_url = self.build_search_url(company_name, strategy)
+        page.goto(search_url, wait_until='domcontentloaded', timeout=strategy['timeout'])
+        
+        if strategy['settle_ms']:
+            page.wait_for_timeout(strategy['settle_ms'])
+        
+        if strategy['captcha_selector'] and page.query_selector(strategy['captcha_selector']):
+            raise CaptchaDetected(search_url)
+        
+        organic_links = []
+        for selector in strategy['selectors']:
+            organic_links.extend(page.eval_on_selector_all(selector, SERP_LINKS_SCRIPT, strategy['links_per_selector']))
+        
+        best_url = self.pick_serp_url(organic_links, company_name, strategy)
+        if best_url is None and strategy['fallback_links']:
+            fallback_links = page.eval_on_selector_all('a[href*="http"]', SERP_LINKS_SCRIPT, strategy['fallback_links'])
+            best_url = self.pick_fallback_serp_url(fallback_links, company_name)
+        
+        return best_url
+    
+    def build_search_url(self, company_name, strategy):
+        clean_company = re.sub(r'[\(\)\[\]\{\}]', '', company_name)
+        clean_company = re.sub(r'ИП\s+\w+\s+\w+', '', clean_company).strip()
+        
+        search_query = f"{clean_company} официальный сайт"
+        search_url = f"https://yandex.ru/search/?text={quote_plus(search_query)}"
+        if strategy['region']:
+            search_url += f"&lr={strategy['region']}"
+        return search_url
+    
+    def pick_serp_url(self, links, company_name, strategy):
+        found_urls = []
+        
+        for link in links:
+            href = link.get('href')
+            if not href or any(href.startswith(prefix) for prefix in strategy['skip_prefixes']):
+                continue
+            
+            real_url = self.extract_real_url(href)
+            if real_url and self.is_valid_company_site_strict(real_url, company_name):
+                if not strategy['require_relevant_text'] or self.is_relevant_link(link.get('text'), company_name):
+                    found_urls.append(real_url)
+        
+        unique_urls = list(dict.fromkeys(found_urls))
+        
+        if unique_urls:
+            return self.choose_best_url(unique_urls, company_name)
+        
+        return None
+    
+    def pick_fallback_serp_url(self, links, company_name):
+        found_urls = []
+        company_words = company_name.lower().split()
+        
+        for link in links:
+            href = link.get('href')
+            text_lower = (link.get('text') or '').lower()
+            
+            if (href and 
+                not href.startswith('https://yandex.ru') and
+                not href.startswith('https://google.ru')):
+                
+                relevant = any(word in text_lower for word in company_words if len(word) > 2)
+                
+                if relevant:
+                    real_url = self.extract_real_url(href)
+                    if real_url and self.is_valid_company_site_strict(real_url, company_name):
+                        found_urls.append(real_url)
+        
+        unique_urls = list(dict.fromkeys(found_urls))
+        
+        if unique_urls:
+            return self.choose_best_url(unique_urls, company_name)
+        
+        return None
+    
+    def extract_real_url(self, url):
+        if 'yandex.ru/redir/' in url or 'clck' in url:
+            try:
+                return url
+            except Exception:
+                pass
+        
+        return url
+    
+    def is_relevant_link(self, link_text, company_name):
+        if not link_text:
+            return False
+        
+        company_words = company_name.lower().split()
+        clean_company = re.sub(r'[\(\)\[\]\{\}]', '', company_name).lower()
+        
+        ignore_words = [
+            'яндекс', 'yandex', 'google', 'карты', 'images', 'видео', 'новости',
+            'маркет', 'перевести', 'найти', 'search', 'ещё', 'more', 'еще',
+            'знакомства', 'расписания', 'погода', 'афиша', 'работа', 'вакансии',
+            'резюме', 'hh.ru', 'headhunter', 'отзывы', 'рейтинг', 'купить', 'цена'
+        ]
+        
+        if any(word in link_text.lower() for word in ignore_words):
+            return False
+        
+        for word in company_words:
+            if len(word) > 2 and word in link_text.lower():
+                return True
+        
+        return False
+    
+    def choose_best_url(self, urls, company_name):
+        if not urls:
+            return None
+        
+        company_keywords = company_name.lower().split()
+        best_score = 0
+        best_url = urls[0]
+        
+        for url in urls:
+            score = 0
+            domain = urlparse(url).netloc.lower()
+            
+            for keyword in company_keywords:
+                if len(keyword) > 2 and keyword in domain:
+                    score += 3
+            
+            if domain.endswith('.ru'):
+                score += 1
+            if 'www.' in domain:
+                score += 1
+            
+            if score > best_score:
+                best_score = score
+                best_url = url
+        
+        return best_url
+    
+    def employer_site_url(self, site_url):
+        if not site_url or not site_url.strip():
+            return None
+        
+        site_url = site_url.strip()
+        if '://' not in site_url:
+            site_url = f"https://{site_url}"
+        
+        parsed = urlparse(site_url)
+        domain = parsed.netloc.lower()
+        if '.' not in domain or parsed.scheme not in ('http', 'https'):
+            return None
+        
+        site_url = f"{parsed.scheme}://{domain}"
+        return site_url if self.is_valid_company_site(site_url) else None
+    
+    def is_valid_company_site(self, url):
+        try:
+            domain = urlparse(url).netloc.lower()
+            
+            blacklist = [
+                'yandex.ru', 'yandex.com', 'ya.ru', 'google.com', 'google.ru',
+                'vk.com', 'facebook.com', 'instagram.com', 'hh.ru', 'rabota.ru', 
+                'superjob.ru', 'mail.ru', 'rambler.ru', '2gis.ru', 'gosuslugi.ru'
+            ]
+            
+            if domain in blacklist:
+                return False
+                
+            if any(bad in domain for bad in ['yandex.', 'google.']):
+                return False
+            
+            return True
+            
+        except:
+            return False
+    
+    def is_valid_company_site_strict(self, url, company_name=None):
+        try:
+            domain = urlparse(url).netloc.lower()
+            
+            blacklist = [
+                'yandex.ru', 'yandex.com', 'ya.ru', 'google.com', 'google.ru',
+                'vk.com', 'facebook.com', 'instagram.com', 'hh.ru', 'rabota.ru', 
+                'superjob.ru', 'mail.ru', 'rambler.ru', '2gis.ru', 'gosuslugi.ru',
+                'yandex.net', 'yastatic.net', 'yandex.st', 'yandex.ua', 'yandex.kz',
+                'yandex.by', 'yandex.az', 'yandex.com.tr', 'kinopoisk.ru', 'market.yandex.ru',
+                'youtube.com', 'twitter.com', 'linkedin.com', 't.me', 'telegram.me',
+                'whatsapp.com', 'viber.com', 'skype.com', 'zoom.us', 'avito.ru',
+                'cian.ru', 'irr.ru', 'banki.ru', 'sravni.ru'
+            ]
+            
+            if domain in blacklist:
+                return False
+                
+            if any(bad in domain for bad in [
+                'yandex.', 'google.', 'mail.', 'rambler.', 'search.', 'images.',
+                'video.', 'maps.', 'news.', 'market.', 'kinopoisk.', 'social.',
+                'chat.', 'messenger.', 'app.', 'api.', 'cdn.', 'static.', 'ad.',
+                'ads.', 'analytic', 'tracking'
+            ]):
+                return False
+            
+            main_domain = domain.split('.')[0]
+            if len(main_domain) < 3:
+                return False
+            
+            if company_name:
+                company_lower = company_name.lower()
+                company_words = [word for word in company_lower.split() if len(word) > 2]
+                domain_matches = any(word in domain for word in company_words)
+                
+                if domain_matches:
+                    return True
+            
+            return True
+            
+        except:
+            return False
+
+EXPORT_COLUMNS = {
+    'Название_вакансии': 'Название вакансии',
+    'Ключевое_слово': 'Ключевое слово', 
+    'Компания': 'Компания',
+    'Ссылка_на_вакансию': 'Ссылка на вакансию',
+    'Сайт_компании': 'Сайт компании',
+    'Город': 'Город'
+}
+
+LINK_COLUMNS = ['Ссылка_на_вакансию', 'Сайт_компании']
+
+class ExcelStreamWriter:
+    def __init__(self, path, sheet_name='Вакансии'):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet(sheet_name)
+        self.worksheet.append(list(EXPORT_COLUMNS.values()))
+        self.link_font = Font(color="0563C1", underline="single")
+        self.cell_type = WriteOnlyCell
+        self.rows_written = 0
+    
+    def write(self, row):
+        cells = []
+        for column in EXPORT_COLUMNS:
+            value = row.get(column)
+            if column in LINK_COLUMNS and value and str(value).startswith('http'):
+                cell = self.cell_type(self.worksheet, value=value)
+                cell.hyperlink = value
+                cell.font = self.link_font
+                cells.append(cell)
+            else:
+                cells.append(value)
+        
+        self.worksheet.append(cells)
+        self.rows_written += 1
+    
+    def close(self):
+        self.workbook.save(self.path)
+
+class CsvStreamWriter:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', newline='', encoding='utf-8-sig', buffering=1)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS.values())
+        self.rows_written = 0
+    
+    def write(self, row):
+        self.writer.writerow([row.get(column) for column in EXPORT_COLUMNS])
+        self.rows_written += 1
+    
+    def close(self):
+        self.file.close()
+
+class JsonlStreamWriter:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8', buffering=1)
+        self.rows_written = 0
+    
+    def write(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.rows_written += 1
+    
+    def close(self):
+        self.file.close()
+
+PARQUET_COLUMNS = {
+    'vacancy_id': 'vacancy_id',
+    'Название_вакансии': 'title',
+    'Ключевое_слово': 'keyword',
+    'Компания': 'company',
+    'employer_id': 'employer_id',
+    'Ссылка_на_вакансию': 'vacancy_url',
+    'Сайт_компании': 'company_website',
+    'Город': 'city',
+    'area_id': 'area_id',
+    'salary_from': 'salary_from',
+    'salary_to': 'salary_to',
+    'salary_currency': 'salary_currency',
+    'salary_gross': 'salary_gross',
+    'published_at': 'published_at',
+}
+
+PARQUET_SCHEMA = {
+    'vacancy_id': 'string',
+    'title': 'string',
+    'keyword': 'string',
+    'company': 'string',
+    'employer_id': 'string',
+    'vacancy_url': 'string',
+    'company_website': 'string',
+    'city': 'string',
+    'area_id': 'string',
+    'salary_from': 'Float64',
+    'salary_to': 'Float64',
+    'salary_currency': 'string',
+    'salary_gross': 'boolean',
+    'run_date': 'string',
+}
+
+def rows_to_parquet_frame(rows, run_date):
+    import pandas as pd
+    
+    data = {column: [] for column in PARQUET_COLUMNS.values()}
+    for row in rows:
+        for key, column in PARQUET_COLUMNS.items():
+            value = row.get(key)
+            if key == 'Сайт_компании' and value == 'Не найден':
+                value = None
+            data[column].append(value)
+    
+    df = pd.DataFrame(data)
+    df['run_date'] = run_date
+    df['published_at'] = pd.to_datetime(df['published_at'], format='%Y-%m-%dT%H:%M:%S%z', utc=True, errors='coerce')
+    return df.astype(PARQUET_SCHEMA)
+
+class ParquetDatasetWriter:
+    def __init__(self, path, row_group_size=50000, partition_cols=('keyword', 'run_date')):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.partition_cols = list(partition_cols)
+        self.run_date = datetime.now().strftime('%Y-%m-%d')
+        self.buffer = []
+        self.rows_written = 0
+        if not os.path.exists(path):
+            os.makedirs(path)
+    
+    def write(self, row):
+        self.buffer.append(row)
+        self.rows_written += 1
+        if len(self.buffer) >= self.row_group_size:
+            self.flush()
+    
+    def flush(self):
+        if not self.buffer:
+            return
+        df = rows_to_parquet_frame(self.buffer, self.run_date)
+        df.to_parquet(self.path, engine='pyarrow', index=False, partition_cols=self.partition_cols)
+        self.buffer = []
+    
+    def close(self):
+        self.flush()
+
+def open_export_sink(path):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        return ExcelStreamWriter(path)
+    elif extension == '.csv':
+        return CsvStreamWriter(path)
+    elif extension in ('.jsonl', '.ndjson'):
+        return JsonlStreamWriter(path)
+    elif extension == '.parquet':
+        return ParquetDatasetWriter(path)
+    raise ValueError(f"Неподдерживаемый формат вывода: {path}")
+
+STAGE_WEIGHTS = {'search': 0.3, 'employer_sites': 0.1, 'websites': 0.6}
+STAGE_TITLES = {'search': 'Поиск вакансий', 'employer_sites': 'Профили работодателей', 'websites': 'Поиск сайтов'}
+
+class RunMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.reset()
+    
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.finished_at = None
+            self.stages = {}
+            self.counters = {}
+            self.lookups = {}
+    
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+    
+    def emit(self, event_type, **fields):
+        if not self.listeners:
+            return
+        
+        event = {'event': event_type, 'time': round(time.time(), 3)}
+        event.update(fields)
+        for listener in list(self.listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"⚠️ Ошибка обработчика событий: {e}")
+    
+    def start_stage(self, stage, total=0):
+        with self.lock:
+            self.stages[stage] = {'done': 0, 'total': total, 'started_at': time.time(), 'finished_at': None}
+        self.emit('stage_started', stage=stage, total=total)
+    
+    def add_total(self, stage, count):
+        with self.lock:
+            entry = self.stages.get(stage)
+            if entry:
+                entry['total'] = max(entry['done'], entry['total'] + count)
+    
+    def advance(self, stage, count=1):
+        with self.lock:
+            entry = self.stages.get(stage)
+            if not entry:
+                return
+            entry['done'] += count
+            entry['total'] = max(entry['total'], entry['done'])
+            done, total = entry['done'], entry['total']
+        self.emit('stage_progress', stage=stage, done=done, total=total)
+    
+    def finish_stage(self, stage):
+        with self.lock:
+            entry = self.stages.get(stage)
+            if not entry:
+                return
+            entry['finished_at'] = time.time()
+            entry['total'] = entry['done']
+            done = entry['done']
+        self.emit('stage_finished', stage=stage, done=done)
+    
+    def increment(self, counter, count=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + count
+    
+    def record_lookup(self, tier, count=1):
+        with self.lock:
+            self.lookups[tier] = self.lookups.get(tier, 0) + count
+    
+    def finish_run(self):
+        with self.lock:
+            self.finished_at = time.time()
+        self.emit('run_finished', **self.snapshot())
+    
+    def snapshot(self):
+        now = time.time()
+        with self.lock:
+            stages = {}
+            progress = 0.0
+            for stage, entry in self.stages.items():
+                elapsed = (entry['finished_at'] or now) - entry['started_at']
+                if entry['finished_at']:
+                    fraction = 1.0
+                else:
+                    fraction = entry['done'] / entry['total'] if entry['total'] else 0.0
+                progress += STAGE_WEIGHTS.get(stage, 0) * fraction
+                stages[stage] = {
+                    'done': entry['done'],
+                    'total': entry['total'],
+                    'queued': entry['total'] - entry['done'],
+                    'rate': round(entry['done'] / elapsed, 2) if elapsed > 0 else 0.0,
+                    'elapsed': round(elapsed, 2),
+                    'finished': entry['finished_at'] is not None,
+                }
+            
+            elapsed = (self.finished_at or now) - self.started_at
+            if self.finished_at:
+                progress = 1.0
+            counters = dict(self.counters)
+            lookups = dict(self.lookups)
+        
+        eta = elapsed * (1 - progress) / progress if progress > 0 else None
+        return {
+            'elapsed': round(elapsed, 2),
+            'progress': round(progress, 4),
+            'eta': round(eta, 1) if eta is not None else None,
+            'stage': next((stage for stage, entry in stages.items() if not entry['finished']), None),
+            'stages': stages,
+            'counters': counters,
+            'lookups': lookups,
+        }
+    
+    def to_prometheus(self, labels=None):
+        snapshot = self.snapshot()
+        
+        def label(name, value):
+            escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            return f'{name}="{escaped}"'
+        
+        base_labels = [label(name, value) for name, value in (labels or {}).items()]
+        
+        def metric(name, value, **extra):
+            metric_labels = base_labels + [label(label_name, label_value) for label_name, label_value in extra.items()]
+            label_text = '{' + ','.join(metric_labels) + '}' if metric_labels else ''
+            return f"hh_parser_{name}{label_text} {value}"
+        
+        lines = [
+            metric('progress_ratio', snapshot['progress']),
+            metric('elapsed_seconds', snapshot['elapsed']),
+        ]
+        for stage, entry in snapshot['stages'].items():
+            lines.append(metric('stage_done', entry['done'], stage=stage))
+            lines.append(metric('stage_total', entry['total'], stage=stage))
+            lines.append(metric('stage_queued', entry['queued'], stage=stage))
+            lines.append(metric('stage_rate_per_second', entry['rate'], stage=stage))
+        for counter, value in snapshot['counters'].items():
+            lines.append(metric(f'{counter}_total', value))
+        for tier, value in snapshot['lookups'].items():
+            lines.append(metric('website_lookups_total', value, tier=tier))
+        return '\n'.join(lines) + '\n'
+
+JOB_PARSER_SETTINGS = ('engine', 'incremental', 'employer_sites', 'slice_large_queries', 'max_workers',
+                       'process_workers', 'queue_path', 'queue_run_id', 'queue_local_workers', 'resume')
+
+class HHParser:
+    def __init__(self, max_workers=8, cache_path=os.path.join(CACHE_DIR, 'websites.sqlite3'),
+                 browser_pool_size=2, browser_max_uses=50, api_workers=4, api_rate_limit=8,
+                 engine='threads', async_concurrency=100, slice_large_queries=True,
+                 incremental=False, state_path=os.path.join(CACHE_DIR, 'state.sqlite3'),
+                 known_websites_path=BRAND_DATASETS['known'][0], employer_sites=True, process_workers=None,
+                 queue_path=os.path.join(CACHE_DIR, 'queue.sqlite3'), queue_run_id=None, queue_local_workers=1,
+                 journal_path=os.path.join(CACHE_DIR, 'journal.sqlite3'), resume=False,
+                 playwright_budget=PLAYWRIGHT_BUDGET):
+        self.session = requests.Session()
+        self.host_limiter = HostRateLimiter({'api.hh.ru': api_rate_limit})
+        self.api_client = HHApiClient(rate_limit=api_rate_limit, host_limiter=self.host_limiter)
+        self.api_rate_limit = api_rate_limit
+        self.api_workers = api_workers
+        self.slice_large_queries = slice_large_queries
+        self.slice_planner = VacancySlicePlanner(self.api_client)
+        self.website_cache = WebsiteCache(cache_path) if cache_path else None
+        self.browser_pool = BrowserPool(size=browser_pool_size, max_uses=browser_max_uses)
+        self.owns_browser_pool = True
+        atexit.register(self.browser_pool.close)
+        self.website_finder = CompanyWebsiteFinder(cache=self.website_cache, browser_pool=self.browser_pool,
+                                                   known_websites_path=known_websites_path,
+                                                   host_limiter=self.host_limiter,
+                                                   playwright_budget=playwright_budget)
+        self.known_websites_path = known_websites_path
+        self.max_workers = max_workers
+        self.employer_sites = employer_sites
+        self.engine = engine
+        self.process_workers = process_workers
+        self.queue_path = queue_path
+        self.queue_run_id = queue_run_id
+        self.queue_local_workers = queue_local_workers
+        self.async_concurrency = async_concurrency
+        self.incremental = incremental
+        self.state_path = state_path
+        self.state_store = None
+        self.pending_state = []
+        self.journal_path = journal_path
+        self.resume = resume
+        self.journal = None
+        self.job_name = None
+        self.sinks = []
+        self.output_paths = []
+        self.results = []
+        self.reset_totals()
+        self.metrics = RunMetrics()
+    
+    def spawn(self, **settings):
+        job_parser = copy.copy(self)
+        job_parser.api_client = HHApiClient(host_limiter=self.host_limiter)
+        job_parser.api_client.base_url = self.api_client.base_url
+        job_parser.slice_planner = VacancySlicePlanner(job_parser.api_client)
+        job_parser.owns_browser_pool = False
+        job_parser.state_store = None
+        job_parser.pending_state = []
+        job_parser.journal = None
+        job_parser.sinks = []
+        job_parser.output_paths = []
+        job_parser.results = []
+        job_parser.reset_totals()
+        job_parser.metrics = RunMetrics()
+        
+        for name, value in settings.items():
+            if name not in JOB_PARSER_SETTINGS:
+                raise ValueError(f"Неизвестная настройка задания: {name}")
+            setattr(job_parser, name, value)
+        return job_parser
+    
+    def resolve_keyword_limit(self, keywords, total_vacancies=None, per_keyword=None):
+        if per_keyword and per_keyword > 0:
+            return per_keyword, f"лимит: {per_keyword}"
+        elif total_vacancies and total_vacancies > 0:
+            limit = max(1, total_vacancies // len(keywords))
+            print(f"🔍 Общий лимит: {total_vacancies} вакансий (~{limit} на ключевое слово)")
+            return limit, f"лимит: {limit}"
+        else:
+            return 100, "без лимита"
+    
+    def start_search_stage(self, keywords, limit):
+        max_pages = math.ceil(limit / min(100, limit))
+        self.metrics.start_stage('search', len(dict.fromkeys(keywords)) * max_pages)
+    
+    def search_vacancies_hybrid(self, keywords, area=113, total_vacancies=None, per_keyword=None):
+        self.results = []
+        unique_vacancies = self.resumed_vacancies(area)
+        if unique_vacancies is None:
+            unique_vacancies = self.search_unique_vacancies(keywords, area, total_vacancies, per_keyword)
+        vacancies_by_employer = self.group_by_employer(unique_vacancies)
+        del unique_vacancies
+        self.enrich_websites(vacancies_by_employer)
+        return self.results
+    
+    def search_unique_vacancies(self, keywords, area=113, total_vacancies=None, per_keyword=None):
+        limit, limit_info = self.resolve_keyword_limit(keywords, total_vacancies, per_keyword)
+        self.start_search_stage(keywords, limit)
+        
+        if self.incremental:
+            print(f"🆕 Поиск новых вакансий по {len(keywords)} ключевым словам ({limit_info})")
+            vacancies_by_keyword = self.search_keywords_incremental(keywords, area, limit)
+            unique_vacancies = self.deduplicate_vacancies(keywords, vacancies_by_keyword, area)
+        elif self.api_workers > 1:
+            print(f"🔍 Поиск вакансий по {len(keywords)} ключевым словам ({limit_info}, потоков: {self.api_workers})")
+            vacancies_by_keyword = self.search_keywords_parallel(keywords, area, limit)
+            unique_vacancies = self.deduplicate_vacancies(keywords, vacancies_by_keyword, area)
+        else:
+            seen_urls = set()
+            unique_vacancies = []
+            for keyword in keywords:
+                print(f"🔍 Поиск вакансий по ключевому слову: '{keyword}' ({limit_info})")
+                unique_vacancies.extend(self.deduplicate_vacancies(
+                    [keyword], {keyword: self.search_via_api(keyword, area, limit)}, area, seen_urls
+                ))
+        
+        self.metrics.finish_stage('search')
+        print(f"📊 Итого уникальных вакансий: {len(unique_vacancies)}")
+        self.metrics.increment('vacancies_unique', len(unique_vacancies))
+        self.checkpoint_vacancies(unique_vacancies)
+        return unique_vacancies
+    
+    def open_journal(self, keywords, area, total_vacancies=None, per_keyword=None):
+        if not self.journal_path or self.engine == 'queue':
+            return
+        
+        run_key = json.dumps({'job': self.job_name, 'engine': self.engine, 'keywords': keywords, 'area': area,
+                              'total_vacancies': total_vacancies, 'per_keyword': per_keyword,
+                              'incremental': self.incremental, 'employer_sites': self.employer_sites,
+                              'slice_large_queries': self.slice_large_queries},
+                             ensure_ascii=False, sort_keys=True)
+        self.journal = RunJournal(self.journal_path)
+        if self.journal.start(run_key, self.resume):
+            print(f"♻️ Продолжение прерванного запуска с контрольной точки ({os.path.abspath(self.journal_path)})")
+        elif self.resume:
+            print("ℹ️ Контрольная точка для этого запуска не найдена - начинаем заново")
+        self.api_client.journal = self.journal
+    
+    def close_journal(self):
+        if self.journal:
+            self.journal.close()
+        self.journal = None
+        self.api_client.journal = None
+    
+    def resumed_vacancies(self, area):
+        vacancies = self.journal.vacancies() if self.journal else None
+        if vacancies is None:
+            return None
+        
+        print(f"♻️ Вакансии из контрольной точки: {len(vacancies)} (поиск пропущен)")
+        self.metrics.start_stage('search', 0)
+        self.metrics.finish_stage('search')
+        self.pending_state = []
+        self.remember_fetched(vacancies, area)
+        self.metrics.increment('vacancies_unique', len(vacancies))
+        return vacancies
+    
+    def checkpoint_vacancies(self, vacancies):
+        if self.journal:
+            self.journal.record_vacancies(vacancies)
+    
+    def checkpoint_website(self, key, website):
+        if self.journal:
+            self.journal.record_website(key, website)
+    
+    def resume_websites(self, companies, vacancies_by_employer):
+        if not self.journal:
+            return companies
+        
+        websites = self.journal.websites()
+        if not websites:
+            return companies
+        
+        pending = []
+        for company_name, employer_id in companies:
+            key = employer_id or company_name
+            if str(key) in websites:
+                self.emit_rows(self.apply_websites(vacancies_by_employer.pop(key, []), {key: websites[str(key)]}))
+            else:
+                pending.append((company_name, employer_id))
+        
+        print(f"♻️ Сайты из контрольной точки: {len(companies) - len(pending)}, осталось найти: {len(pending)}")
+        return pending
+    
+    def get_state_store(self):
+        if self.state_store is None:
+            self.state_store = VacancyStateStore(self.state_path)
+        return self.state_store
+    
+    def remember_fetched(self, vacancies, area):
+        if self.incremental:
+            self.pending_state.extend(
+                (vacancy.get('Ключевое_слово'), area, vacancy.get('vacancy_id'), vacancy.get('published_at'))
+                for vacancy in vacancies
+            )
+    
+    def commit_state(self):
+        if self.incremental and self.pending_state:
+            recorded = self.get_state_store().record(self.pending_state)
+            print(f"🗂️ Сохранено в состояние инкрементального режима: {recorded} вакансий")
+        self.pending_state = []
+    
+    def search_keywords_incremental(self, keywords, area=113, limit=100):
+        vacancies_by_keyword = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.api_workers)) as executor:
+            futures = {
+                executor.submit(self.search_new_vacancies, keyword, area, limit): keyword
+                for keyword in dict.fromkeys(keywords)
+            }
+            for future in as_completed(futures):
+                vacancies_by_keyword[futures[future]] = future.result()
+        
+        return vacancies_by_keyword
+    
+    def search_new_vacancies(self, keyword, area=113, limit=100):
+        state_store = self.get_state_store()
+        filters = {'order_by': 'publication_time'}
+        since = state_store.last_published_at(keyword, area)
+        if since:
+            filters['date_from'] = datetime.fromtimestamp(since, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S%z')
+        known_ids = state_store.known_ids(keyword, area, since)
+        
+        page_size = min(100, limit)
+        max_pages = math.ceil(limit / page_size)
+        vacancies_data = []
+        reached_known = False
+        page = 0
+        
+        while len(vacancies_data) < limit and not reached_known:
+            data = self.api_client.search_vacancies(keyword, area, page, page_size, **filters)
+            self.metrics.advance('search')
+            if not data or not data.get('items'):
+                page += 1
+                break
+            
+            for vacancy in data['items']:
+                if str(vacancy.get('id')) in known_ids:
+                    reached_known = True
+                    continue
+                if len(vacancies_data) >= limit:
+                    break
+                vacancy_info = self.process_api_vacancy(vacancy, keyword)
+                if vacancy_info:
+                    vacancies_data.append(vacancy_info)
+            
+            page += 1
+            if page >= data.get('pages', 1):
+                break
+        
+        self.metrics.add_total('search', page - max_pages)
+        print(f"🆕 Новых вакансий для '{keyword}': {len(vacancies_data)}")
+        return vacancies_data
+    
+    def deduplicate_vacancies(self, keywords, vacancies_by_keyword, area, seen_urls=None):
+        unique_vacancies = []
+        seen_urls = set() if seen_urls is None else seen_urls
+        for keyword in keywords:
+            api_vacancies = vacancies_by_keyword.pop(keyword, None)
+            if not api_vacancies:
+                continue
+            
+            print(f"✅ Найдено вакансий для '{keyword}': {len(api_vacancies)}")
+            self.remember_fetched(api_vacancies, area)
+            for vacancy in api_vacancies:
+                url = vacancy.get('Ссылка_на_вакансию', '')
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    unique_vacancies.append(vacancy)
+        return unique_vacancies
+    
+    def employer_key(self, vacancy):
+        return vacancy.get('employer_id') or vacancy.get('Компания')
+    
+    def collect_companies(self, vacancies_by_employer):
+        return [
+            (vacancies[0].get('Компания'), vacancies[0].get('employer_id'))
+            for key, vacancies in vacancies_by_employer.items() if key
+        ]
+    
+    def apply_websites(self, vacancies, websites):
+        for vacancy in vacancies:
+            company_website = websites.get(self.employer_key(vacancy))
+            vacancy['Сайт_компании'] = company_website if company_website else 'Не найден'
+        return vacancies
+    
+    def group_by_employer(self, vacancies):
+        vacancies_by_employer = {}
+        for vacancy in vacancies:
+            vacancies_by_employer.setdefault(self.employer_key(vacancy), []).append(vacancy)
+        return vacancies_by_employer
+    
+    def enrich_websites(self, vacancies_by_employer):
+        self.emit_rows(self.apply_websites(vacancies_by_employer.pop(None, []), {}))
+        
+        def on_resolved(key, website):
+            self.emit_rows(self.apply_websites(vacancies_by_employer.pop(key, []), {key: website}))
+        
+        companies = self.resume_websites(self.collect_companies(vacancies_by_employer), vacancies_by_employer)
+        self.resolve_company_websites(companies, on_resolved, self.fetch_employer_sites(companies))
+    
+    def pending_employer_ids(self, companies):
+        if not self.employer_sites:
+            return {}, []
+        
+        sites = {}
+        pending = []
+        for company_name, employer_id in companies:
+            if not employer_id or self.website_finder.cached_website(company_name, employer_id)[0]:
+                continue
+            
+            hit, site_url = self.website_cache.get_employer_site(employer_id) if self.website_cache else (False, None)
+            if hit:
+                sites[employer_id] = site_url
+            else:
+                pending.append(employer_id)
+        return sites, pending
+    
+    def remember_employer_sites(self, sites, pending, responses):
+        fetched = {}
+        for employer_id, data in zip(pending, responses):
+            if data is not None:
+                fetched[employer_id] = self.website_finder.employer_site_url(data.get('site_url'))
+        
+        if fetched and self.website_cache:
+            self.website_cache.set_employer_sites(fetched)
+        sites.update(fetched)
+        
+        found = sum(1 for site_url in sites.values() if site_url)
+        print(f"🏢 Сайты из профилей работодателей: {found} из {len(sites)} (запрошено у API: {len(pending)})")
+        return sites
+    
+    def fetch_employer_sites(self, companies):
+        sites, pending = self.pending_employer_ids(companies)
+        self.metrics.start_stage('employer_sites', len(pending))
+        if not pending:
+            self.metrics.finish_stage('employer_sites')
+            return sites
+        
+        def get_employer(employer_id):
+            data = self.api_client.get_employer(employer_id)
+            self.metrics.advance('employer_sites')
+            return data
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.api_workers, len(pending)))) as executor:
+            responses = list(executor.map(get_employer, pending))
+        self.metrics.finish_stage('employer_sites')
+        return self.remember_employer_sites(sites, pending, responses)
+    
+    def open_outputs(self, outputs):
+        self.close_outputs()
+        self.reset_totals()
+        self.output_paths = []
+        self.results = []
+        for path in outputs:
+            self.sinks.append(open_export_sink(path))
+    
+    def reset_totals(self):
+        self.rows_written = 0
+        self.sites_found = 0
+        self.keyword_stats = {}
+    
+    def emit_rows(self, rows):
+        for sink in self.sinks:
+            for row in rows:
+                sink.write(row)
+        if not self.sinks:
+            self.results.extend(rows)
+        
+        for row in rows:
+            self.rows_written += 1
+            if row.get('Сайт_компании') not in [None, 'Не найден']:
+                self.sites_found += 1
+            keyword = row.get('Ключевое_слово', 'Неизвестно')
+            self.keyword_stats[keyword] = self.keyword_stats.get(keyword, 0) + 1
+    
+    def close_outputs(self, discard=False):
+        output_paths = []
+        for sink in self.sinks:
+            try:
+                sink.close()
+                if discard:
+                    if os.path.isfile(sink.path):
+                        os.remove(sink.path)
+                else:
+                    output_paths.append(os.path.abspath(sink.path))
+            except Exception as e:
+                print(f"❌ Ошибка при сохранении {sink.path}: {e}")
+        
+        self.sinks = []
+        return output_paths
+    
+    def resolve_company_websites(self, companies, on_resolved=None, employer_sites=None):
+        websites = {}
+        self.metrics.start_stage('websites', len(companies))
+        if not companies:
+            self.metrics.finish_stage('websites')
+            return websites
+        
+        employer_sites = employer_sites or {}
+        workers = max(1, min(self.max_workers, len(companies)))
+        print(f"🌐 Поиск сайтов для {len(companies)} компаний (потоков: {workers})")
+        start_time = time.time()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.website_finder.lookup_company_website, company_name, employer_id,
+                                employer_sites.get(employer_id)): employer_id or company_name
+                for company_name, employer_id in companies
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    websites[key], tier = future.result()
+                except Exception as e:
+                    print(f"❌ Ошибка поиска сайта для {key}: {e}")
+                    websites[key], tier = None, 'error'
+                
+                self.metrics.record_lookup(tier)
+                self.metrics.advance('websites')
+                self.checkpoint_website(key, websites[key])
+                if on_resolved:
+                    on_resolved(key, websites[key])
+        
+        self.metrics.finish_stage('websites')
+        found = sum(1 for website in websites.values() if website)
+        print(f"🌐 Сайтов найдено: {found} из {len(companies)} за {time.time()-start_time:.2f}с")
+        return websites
+    
+    def search_via_api(self, keyword, area=113, per_page=100):
+        if self.api_workers > 1:
+            return self.search_keywords_parallel([keyword], area, per_page).get(keyword, [])
+        
+        max_pages = math.ceil(per_page / min(100, per_page))
+        vacancies_data = []
+        page = 0
+        
+        try:
+            while len(vacancies_data) < per_page:
+                data = self.api_client.search_vacancies(text=keyword, area=area, page=page, per_page=min(100, per_page - len(vacancies_data)))
+                page += 1
+                self.metrics.advance('search')
+                if not data or 'items' not in data or not data['items']:
+                    break
+                
+                items = data['items']
+                for vacancy in items:
+                    if len(vacancies_data) >= per_page:
+                        break
+                    vacancy_info = self.process_api_vacancy(vacancy, keyword)
+                    if vacancy_info:
+                        vacancies_data.append(vacancy_info)
+                
+                if page >= data.get('pages', 1):
+                    break
+            
+        except Exception as e:
+            print(f"❌ Ошибка поиска вакансий: {e}")
+        
+        self.metrics.add_total('search', page - max_pages)
+        return vacancies_data
+    
+    def search_keywords_parallel(self, keywords, area=113, limit=100):
+        queries = self.plan_queries(keywords, area, limit)
+        items_by_query = self.fetch_queries(queries, limit)
+        
+        items_by_keyword = {}
+        for (keyword, query_area, filters), items in zip(queries, items_by_query):
+            items_by_keyword.setdefault(keyword, []).extend(items)
+        
+        return self.assemble_keyword_items(items_by_keyword, limit)
+    
+    def plan_queries(self, keywords, area=113, limit=100):
+        queries = []
+        for keyword in dict.fromkeys(keywords):
+            if not self.slice_large_queries:
+                queries.append((keyword, area, {}))
+                continue
+            
+            planned = 0
+            for vacancy_slice in self.slice_planner.plan(keyword, area, limit):
+                queries.append((keyword, vacancy_slice['area'], vacancy_slice['filters']))
+                planned += vacancy_slice['found']
+                if planned >= limit:
+                    break
+        
+        return queries
+    
+    def fetch_queries(self, queries, limit=100):
+        page_size = min(100, limit)
+        max_pages = math.ceil(limit / page_size)
+        pages_by_query = [{} for _ in queries]
+        self.metrics.add_total('search', (len(queries) - len(dict.fromkeys(query[0] for query in queries))) * max_pages)
+        
+        with ThreadPoolExecutor(max_workers=self.api_workers) as executor:
+            first_pages = {
+                executor.submit(self.api_client.search_vacancies, keyword, query_area, 0, page_size, **filters): index
+                for index, (keyword, query_area, filters) in enumerate(queries)
+            }
+            
+            next_pages = {}
+            for future in as_completed(first_pages):
+                index = first_pages[future]
+                data = future.result()
+                self.metrics.advance('search')
+                if not data or not data.get('items'):
+                    self.metrics.add_total('search', 1 - max_pages)
+                    continue
+                
+                pages_by_query[index][0] = data['items']
+                keyword, query_area, filters = queries[index]
+                total_pages = min(data.get('pages', 1), max_pages)
+                self.metrics.add_total('search', total_pages - max_pages)
+                for page in range(1, total_pages):
+                    future = executor.submit(self.api_client.search_vacancies, keyword, query_area, page, page_size, **filters)
+                    next_pages[future] = (index, page)
+            
+            for future in as_completed(next_pages):
+                index, page = next_pages[future]
+                data = future.result()
+                self.metrics.advance('search')
+                if data and data.get('items'):
+                    pages_by_query[index][page] = data['items']
+        
+        return [[item for page in sorted(pages) for item in pages[page]] for pages in pages_by_query]
+    
+    def assemble_keyword_items(self, items_by_keyword, limit):
+        vacancies_by_keyword = {}
+        for keyword, items in items_by_keyword.items():
+            vacancies_data = []
+            for vacancy in items:
+                if len(vacancies_data) >= limit:
+                    break
+                vacancy_info = self.process_api_vacancy(vacancy, keyword)
+                if vacancy_info:
+                    vacancies_data.append(vacancy_info)
+            vacancies_by_keyword[keyword] = vacancies_data
+        
+        return vacancies_by_keyword
+    
+    def process_api_vacancy(self, vacancy, keyword):
+        try:
+            title = vacancy.get('name', 'Не указано')
+            company_info = vacancy.get('employer', {})
+            company_name = company_info.get('name', 'Не указано')
+            vacancy_url = vacancy.get('alternate_url', '')
+            
+            vacancy_data = {
+                'Название_вакансии': title,
+                'Ключевое_слово': keyword,
+                'Компания': company_name,
+                'Ссылка_на_вакансию': vacancy_url,
+                'Сайт_компании': None,
+                'Город': self.extract_area(vacancy),
+                'employer_id': company_info.get('id'),
+                'vacancy_id': vacancy.get('id'),
+                'published_at': vacancy.get('published_at'),
+                'area_id': (vacancy.get('area') or {}).get('id'),
+            }
+            vacancy_data.update(self.extract_salary(vacancy))
+            self.metrics.increment('vacancies_processed')
+            
+            return vacancy_data
+            
+        except Exception as e:
+            print(f"❌ Ошибка обработки вакансии: {e}")
+            return None
+    
+    def extract_salary(self, vacancy):
+        salary = vacancy.get('salary') or {}
+        return {
+            'salary_from': salary.get('from'),
+            'salary_to': salary.get('to'),
+            'salary_currency': salary.get('currency'),
+            'salary_gross': salary.get('gross'),
+        }
+    
+    def extract_area(self, vacancy):
+        area_info = vacancy.get('area', {})
+        return area_info.get('name', 'Не указан')
+    
+    def generate_filename(self, keywords):
+        main_keyword = keywords[0] if keywords else "vacancies"
+        clean_keyword = re.sub(r'[<>:"/\\|?*]', '', main_keyword).replace(' ', '_')[:50]
+        current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        return f"{clean_keyword}_{current_time}.xlsx"
+    
+    def save_to_excel(self, keywords, custom_filename=None, rows=None):
+        rows = self.results if rows is None else rows
+        if not rows:
+            print("❌ Нет данных для сохранения")
+            return False, None
+        
+        try:
+            if not os.path.exists('results'):
+                os.makedirs('results')
+            
+            filename = custom_filename if custom_filename else self.generate_filename(keywords)
+            filepath = os.path.join('results', filename)
+            
+            writer = ExcelStreamWriter(filepath)
+            for row in rows:
+                writer.write(row)
+            writer.close()
+            
+            full_path = os.path.abspath(filepath)
+            print(f"💾 Файл сохранен: {full_path}")
+            print(f"📝 Сохранено записей: {writer.rows_written}")
+            
+            sites_found = sum(1 for r in rows if r.get('Сайт_компании') not in [None, 'Не найден'])
+            print(f"🌐 Найдено сайтов компаний: {sites_found}")
+            
+            return True, full_path
+            
+        except Exception as e:
+            print(f"❌ Ошибка при сохранении: {e}")
+            return False, None
+    
+    def export_output(self, filename):
+        source = next((path for path in self.output_paths if path.lower().endswith('.xlsx')), None)
+        if not source:
+            print("❌ Нет данных для сохранения")
+            return False, None
+        
+        try:
+            shutil.copyfile(source, filename)
+            full_path = os.path.abspath(filename)
+            print(f"💾 Файл сохранен: {full_path}")
+            return True, full_path
+        
+        except Exception as e:
+            print(f"❌ Ошибка при сохранении: {e}")
+            return False, None
+    
+    def save_to_parquet(self, path=os.path.join('results', 'dataset.parquet'), rows=None):
+        rows = self.results if rows is None else rows
+        if not rows:
+            print("❌ Нет данных для сохранения")
+            return False, None
+        
+        try:
+            writer = ParquetDatasetWriter(path)
+            for row in rows:
+                writer.write(row)
+            writer.close()
+            
+            full_path = os.path.abspath(path)
+            print(f"💾 Датасет Parquet сохранен: {full_path}")
+            print(f"📝 Сохранено записей: {writer.rows_written}")
+            return True, full_path
+        
+        except Exception as e:
+            print(f"❌ Ошибка при сохранении Parquet: {e}")
+            return False, None
+    
+    def run_parser(self, keywords, area=113, total_vacancies=None, per_keyword=None, outputs=None):
+        self.metrics.reset()
+        self.pending_state = []
+        if self.owns_browser_pool:
+            self.website_finder.profiler.reset()
+        self.open_journal(keywords, area, total_vacancies, per_keyword)
+        try:
+            return self.run_engine(keywords, area, total_vacancies, per_keyword, outputs)
+        finally:
+            self.close_journal()
+    
+    def run_engine(self, keywords, area=113, total_vacancies=None, per_keyword=None, outputs=None):
+        if self.engine == 'async':
+            self.api_client.reset_stats()
+            return asyncio.run(AsyncHHParser(self).run_parser(keywords, area, total_vacancies, per_keyword, outputs))
+        if self.engine == 'processes':
+            self.api_client.reset_stats()
+            return ProcessShardedParser(self, self.process_workers).run_parser(
+                keywords, area, total_vacancies, per_keyword, outputs
+            )
+        if self.engine == 'queue':
+            self.api_client.reset_stats()
+            return QueueCoordinator(self, WorkQueue(self.queue_path), self.queue_run_id).run_parser(
+                keywords, area, total_vacancies, per_keyword, outputs
+            )
+        
+        print("🚀 ЗАПУСК ПАРСЕРА HH.RU")
+        print("=" * 50)
+        
+        self.api_client.reset_stats()
+        self.open_outputs(outputs or [os.path.join('results', self.generate_filename(keywords))])
+        try:
+            self.search_vacancies_hybrid(keywords, area, total_vacancies, per_keyword)
+        except Exception:
+            self.close_outputs()
+            raise
+        finally:
+            if self.owns_browser_pool:
+                self.browser_pool.close()
+        
+        return self.finish_run(keywords)
+    
+    def report_api_failures(self):
+        stats = self.api_client.stats
+        if not stats['retries'] and not stats['failures']:
+            return
+        
+        print(f"📡 Запросов к API: {stats['requests']}, повторов: {stats['retries']}, неудачных: {stats['failures']}")
+        for failure in self.api_client.failed_requests[:5]:
+            print(f"   ⚠️ {failure['url']} {failure['params']}: {failure['reason']}")
+        if stats['failures']:
+            print("⚠️ Часть страниц не загружена - результаты могут быть неполными")
+    
+    def report_lookup_tiers(self):
+        lookups = self.metrics.snapshot()['lookups']
+        if lookups:
+            print("🧭 Источники сайтов: " + ", ".join(f"{tier}: {count}" for tier, count in sorted(lookups.items())))
+    
+    def finish_run(self, keywords):
+        self.report_api_failures()
+        self.report_lookup_tiers()
+        if self.owns_browser_pool:
+            self.website_finder.profiler.print_report()
+        self.metrics.finish_run()
+        if self.rows_written:
+            output_paths = self.close_outputs()
+            self.output_paths = output_paths
+            success = bool(output_paths)
+            filepath = output_paths[0] if output_paths else None
+            
+            if success:
+                if self.journal:
+                    self.journal.finish()
+                for output_path in output_paths:
+                    print(f"💾 Файл сохранен: {output_path}")
+                print(f"📝 Сохранено записей: {self.rows_written}")
+                print(f"🌐 Найдено сайтов компаний: {self.sites_found}")
+                
+                self.commit_state()
+                print("✅ ПАРСИНГ УСПЕШНО ЗАВЕРШЕН!")
+                print(f"📊 Найдено вакансий: {self.rows_written}")
+                
+                print("📈 Статистика по ключевым словам:")
+                for keyword, count in self.keyword_stats.items():
+                    print(f"   '{keyword}': {count} вакансий")
+                
+            return self.rows_written, success, filepath
+        else:
+            self.close_outputs(discard=True)
+            self.commit_state()
+            if self.journal:
+                self.journal.finish()
+            print("❌ Вакансии не найдены")
+            return 0, False, None
+
+class AsyncHHApiClient:
+    def __init__(self, api_client, concurrency=100):
+        self.api_client = api_client
+        self.base_url = api_client.base_url
+        self.host_limiter = api_client.host_limiter
+        self.api_host = api_client.api_host
+        self.rate_limiter = api_client.rate_limiter
+        self.concurrency = concurrency
+        self.session = None
+    
+    async def open(self):
+        import aiohttp
+        
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=dict(self.api_client.session.headers),
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def search_vacancies(self, text, area=113, page=0, per_page=100, **filters):
+        url = f"{self.base_url}/vacancies"
+        params = {
+            'text': text,
+            'area': area,
+            'page': page,
+            'per_page': per_page,
+        }
+        params.update(filters)
+        
+        loop = asyncio.get_running_loop()
+        journal = self.api_client.journal
+        if journal:
+            data = await loop.run_in_executor(None, journal.page, params)
+            if data is not None:
+                return data
+        
+        try:
+            data = await self.request_json(url, params)
+        except Exception as e:
+            print(f"❌ Ошибка API: {e}")
+            return None
+        
+        if journal and data is not None:
+            await loop.run_in_executor(None, journal.record_page, params, data)
+        return data
+    
+    async def get_employer(self, employer_id):
+        try:
+            return await self.request_json(f"{self.base_url}/employers/{employer_id}")
+        except Exception as e:
+            print(f"❌ Ошибка API работодателя {employer_id}: {e}")
+            return None
+    
+    async def request_json(self, url, params=None):
+        import aiohttp
+        
+        api_client = self.api_client
+        breaker = api_client.breaker_for(url)
+        reason = None
+        for attempt in range(api_client.max_retries + 1):
+            if not breaker.allow():
+                reason = 'circuit open'
+                break
+            
+            if attempt:
+                api_client.count('retries')
+            api_client.count('requests')
+            await asyncio.sleep(self.rate_limiter.reserve())
+            try:
+                async with self.session.get(url, params=params) as response:
+                    outcome = api_client.classify_response(response.status, response.headers)
+                    reason = f"HTTP {response.status}"
+                    if outcome == 'ok':
+                        data = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                reason = f"{type(e).__name__}: {e}"
+                await asyncio.sleep(api_client.backoff_delay(attempt))
+                continue
+            
+            if outcome == 'throttled':
+                continue
+            if outcome == 'retry':
+                breaker.record_failure()
+                await asyncio.sleep(api_client.backoff_delay(attempt))
+                continue
+            
+            breaker.record_success()
+            if outcome == 'ok':
+                return data
+            if outcome == 'failed':
+                api_client.record_failure(url, params, reason)
+            return None
+        
+        api_client.record_failure(url, params, reason)
+        return None
+
+class AsyncBrowserPool:
+    def __init__(self, size=2, max_uses=50, headless=True, launch_args=None):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.headless = headless
+        self.launch_args = launch_args if launch_args is not None else BROWSER_LAUNCH_ARGS
+        self.playwright = None
+        self.browser = None
+        self.slots = None
+        self.lock = None
+    
+    async def start(self):
+        if self.slots is None:
+            self.lock = asyncio.Lock()
+            self.slots = asyncio.Queue()
+            for _ in range(self.size):
+                self.slots.put_nowait({})
+        
+        async with self.lock:
+            if self.playwright is None:
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+            if self.browser is None or not self.browser.is_connected():
+                self.browser = await self.playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+    
+    async def _new_context(self, profile):
+        options = profile['options']() if callable(profile['options']) else profile['options']
+        context = await self.browser.new_context(**options)
+        if profile.get('init_script'):
+            await context.add_init_script(profile['init_script'])
+        return context
+    
+    async def _close_quietly(self, resource):
+        try:
+            await resource.close()
+        except Exception:
+            pass
+    
+    async def run(self, profile, task):
+        await self.start()
+        contexts = await self.slots.get()
+        
+        try:
+            entry = contexts.get(profile['name'])
+            if entry is None or entry['browser'] is not self.browser:
+                entry = {'context': await self._new_context(profile), 'browser': self.browser, 'uses': 0}
+                contexts[profile['name']] = entry
+            
+            entry['uses'] += 1
+            page = await entry['context'].new_page()
+            try:
+                result = await task(page)
+            except CaptchaDetected:
+                contexts.pop(profile['name'], None)
+                await self._close_quietly(entry['context'])
+                raise
+            finally:
+                await self._close_quietly(page)
+            
+            if entry['uses'] >= self.max_uses:
+                await self._close_quietly(contexts.pop(profile['name'])['context'])
+            
+            return result
+        finally:
+            self.slots.put_nowait(contexts)
+    
+    async def close(self):
+        if self.slots is not None:
+            while not self.slots.empty():
+                for entry in self.slots.get_nowait().values():
+                    await self._close_quietly(entry['context'])
+            self.slots = None
+        
+        if self.browser is not None:
+            await self._close_quietly(self.browser)
+            self.browser = None
+        
+        if self.playwright is not None:
+            try:
+                await self.playwright.stop()
+            except Exception:
+                pass
+            self.playwright = None
+
+class AsyncCompanyWebsiteFinder:
+    def __init__(self, finder, browser_pool, concurrency=100):
+        self.finder = finder
+        self.browser_pool = browser_pool
+        self.concurrency = concurrency
+        self.session = None
+    
+    async def open(self):
+        import aiohttp
+        
+        self.finder.prepare_session()
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=dict(self.finder.session.headers),
+                connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=PROBE_CONNECTIONS_PER_HOST)
+            )
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def find_company_website(self, company_name, employer_id=None, site_url=None):
+        return (await self.lookup_company_website(company_name, employer_id, site_url))[0]
+    
+    async def lookup_company_website(self, company_name, employer_id=None, site_url=None):
+        if not company_name or company_name == "Не указано":
+            return None, 'skipped'
+        
+        loop = asyncio.get_running_loop()
+        hit, cached_site = await loop.run_in_executor(None, self.finder.cached_website, company_name, employer_id)
+        if hit:
+            return cached_site, 'cache'
+        
+        started = time.perf_counter()
+        website, tier = await self.resolve_company_website(company_name, site_url)
+        self.finder.profiler.record('resolve', time.perf_counter() - started, tier)
+        await loop.run_in_executor(None, self.finder.remember_website, company_name, website, employer_id)
+        return website, tier
+    
+    async def resolve_company_website(self, company_name, site_url=None):
+        if site_url:
+            print(f"✅ Найден в профиле работодателя: {company_name} → {site_url}")
+            return site_url, 'employer'
+        
+        start_time = time.time()
+        print(f"🔍 Поиск сайта для: {company_name}")
+        
+        known_site = await self.timed_tier('known', self.check_known_websites, company_name)
+        if known_site:
+            print(f"✅ Найден через известные сайты: {known_site}")
+            return known_site, 'known'
+        
+        generated_site = await self.timed_tier('generated', self.fast_generate_website_url, company_name)
+        if generated_site:
+            print(f"✅ Найден через генерацию: {generated_site}")
+            return generated_site, 'generated'
+        
+        playwright_site = await self.timed_tier('playwright', self.playwright_search_ultra_fast, company_name)
+        if playwright_site:
+            print(f"✅ Найден через Playwright: {playwright_site}")
+            return playwright_site, 'playwright'
+        
+        print(f"❌ Сайт не найден для: {company_name} (поиск занял {time.time()-start_time:.2f}с)")
+        return None, 'not_found'
+    
+    async def timed_tier(self, tier, resolver, company_name):
+        started = time.perf_counter()
+        website = await resolver(company_name)
+        self.finder.profiler.record(f'tier:{tier}', time.perf_counter() - started, 'hit' if website else 'miss')
+        return website
+    
+    async def ultra_fast_site_check(self, url):
+        started = time.perf_counter()
+        try:
+            alive = await self.probe_site(url)
+        except Exception as e:
+            self.finder.profiler.record('probe', time.perf_counter() - started, error_outcome(e))
+            return False
+        
+        self.finder.profiler.record('probe', time.perf_counter() - started, 'alive' if alive else 'dead')
+        return alive
+    
+    async def probe_site(self, url):
+        import aiohttp
+        
+        timeout = aiohttp.ClientTimeout(total=PROBE_TIMEOUT)
+        host_limiter = self.finder.host_limiter
+        await self.wait_for_host(url)
+        async with self.session.head(url, allow_redirects=True, timeout=timeout) as response:
+            host_limiter.report(url, response.status, response.headers)
+            if response.status not in HEAD_REJECTED_STATUSES:
+                return response.status == 200
+        
+        await self.wait_for_host(url)
+        async with self.session.get(url, allow_redirects=True, timeout=timeout,
+                                    headers={'Range': 'bytes=0-0'}) as response:
+            host_limiter.report(url, response.status, response.headers)
+            return response.status in (200, 206)
+    
+    async def wait_for_host(self, url):
+        delay = self.finder.host_limiter.reserve(url, PROBE_MAX_WAIT)
+        if delay is None:
+            raise HostThrottled(url)
+        await asyncio.sleep(delay)
+    
+    async def host_resolves(self, hostname):
+        cached = self.finder.cached_resolution(hostname)
+        if cached is not None:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.getaddrinfo(hostname, 443, type=socket.SOCK_STREAM), DNS_TIMEOUT)
+            resolves = True
+        except (socket.gaierror, UnicodeError):
+            resolves = False
+        except (asyncio.TimeoutError, OSError):
+            return False
+        
+        self.finder.remember_resolution(hostname, resolves)
+        return resolves
+    
+    async def first_live_url(self, urls, validator=None):
+        hostnames = list(dict.fromkeys(urlparse(url).hostname for url in urls if urlparse(url).hostname))
+        resolved = dict(zip(hostnames, await asyncio.gather(*(self.host_resolves(h) for h in hostnames))))
+        live_candidates = [url for url in urls if resolved.get(urlparse(url).hostname)]
+        if not live_candidates:
+            return None
+        
+        checks = await asyncio.gather(*(self.ultra_fast_site_check(url) for url in live_candidates))
+        for url, alive in zip(live_candidates, checks):
+            if alive and (validator is None or validator(url)):
+                return url
+        return None
+    
+    async def check_known_websites(self, company_name):
+        return await self.first_live_url(self.finder.known_website_candidates(company_name))
+    
+    async def fast_generate_website_url(self, company_name):
+        candidates = self.finder.generated_website_candidates(company_name)
+        website = await self.first_live_url(candidates, self.finder.is_valid_company_site)
+        self.finder.observe_generated_rank(candidates, website)
+        return website
+    
+    async def playwright_search_ultra_fast(self, company_name):
+        start_time = time.time()
+        
+        profiler = self.finder.profiler
+        for strategy_name in ['stealth', 'humanized', 'fast']:
+            if time.time() - start_time > self.finder.playwright_budget:
+                profiler.count(f'strategy:{strategy_name}', 'over_budget')
+                continue
+            
+            strategy = SERP_STRATEGIES[strategy_name]
+            search_url = self.finder.build_search_url(company_name, strategy)
+            delay = self.finder.host_limiter.reserve(search_url, SERP_MAX_WAIT)
+            if delay is None:
+                profiler.count(f'strategy:{strategy_name}', 'throttled')
+                return None
+            
+            strategy_start = time.perf_counter()
+            try:
+                await asyncio.sleep(delay)
+                result = await self.browser_pool.run(
+                    strategy['profile'],
+                    lambda page: self.serp_search(page, company_name, strategy)
+                )
+            except Exception as e:
+                if isinstance(e, CaptchaDetected):
+                    self.finder.host_limiter.report(search_url, captcha=True)
+                profiler.record(f'strategy:{strategy_name}', time.perf_counter() - strategy_start, error_outcome(e))
+                continue
+            
+            profiler.record(f'strategy:{strategy_name}', time.perf_counter() - strategy_start,
+                            'hit' if result else 'miss')
+            if result:
+                return result
+        
+        return None
+    
+    async def serp_search(self, page, company_name, strategy):
+        search_url = self.finder.build_search_url(company_name, strategy)
+        await page.goto(search_url, wait_until='domcontentloaded', timeout=strategy['timeout'])
+        
+        if strategy['settle_ms']:
+            await page.wait_for_timeout(strategy['settle_ms'])
+        
+        if strategy['captcha_selector'] and await page.query_selector(strategy['captcha_selector']):
+            raise CaptchaDetected(search_url)
+        
+        organic_links = []
+        for selector in strategy['selectors']:
+            organic_links.extend(await page.eval_on_selector_all(selector, SERP_LINKS_SCRIPT, strategy['links_per_selector']))
+        
+        best_url = self.finder.pick_serp_url(organic_links, company_name, strategy)
+        if best_url is None and strategy['fallback_links']:
+            fallback_links = await page.eval_on_selector_all('a[href*="http"]', SERP_LINKS_SCRIPT, strategy['fallback_links'])
+            best_url = self.finder.pick_fallback_serp_url(fallback_links, company_name)
+        
+        return best_url
+
+class AsyncHHParser:
+    def __init__(self, parser):
+        self.parser = parser
+        self.api_client = AsyncHHApiClient(parser.api_client, parser.async_concurrency)
+        self.browser_pool = AsyncBrowserPool(size=parser.browser_pool.size, max_uses=parser.browser_pool.max_uses)
+        self.website_finder = AsyncCompanyWebsiteFinder(parser.website_finder, self.browser_pool, parser.async_concurrency)
+        self.writer = None
+    
+    async def write(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.writer, function, *args)
+    
+    async def run_parser(self, keywords, area=113, total_vacancies=None, per_keyword=None, outputs=None):
+        print("🚀 ЗАПУСК ПАРСЕРА HH.RU (asyncio)")
+        print("=" * 50)
+        
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='async-writer')
+        try:
+            await self.write(self.parser.open_outputs,
+                             outputs or [os.path.join('results', self.parser.generate_filename(keywords))])
+            await self.api_client.open()
+            await self.website_finder.open()
+            try:
+                await self.search_vacancies_hybrid(keywords, area, total_vacancies, per_keyword)
+            except Exception:
+                await self.write(self.parser.close_outputs)
+                raise
+            finally:
+                await self.api_client.close()
+                await self.website_finder.close()
+                await self.browser_pool.close()
+            
+            return await self.write(self.parser.finish_run, keywords)
+        finally:
+            self.writer.shutdown(wait=False)
+    
+    async def search_vacancies_hybrid(self, keywords, area=113, total_vacancies=None, per_keyword=None):
+        unique_vacancies = await self.write(self.parser.resumed_vacancies, area)
+        if unique_vacancies is None:
+            unique_vacancies = await self.search_unique_vacancies(keywords, area, total_vacancies, per_keyword)
+        vacancies_by_employer = self.parser.group_by_employer(unique_vacancies)
+        del unique_vacancies
+        await self.enrich_websites(vacancies_by_employer)
+    
+    async def search_unique_vacancies(self, keywords, area=113, total_vacancies=None, per_keyword=None):
+        limit, limit_info = self.parser.resolve_keyword_limit(keywords, total_vacancies, per_keyword)
+        self.parser.start_search_stage(keywords, limit)
+        
+        if self.parser.incremental:
+            print(f"🆕 Поиск новых вакансий по {len(keywords)} ключевым словам ({limit_info})")
+            loop = asyncio.get_running_loop()
+            vacancies_by_keyword = await loop.run_in_executor(
+                None, self.parser.search_keywords_incremental, keywords, area, limit
+            )
+        else:
+            print(f"🔍 Поиск вакансий по {len(keywords)} ключевым словам ({limit_info}, asyncio)")
+            vacancies_by_keyword = await self.search_keywords(keywords, area, limit)
+        unique_vacancies = self.parser.deduplicate_vacancies(keywords, vacancies_by_keyword, area)
+        
+        self.parser.metrics.finish_stage('search')
+        print(f"📊 Итого уникальных вакансий: {len(unique_vacancies)}")
+        self.parser.metrics.increment('vacancies_unique', len(unique_vacancies))
+        await self.write(self.parser.checkpoint_vacancies, unique_vacancies)
+        return unique_vacancies
+    
+    async def search_keywords(self, keywords, area=113, limit=100):
+        loop = asyncio.get_running_loop()
+        queries = await loop.run_in_executor(None, self.parser.plan_queries, keywords, area, limit)
+        items_by_query = await self.fetch_queries(queries, limit)
+        
+        items_by_keyword = {}
+        for (keyword, query_area, filters), items in zip(queries, items_by_query):
+            items_by_keyword.setdefault(keyword, []).extend(items)
+        
+        return self.parser.assemble_keyword_items(items_by_keyword, limit)
+    
+    async def fetch_queries(self, queries, limit=100):
+        page_size = min(100, limit)
+        max_pages = math.ceil(limit / page_size)
+        pages_by_query = [{} for _ in queries]
+        metrics = self.parser.metrics
+        metrics.add_total('search', (len(queries) - len(dict.fromkeys(query[0] for query in queries))) * max_pages)
+        
+        first_pages = await asyncio.gather(*(
+            self.search_page(keyword, query_area, 0, page_size, filters)
+            for keyword, query_area, filters in queries
+        ))
+        
+        next_requests = []
+        for index, data in enumerate(first_pages):
+            if not data or not data.get('items'):
+                metrics.add_total('search', 1 - max_pages)
+                continue
+            
+            pages_by_query[index][0] = data['items']
+            total_pages = min(data.get('pages', 1), max_pages)
+            metrics.add_total('search', total_pages - max_pages)
+            next_requests.extend((index, page) for page in range(1, total_pages))
+        
+        next_pages = await asyncio.gather(*(
+            self.search_page(queries[index][0], queries[index][1], page, page_size, queries[index][2])
+            for index, page in next_requests
+        ))
+        for (index, page), data in zip(next_requests, next_pages):
+            if data and data.get('items'):
+                pages_by_query[index][page] = data['items']
+        
+        return [[item for page in sorted(pages) for item in pages[page]] for pages in pages_by_query]
+    
+    async def search_page(self, keyword, area, page, page_size, filters):
+        data = await self.api_client.search_vacancies(keyword, area, page, page_size, **filters)
+        self.parser.metrics.advance('search')
+        return data
+    
+    async def enrich_websites(self, vacancies_by_employer):
+        await self.write(self.parser.emit_rows, self.parser.apply_websites(vacancies_by_employer.pop(None, []), {}))
+        
+        def on_resolved(key, website):
+            self.parser.emit_rows(self.parser.apply_websites(vacancies_by_employer.pop(key, []), {key: website}))
+        
+        companies = await self.write(self.parser.resume_websites, self.parser.collect_companies(vacancies_by_employer),
+                                     vacancies_by_employer)
+        await self.resolve_company_websites(companies, on_resolved, await self.fetch_employer_sites(companies))
+    
+    async def fetch_employer_sites(self, companies):
+        loop = asyncio.get_running_loop()
+        sites, pending = await loop.run_in_executor(None, self.parser.pending_employer_ids, companies)
+        metrics = self.parser.metrics
+        metrics.start_stage('employer_sites', len(pending))
+        if not pending:
+            metrics.finish_stage('employer_sites')
+            return sites
+        
+        async def get_employer(employer_id):
+            data = await self.api_client.get_employer(employer_id)
+            metrics.advance('employer_sites')
+            return data
+        
+        responses = await asyncio.gather(*(get_employer(employer_id) for employer_id in pending))
+        metrics.finish_stage('employer_sites')
+        return await loop.run_in_executor(None, self.parser.remember_employer_sites, sites, pending, responses)
+    
+    async def resolve_company_websites(self, companies, on_resolved=None, employer_sites=None):
+        websites = {}
+        metrics = self.parser.metrics
+        metrics.start_stage('websites', len(companies))
+        if not companies:
+            metrics.finish_stage('websites')
+            return websites
+        
+        employer_sites = employer_sites or {}
+        print(f"🌐 Поиск сайтов для {len(companies)} компаний (asyncio, одновременно: {self.parser.async_concurrency})")
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(self.parser.async_concurrency)
+        
+        async def resolve(company_name, employer_id):
+            key = employer_id or company_name
+            async with semaphore:
+                try:
+                    websites[key], tier = await self.website_finder.lookup_company_website(
+                        company_name, employer_id, employer_sites.get(employer_id)
+                    )
+                except Exception as e:
+                    print(f"❌ Ошибка поиска сайта для {key}: {e}")
+                    websites[key], tier = None, 'error'
+            
+            metrics.record_lookup(tier)
+            metrics.advance('websites')
+            await self.write(self.parser.checkpoint_website, key, websites[key])
+            if on_resolved:
+                await self.write(on_resolved, key, websites[key])
+        
+        await asyncio.gather(*(resolve(company_name, employer_id) for company_name, employer_id in companies))
+        metrics.finish_stage('websites')
+        
+        found = sum(1 for website in websites.values() if website)
+        print(f"🌐 Сайтов найдено: {found} из {len(companies)} за {time.time()-start_time:.2f}с")
+        return websites
+
+process_parser = None
+
+def init_process_worker(settings, api_base_url, journal_path=None, run_key=None):
+    global process_parser
+    process_parser = HHParser(**settings)
+    process_parser.api_client.base_url = api_base_url
+    if journal_path:
+        process_parser.journal = RunJournal(journal_path)
+        process_parser.journal.attach(run_key)
+        process_parser.api_client.journal = process_parser.journal
+
+def search_shard(keywords, area, limit):
+    process_parser.api_client.reset_stats()
+    if process_parser.incremental:
+        vacancies_by_keyword = process_parser.search_keywords_incremental(keywords, area, limit)
+    else:
+        vacancies_by_keyword = process_parser.search_keywords_parallel(keywords, area, limit)
+    if process_parser.journal:
+        process_parser.journal.checkpoint(force=True)
+    return vacancies_by_keyword, process_parser.api_client.stats, process_parser.api_client.failed_requests
+
+def resolve_shard(companies, employer_sites):
+    process_parser.metrics.reset()
+    websites = process_parser.resolve_company_websites(companies, None, employer_sites)
+    return websites, process_parser.metrics.snapshot()['lookups']
+
+class ProcessShardedParser:
+    def __init__(self, parser, processes=None):
+        self.parser = parser
+        self.processes = max(1, processes or os.cpu_count() or 1)
+    
+    def worker_settings(self):
+        parser = self.parser
+        return {
+            'max_workers': parser.max_workers,
+            'cache_path': parser.website_cache.path if parser.website_cache else None,
+            'browser_pool_size': parser.browser_pool.size,
+            'browser_max_uses': parser.browser_pool.max_uses,
+            'api_workers': parser.api_workers,
+            'api_rate_limit': parser.api_rate_limit / self.processes,
+            'slice_large_queries': parser.slice_large_queries,
+            'incremental': parser.incremental,
+            'state_path': parser.state_path,
+            'known_websites_path': parser.known_websites_path,
+            'employer_sites': False,
+            'playwright_budget': parser.website_finder.playwright_budget,
+        }
+    
+    def shard(self, items):
+        count = max(1, min(len(items), self.processes * 4))
+        return [items[index::count] for index in range(count) if items[index::count]]
+    
+    def run_parser(self, keywords, area=113, total_vacancies=None, per_keyword=None, outputs=None):
+        parser = self.parser
+        print(f"🚀 ЗАПУСК ПАРСЕРА HH.RU (процессов: {self.processes})")
+        print("=" * 50)
+        
+        parser.open_outputs(outputs or [os.path.join('results', parser.generate_filename(keywords))])
+        try:
+            with ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=init_process_worker,
+                                     initargs=(self.worker_settings(), parser.api_client.base_url,
+                                               parser.journal.path if parser.journal else None,
+                                               parser.journal.run_key if parser.journal else None)) as executor:
+                self.search_vacancies_hybrid(executor, keywords, area, total_vacancies, per_keyword)
+        except Exception:
+            parser.close_outputs()
+            raise
+        finally:
+            if parser.owns_browser_pool:
+                parser.browser_pool.close()
+        
+        return parser.finish_run(keywords)
+    
+    def search_vacancies_hybrid(self, executor, keywords, area=113, total_vacancies=None, per_keyword=None):
+        unique_vacancies = self.parser.resumed_vacancies(area)
+        if unique_vacancies is None:
+            unique_vacancies = self.search_unique_vacancies(executor, keywords, area, total_vacancies, per_keyword)
+        vacancies_by_employer = self.parser.group_by_employer(unique_vacancies)
+        del unique_vacancies
+        self.enrich_websites(executor, vacancies_by_employer)
+    
+    def search_unique_vacancies(self, executor, keywords, area=113, total_vacancies=None, per_keyword=None):
+        parser = self.parser
+        limit, limit_info = parser.resolve_keyword_limit(keywords, total_vacancies, per_keyword)
+        unique_keywords = list(dict.fromkeys(keywords))
+        shards = self.shard(unique_keywords)
+        
+        print(f"🔍 Поиск вакансий по {len(keywords)} ключевым словам ({limit_info}, частей: {len(shards)})")
+        parser.metrics.start_stage('search', len(unique_keywords))
+        vacancies_by_keyword = {}
+        failed_shards = 0
+        futures = {executor.submit(search_shard, shard, area, limit): shard for shard in shards}
+        for future in as_completed(futures):
+            try:
+                shard_vacancies, api_stats, failed_requests = future.result()
+            except Exception as e:
+                print(f"❌ Ошибка поиска вакансий в процессе ({', '.join(futures[future])}): {e}")
+                parser.api_client.record_failure('search_shard', {'keywords': futures[future]}, str(e) or type(e).__name__)
+                parser.metrics.advance('search', len(futures[future]))
+                failed_shards += 1
+                continue
+            
+            vacancies_by_keyword.update(shard_vacancies)
+            parser.api_client.merge_stats(api_stats, failed_requests)
+            parser.metrics.increment('vacancies_processed', sum(len(items) for items in shard_vacancies.values()))
+            parser.metrics.advance('search', len(futures[future]))
+        unique_vacancies = parser.deduplicate_vacancies(keywords, vacancies_by_keyword, area)
+        
+        parser.metrics.finish_stage('search')
+        print(f"📊 Итого уникальных вакансий: {len(unique_vacancies)}")
+        parser.metrics.increment('vacancies_unique', len(unique_vacancies))
+        if failed_shards:
+            print(f"⚠️ Не выполнено частей поиска: {failed_shards} из {len(shards)} - результаты могут быть неполными")
+        else:
+            parser.checkpoint_vacancies(unique_vacancies)
+        return unique_vacancies
+    
+    def enrich_websites(self, executor, vacancies_by_employer):
+        parser = self.parser
+        parser.emit_rows(parser.apply_websites(vacancies_by_employer.pop(None, []), {}))
+        
+        companies = parser.resume_websites(parser.collect_companies(vacancies_by_employer), vacancies_by_employer)
+        self.resolve_company_websites(executor, companies, vacancies_by_employer, parser.fetch_employer_sites(companies))
+    
+    def resolve_company_websites(self, executor, companies, vacancies_by_employer, employer_sites=None):
+        parser = self.parser
+        websites = {}
+        parser.metrics.start_stage('websites', len(companies))
+        if not companies:
+            parser.metrics.finish_stage('websites')
+            return websites
+        
+        employer_sites = employer_sites or {}
+        shards = self.shard(companies)
+        print(f"🌐 Поиск сайтов для {len(companies)} компаний (процессов: {self.processes}, частей: {len(shards)})")
+        start_time = time.time()
+        
+        futures = {
+            executor.submit(resolve_shard, shard, {employer_id: employer_sites[employer_id]
+                                                   for company_name, employer_id in shard
+                                                   if employer_id in employer_sites}): shard
+            for shard in shards
+        }
+        for future in as_completed(futures):
+            try:
+                shard_websites, lookups = future.result()
+            except Exception as e:
+                print(f"❌ Ошибка поиска сайтов в процессе: {e}")
+                shard_websites = {employer_id or company_name: None for company_name, employer_id in futures[future]}
+                lookups = {'error': len(shard_websites)}
+            
+            websites.update(shard_websites)
+            for key, website in shard_websites.items():
+                parser.checkpoint_website(key, website)
+                parser.emit_rows(parser.apply_websites(vacancies_by_employer.pop(key, []), {key: website}))
+            for tier, count in lookups.items():
+                parser.metrics.record_lookup(tier, count)
+            parser.metrics.advance('websites', len(futures[future]))
+        
+        parser.metrics.finish_stage('websites')
+        found = sum(1 for website in websites.values() if website)
+        print(f"🌐 Сайтов найдено: {found} из {len(companies)} за {time.time()-start_time:.2f}с")
+        return websites
+
+class LeaseHeartbeat:
+    def __init__(self, queue, task_id, worker_id):
+        self.queue = queue
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+    
+    def run(self):
+        while not self.stopped.wait(self.queue.lease_seconds / 3):
+            self.queue.touch_worker(self.worker_id)
+            if not self.queue.extend(self.task_id, self.worker_id):
+                break
+    
+    def start(self):
+        self.thread.start()
+    
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+def execute_queue_task(parser, queue, task):
+    payload = task['payload']
+    if task['kind'] == 'search':
+        failures_before = parser.api_client.stats['failures']
+        query = (payload['keyword'], payload['area'], payload['filters'])
+        items = parser.fetch_queries([query], payload['limit'])[0]
+        if parser.api_client.stats['failures'] > failures_before:
+            raise RuntimeError("часть страниц не загружена")
+        
+        rows = []
+        for vacancy in items:
+            if len(rows) >= payload['limit']:
+                break
+            vacancy_info = parser.process_api_vacancy(vacancy, payload['keyword'])
+            if vacancy_info:
+                rows.append(vacancy_info)
+        queue.store_rows(task['run_id'], task['key'], payload['keyword'], rows)
+    elif task['kind'] == 'employers':
+        companies = [tuple(company) for company in payload['companies']]
+        websites = parser.resolve_company_websites(companies, None, parser.fetch_employer_sites(companies))
+        queue.store_websites(task['run_id'], websites)
+    else:
+        raise ValueError(f"Неизвестный тип задачи: {task['kind']}")
+
+def queue_run_parser(parser, queue, run_id, run_parsers):
+    run_parser = run_parsers.get(run_id)
+    settings = queue.run_settings(run_id).get('parser', {})
+    if run_parser is None:
+        run_parser = parser.spawn(**{name: settings[name] for name in ('employer_sites', 'slice_large_queries', 'max_workers')
+                                     if name in settings})
+        run_parser.api_workers = settings.get('api_workers', parser.api_workers)
+        run_parser.api_client = HHApiClient(host_limiter=HostRateLimiter({'api.hh.ru': parser.api_rate_limit}))
+        run_parser.api_client.base_url = parser.api_client.base_url
+        run_parser.slice_planner = VacancySlicePlanner(run_parser.api_client)
+        
+        known_websites_path = settings.get('known_websites_path')
+        if known_websites_path and known_websites_path != parser.known_websites_path:
+            if os.path.exists(known_websites_path):
+                run_parser.known_websites_path = known_websites_path
+                run_parser.website_finder = CompanyWebsiteFinder(cache=parser.website_cache, browser_pool=parser.browser_pool,
+                                                                 known_websites_path=known_websites_path,
+                                                                 host_limiter=parser.host_limiter,
+                                                                 playwright_budget=parser.website_finder.playwright_budget)
+            else:
+                print(f"⚠️ Справочник сайтов {known_websites_path} не найден на этом узле - используется {parser.known_websites_path}")
+        run_parsers[run_id] = run_parser
+    
+    api_rate_limit = settings.get('api_rate_limit', parser.api_rate_limit)
+    run_parser.api_client.rate_limiter.set_rate(api_rate_limit / max(1, queue.active_workers()))
+    return run_parser
+
+def run_queue_worker(queue, parser, worker_id=None, run_id=None, idle_exit=None, stop_event=None):
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+    stop_event = stop_event or threading.Event()
+    run_parsers = {}
+    processed = 0
+    idle_since = time.time()
+    
+    try:
+        while not stop_event.is_set():
+            queue.touch_worker(worker_id)
+            task = queue.lease(worker_id, run_id)
+            if task is None:
+                if idle_exit is not None and time.time() - idle_since >= idle_exit:
+                    break
+                stop_event.wait(QUEUE_POLL_INTERVAL)
+                continue
+            
+            heartbeat = LeaseHeartbeat(queue, task['id'], worker_id)
+            heartbeat.start()
+            try:
+                execute_queue_task(queue_run_parser(parser, queue, task['run_id'], run_parsers), queue, task)
+            except Exception as e:
+                print(f"❌ Задача {task['key']} запуска {task['run_id']} не выполнена (попытка {task['attempts']}): {e}")
+                queue.fail(task['id'], worker_id, e)
+            else:
+                queue.complete(task['id'], worker_id)
+                processed += 1
+            finally:
+                heartbeat.stop()
+            idle_since = time.time()
+    finally:
+        queue.remove_worker(worker_id)
+    
+    return processed
+
+class QueueCoordinator:
+    def __init__(self, parser, queue, run_id=None, employer_batch=QUEUE_EMPLOYER_BATCH):
+        self.parser = parser
+        self.queue = queue
+        self.run_id = run_id or f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{random.randrange(16 ** 4):04x}"
+        self.employer_batch = employer_batch
+        self.stop_event = threading.Event()
+        self.local_workers = []
+    
+    def worker_settings(self):
+        parser = self.parser
+        return {
+            'employer_sites': parser.employer_sites,
+            'slice_large_queries': parser.slice_large_queries,
+            'max_workers': parser.max_workers,
+            'api_workers': parser.api_workers,
+            'api_rate_limit': parser.api_rate_limit,
+            'known_websites_path': os.path.abspath(parser.known_websites_path),
+        }
+    
+    def start_local_workers(self):
+        for index in range(self.parser.queue_local_workers or 0):
+            worker_parser = self.parser.spawn()
+            worker = threading.Thread(
+                target=run_queue_worker,
+                args=(self.queue, worker_parser, f"{socket.gethostname()}-{os.getpid()}-local{index}",
+                      self.run_id, None, self.stop_event),
+                daemon=True
+            )
+            worker.start()
+            self.local_workers.append((worker, worker_parser))
+    
+    def stop_local_workers(self):
+        self.stop_event.set()
+        for worker, worker_parser in self.local_workers:
+            worker.join()
+            self.parser.api_client.merge_stats(worker_parser.api_client.stats, worker_parser.api_client.failed_requests)
+        self.local_workers = []
+    
+    def run_parser(self, keywords, area=113, total_vacancies=None, per_keyword=None, outputs=None):
+        parser = self.parser
+        print(f"🚀 ЗАПУСК ПАРСЕРА HH.RU (очередь {os.path.abspath(self.queue.path)}, запуск {self.run_id})")
+        print("=" * 50)
+        
+        try:
+            parser.open_outputs(outputs or [os.path.join('results', parser.generate_filename(keywords))])
+            self.start_local_workers()
+            try:
+                self.search_vacancies_hybrid(keywords, area, total_vacancies, per_keyword)
+            except Exception:
+                parser.close_outputs()
+                raise
+            finally:
+                self.stop_local_workers()
+                if parser.owns_browser_pool:
+                    parser.browser_pool.close()
+            
+            self.queue.finish_run(self.run_id)
+            self.report_failures()
+        finally:
+            self.queue.close()
+        return parser.finish_run(keywords)
+    
+    def search_vacancies_hybrid(self, keywords, area=113, total_vacancies=None, per_keyword=None):
+        parser = self.parser
+        limit, limit_info = parser.resolve_keyword_limit(keywords, total_vacancies, per_keyword)
+        queries = parser.plan_queries(keywords, area, limit)
+        
+        if self.queue.create_run(self.run_id, {'keywords': keywords, 'area': area, 'limit': limit,
+                                               'parser': self.worker_settings()}):
+            print(f"♻️ Продолжение запуска {self.run_id}")
+        task_keys = [self.task_key('search', query) for query in queries]
+        self.queue.discard_tasks(self.run_id, 'search', task_keys)
+        self.queue.add_tasks(self.run_id, 'search', [
+            (task_key, {'keyword': keyword, 'area': query_area, 'filters': filters, 'limit': limit})
+            for task_key, (keyword, query_area, filters) in zip(task_keys, queries)
+        ])
+        print(f"🔍 Поиск вакансий по {len(keywords)} ключевым словам ({limit_info}, задач: {len(queries)})")
+        self.wait_for('search', 'search')
+        
+        vacancies_by_keyword = {}
+        rows_by_task = self.queue.rows(self.run_id)
+        for task_key, (keyword, query_area, filters) in zip(task_keys, queries):
+            vacancies_by_keyword.setdefault(keyword, []).extend(rows_by_task.pop(task_key, []))
+        parser.metrics.increment('vacancies_processed', sum(len(rows) for rows in vacancies_by_keyword.values()))
+        for keyword in vacancies_by_keyword:
+            vacancies_by_keyword[keyword] = vacancies_by_keyword[keyword][:limit]
+        
+        unique_vacancies = parser.deduplicate_vacancies(keywords, vacancies_by_keyword, area)
+        print(f"📊 Итого уникальных вакансий: {len(unique_vacancies)}")
+        parser.metrics.increment('vacancies_unique', len(unique_vacancies))
+        vacancies_by_employer = parser.group_by_employer(unique_vacancies)
+        del unique_vacancies
+        self.enrich_websites(vacancies_by_employer)
+    
+    def task_key(self, kind, payload):
+        digest = hashlib.sha1(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{kind}:{digest[:16]}"
+    
+    def enrich_websites(self, vacancies_by_employer):
+        parser = self.parser
+        companies = parser.collect_companies(vacancies_by_employer)
+        resolved = self.queue.websites(self.run_id)
+        pending = [company for company in companies if str(company[1] or company[0]) not in resolved]
+        batches = [pending[index:index + self.employer_batch] for index in range(0, len(pending), self.employer_batch)]
+        task_keys = [self.task_key('employers', batch) for batch in batches]
+        self.queue.discard_tasks(self.run_id, 'employers', task_keys)
+        self.queue.add_tasks(self.run_id, 'employers', [
+            (task_key, {'companies': batch}) for task_key, batch in zip(task_keys, batches)
+        ])
+        
+        print(f"🌐 Поиск сайтов для {len(companies)} компаний (задач: {len(batches)})")
+        parser.metrics.start_stage('employer_sites', 0)
+        parser.metrics.finish_stage('employer_sites')
+        self.wait_for('employers', 'websites')
+        websites = self.queue.websites(self.run_id)
+        for key in list(vacancies_by_employer):
+            parser.emit_rows(parser.apply_websites(vacancies_by_employer.pop(key), websites))
+        
+        found = sum(1 for website in websites.values() if website)
+        print(f"🌐 Сайтов найдено: {found} из {len(companies)}")
+    
+    def wait_for(self, kind, stage):
+        metrics = self.parser.metrics
+        counts = self.queue.counts(self.run_id, kind)
+        metrics.start_stage(stage, sum(counts.values()))
+        reported = 0
+        last_print = time.time()
+        
+        while True:
+            counts = self.queue.counts(self.run_id, kind)
+            finished = counts['done'] + counts['failed']
+            if finished > reported:
+                metrics.advance(stage, finished - reported)
+                reported = finished
+            if not counts['pending'] and not counts['leased']:
+                break
+            
+            if time.time() - last_print >= 30:
+                print(f"⏳ Задачи {kind}: выполнено {finished} из {sum(counts.values())}, в работе {counts['leased']}")
+                last_print = time.time()
+            time.sleep(QUEUE_POLL_INTERVAL)
+        
+        metrics.finish_stage(stage)
+        return counts
+    
+    def report_failures(self):
+        failures = self.queue.failures(self.run_id)
+        if not failures:
+            return
+        
+        print(f"⚠️ Не выполнено задач: {self.queue.counts(self.run_id)['failed']} - результаты могут быть неполными")
+        for kind, task_key, attempts, error in failures:
+            print(f"   ⚠️ {task_key} (попыток: {attempts}): {error}")
+
+def get_region_id(region_name, api_client, default="113"):
+    if not region_name:
+        return default
+    
+    candidates = api_client.find_regions(region_name, limit=1)
+    if not candidates:
+        return default
+    
+    return candidates[0]['id']
+
+class HHParserGUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("HH.ru Parser")
+        self.root.minsize(700, 600)
+        self.center_window()
+        
+        self.parser = HHParser()
+        self.parsing = False
+        self.setup_ui()
+        self.load_regions_on_start()
+    
+    def center_window(self):
+        self.root.update_idletasks()
+        width = self.root.winfo_reqwidth()
+        height = self.root.winfo_reqheight()
+        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.root.winfo_screenheight() // 2) - (height // 2)
+        self.root.geometry(f"{width}x{height}+{x}+{y}")
+    
+    def load_regions_on_start(self):
+        self.progress_var.set("Загружаем регионы...")
+        threading.Thread(target=self._load_regions_thread, daemon=True).start()
+    
+    def _load_regions_thread(self):
+        try:
+            regions = self.parser.api_client.load_regions()
+            self.root.after(0, lambda: self.regions_loaded(regions))
+        except Exception as e:
+            self.root.after(0, lambda: self.regions_load_failed())
+    
+    def regions_loaded(self, regions):
+        if regions:
+            self.progress_var.set(f"Загружено {len(regions)} регионов")
+    
+    def regions_load_failed(self):
+        self.progress_var.set("Ошибка загрузки регионов")
+    
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.root, padding="15")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(9, weight=1)
+        
+        title_label = ttk.Label(main_frame, text="Поиск вакансий на HH.ru", font=('Arial', 14, 'bold'))
+        title_label.grid(row=0, column=0, columnspan=2, pady=(0, 15))
+        
+        ttk.Label(main_frame, text="Ключевые слова для поиска:", font=('Arial', 10)).grid(row=1, column=0, sticky=tk.W, pady=5)
+        
+        self.keywords_text = tk.Text(main_frame, height=5, width=70)
+        self.keywords_text.grid(row=2, column=0, columnspan=2, pady=5, sticky=(tk.W, tk.E))
+        self.keywords_text.insert(tk.END, "python\nменеджер\nаналитик\nразработчик")
+        
+        settings_frame = ttk.LabelFrame(main_frame, text="Настройки поиска")
+        settings_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
+        settings_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(settings_frame, text="Выберите регион:", font=('Arial', 10, 'bold')).grid(row=0, column=0, columnspan=2, sticky=tk.W, padx=5, pady=8)
+        
+        self.region_buttons_frame = ttk.Frame(settings_frame)
+        self.region_buttons_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=5)
+        self.region_buttons_frame.columnconfigure(0, weight=1)
+        self.region_buttons_frame.columnconfigure(1, weight=1)
+        self.region_buttons_frame.columnconfigure(2, weight=1)
+        
+        self.region_var = tk.StringVar(value="113")
+        
+        self.russia_rb = ttk.Radiobutton(self.region_buttons_frame, text="Вся Россия", variable=self.region_var, value="113")
+        self.russia_rb.grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        
+        self.moscow_rb = ttk.Radiobutton(self.region_buttons_frame, text="Москва", variable=self.region_var, value="1")
+        self.moscow_rb.grid(row=0, column=1, sticky=tk.W, padx=(0, 10))
+        
+        self.spb_rb = ttk.Radiobutton(self.region_buttons_frame, text="Санкт-Петербург", variable=self.region_var, value="2")
+        self.spb_rb.grid(row=0, column=2, sticky=tk.W)
+        
+        ttk.Label(settings_frame, text="Или введите город вручную:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=8)
+        self.custom_region_var = tk.StringVar()
+        self.custom_region_entry = ttk.Entry(settings_frame, textvariable=self.custom_region_var, width=30)
+        self.custom_region_entry.grid(row=2, column=1, sticky=tk.W, padx=5, pady=8)
+        
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Только новые вакансии с прошлого запуска", variable=self.incremental_var).grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
+        
+        self.resume_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Продолжить прерванный поиск", variable=self.resume_var).grid(row=4, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
+        
+        if hasattr(self.custom_region_var, 'trace_add'):
+            self.custom_region_var.trace_add('write', self.on_custom_region_change)
+        else:
+            self.custom_region_var.trace('w', self.on_custom_region_change)
+        
+        limits_frame = ttk.LabelFrame(main_frame, text="Лимиты вакансий")
+        limits_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
+        limits_frame.columnconfigure(1, weight=1)
+        
+        self.limit_mode = tk.StringVar(value="none")
+        
+        ttk.Radiobutton(limits_frame, text="Без лимита", variable=self.limit_mode, value="none").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Radiobutton(limits_frame, text="Общее количество вакансий:", variable=self.limit_mode, value="total").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        self.total_vacancies_var = tk.StringVar(value="100")
+        self.total_vacancies_entry = ttk.Entry(limits_frame, textvariable=self.total_vacancies_var, width=10)
+        self.total_vacancies_entry.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Radiobutton(limits_frame, text="На каждое ключевое слово:", variable=self.limit_mode, value="per_keyword").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+        self.per_keyword_var = tk.StringVar(value="50")
+        self.per_keyword_entry = ttk.Entry(limits_frame, textvariable=self.per_keyword_var, width=10)
+        self.per_keyword_entry.grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
+        
+        stats_frame = ttk.LabelFrame(main_frame, text="Статистика поиска")
+        stats_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
+        
+        self.stats_var = tk.StringVar(value="Вакансий найдено: 0")
+        stats_label = ttk.Label(stats_frame, textvariable=self.stats_var, font=('Arial', 11, 'bold'))
+        stats_label.grid(row=0, column=0, sticky=tk.W, padx=10, pady=8)
+        
+        self.progress_var = tk.StringVar(value="Загрузка регионов...")
+        progress_label = ttk.Label(stats_frame, textvariable=self.progress_var, font=('Arial', 9))
+        progress_label.grid(row=1, column=0, sticky=tk.W, padx=10, pady=4)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=6, column=0, columnspan=2, pady=15)
+        
+        self.parse_btn = ttk.Button(button_frame, text="Начать поиск", command=self.start_parsing, width=15)
+        self.parse_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.export_btn = ttk.Button(button_frame, text="Экспорт в Excel", command=self.export_to_excel, width=15)
+        self.export_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.progress = ttk.Progressbar(main_frame, mode='determinate', maximum=100)
+        self.progress.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
+    
+    def on_custom_region_change(self, *args):
+        custom_text = self.custom_region_var.get().strip()
+        if custom_text:
+            self.region_buttons_frame.grid_remove()
+        else:
+            self.region_buttons_frame.grid()
+    
+    def get_selected_region(self):
+        if self.custom_region_var.get().strip():
+            region_name = self.custom_region_var.get().strip()
+            return get_region_id(region_name, self.parser.api_client)
+        else:
+            return self.region_var.get()
+    
+    def get_vacancies_limits(self):
+        limit_mode = self.limit_mode.get()
+        
+        if limit_mode == "total":
+            try:
+                total = int(self.total_vacancies_var.get())
+                return total, None
+            except:
+                return None, None
+        elif limit_mode == "per_keyword":
+            try:
+                per_keyword = int(self.per_keyword_var.get())
+                return None, per_keyword
+            except:
+                return None, None
+        else:
+            return None, None
+    
+    def start_parsing(self):
+        keywords_text = self.keywords_text.get(1.0, tk.END).strip()
+        if not keywords_text:
+            messagebox.showerror("Ошибка", "Введите ключевые слова")
+            return
+        
+        keywords = [k.strip() for k in keywords_text.split('\n') if k.strip()]
+        area = self.get_selected_region()
+        total_vacancies, per_keyword = self.get_vacancies_limits()
+        
+        region_name = "Вся Россия"
+        if area == "1":
+            region_name = "Москва"
+        elif area == "2":
+            region_name = "Санкт-Петербург"
+        elif self.custom_region_var.get().strip():
+            region_name = self.custom_region_var.get().strip()
+        
+        limit_info = ""
+        if total_vacancies:
+            limit_info = f" (общий лимит: {total_vacancies})"
+        elif per_keyword:
+            limit_info = f" (на ключевое слово: {per_keyword})"
+        
+        self.parser.incremental = self.incremental_var.get()
+        if self.parser.incremental:
+            limit_info += " (только новые)"
+        self.parser.resume = self.resume_var.get()
+        
+        self.stats_var.set("Идет поиск вакансий...")
+        self.progress_var.set(f"Регион: {region_name}{limit_info}")
+        
+        thread = threading.Thread(target=self.run_parser, args=(keywords, area, total_vacancies, per_keyword))
+        thread.daemon = True
+        thread.start()
+        
+        self.parse_btn.config(state='disabled')
+        self.parsing = True
+        self.progress['value'] = 0
+        self.root.after(500, self.poll_progress)
+    
+    def poll_progress(self):
+        if not self.parsing:
+            return
+        
+        snapshot = self.parser.metrics.snapshot()
+        self.progress['value'] = snapshot['progress'] * 100
+        stage = snapshot['stage']
+        if stage:
+            entry = snapshot['stages'][stage]
+            eta = f", осталось ~{snapshot['eta']:.0f}с" if snapshot['eta'] is not None else ""
+            self.progress_var.set(f"{STAGE_TITLES.get(stage, stage)}: {entry['done']} из {entry['total']}{eta}")
+        self.stats_var.set(f"Обработано вакансий: {snapshot['counters'].get('vacancies_processed', 0)}")
+        self.root.after(500, self.poll_progress)
+    
+    def run_parser(self, keywords, area, total_vacancies, per_keyword):
+        try:
+            vacancies_count, success, filepath = self.parser.run_parser(keywords, int(area), total_vacancies, per_keyword)
+            self.root.after(0, lambda: self.parsing_completed(vacancies_count, success, filepath))
+        except Exception as e:
+            self.root.after(0, lambda: self.parsing_failed())
+    
+    def parsing_completed(self, vacancies_count, success, filepath):
+        self.parsing = False
+        self.progress['value'] = 100
+        self.parse_btn.config(state='normal')
+        
+        self.stats_var.set(f"Вакансий найдено: {vacancies_count}")
+        
+        if success:
+            self.progress_var.set("Поиск завершен!")
+            
+            if vacancies_count > 0:
+                messagebox.showinfo("Успех", f"Найдено {vacancies_count} вакансий\nФайл сохранен: {os.path.basename(filepath)}")
+            else:
+                messagebox.showinfo("Результат", "Вакансии не найдены")
+        else:
+            self.progress_var.set("Ошибка при сохранении")
+            messagebox.showerror("Ошибка", "Ошибка при сохранении данных")
+    
+    def parsing_failed(self):
+        self.parsing = False
+        self.progress['value'] = 0
+        self.parse_btn.config(state='normal')
+        self.stats_var.set("Вакансий найдено: 0")
+        self.progress_var.set("Ошибка при поиске")
+        messagebox.showerror("Ошибка", "Произошла ошибка при поиске")
+    
+    def export_to_excel(self):
+        if not self.parser.output_paths:
+            messagebox.showwarning("Предупреждение", "Нет данных для экспорта")
+            return
+        
+        keywords_text = self.keywords_text.get(1.0, tk.END).strip()
+        keywords = [k.strip() for k in keywords_text.split('\n') if k.strip()]
+        default_filename = self.parser.generate_filename(keywords)
+        
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            initialfile=default_filename
+        )
+        
+        if filename:
+            success, filepath = self.parser.export_output(filename)
+            if success:
+                messagebox.showinfo("Успех", f"Данные экспортированы в:\n{filepath}")
+
+def print_cache_entries(entries):
+    for entry in entries:
+        website = entry['website'] if entry['website'] else '—'
+        print(f"{entry['key']:<40} {entry['company_name'] or '':<40} {website:<40} {entry['created_at']}")
+
+def load_jobs(path):
+    with open(path, encoding='utf-8') as f:
+        loaded = json.load(f)
+    
+    if isinstance(loaded, list):
+        loaded = {'jobs': loaded}
+    defaults = loaded.get('defaults', {})
+    
+    jobs = []
+    for index, job_config in enumerate(loaded.get('jobs', []), start=1):
+        job = dict(defaults)
+        job.update(job_config)
+        job.setdefault('name', f"job-{index}")
+        jobs.append(normalize_job(job))
+    return jobs
+
+def normalize_job(job):
+    keywords = job.get('keywords') or []
+    if isinstance(keywords, str):
+        keywords = keywords.split(',')
+    keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+    if not keywords:
+        raise ValueError(f"Задание {job.get('name')}: не указаны ключевые слова")
+    
+    outputs = job.get('outputs') or []
+    if isinstance(outputs, str):
+        outputs = [outputs]
+    
+    settings = {name: job[name] for name in JOB_PARSER_SETTINGS if name in job}
+    return {
+        'name': job.get('name', 'job'),
+        'keywords': keywords,
+        'area': str(job.get('area', '113')),
+        'per_keyword': job.get('per_keyword'),
+        'total_vacancies': job.get('total_vacancies'),
+        'outputs': outputs or None,
+        'settings': settings,
+    }
+
+class EventLog:
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+    
+    def listener(self, job_name):
+        def write(event):
+            line = json.dumps(dict(event, job=job_name), ensure_ascii=False)
+            with self.lock:
+                self.file.write(line + '\n')
+                self.file.flush()
+        return write
+    
+    def close(self):
+        self.file.close()
+
+def write_metrics(path, metrics_by_job):
+    if path.endswith('.prom'):
+        text = ''.join(metrics.to_prometheus({'job': name}) for name, metrics in sorted(metrics_by_job.items()))
+    else:
+        snapshots = {name: metrics.snapshot() for name, metrics in sorted(metrics_by_job.items())}
+        text = json.dumps(snapshots, ensure_ascii=False, indent=2)
+    
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+def run_job(parser, job, metrics_by_job=None, event_log=None):
+    job_parser = parser.spawn(**job['settings'])
+    job_parser.job_name = job['name']
+    if metrics_by_job is not None:
+        metrics_by_job[job['name']] = job_parser.metrics
+    if event_log:
+        job_parser.metrics.add_listener(event_log.listener(job['name']))
+    area = job['area']
+    if not area.isdigit():
+        area = get_region_id(area, job_parser.api_client, default=None)
+        if area is None:
+            raise ValueError(f"Регион не найден: {job['area']}")
+    
+    print(f"📋 Задание {job['name']}: {', '.join(job['keywords'])} (регион {area})")
+    start_time = time.time()
+    vacancies_count, success, filepath = job_parser.run_parser(
+        job['keywords'], int(area), job['total_vacancies'], job['per_keyword'], job['outputs']
+    )
+    return {'name': job['name'], 'vacancies': vacancies_count, 'success': success,
+            'filepath': filepath, 'elapsed': time.time() - start_time}
+
+def run_jobs(jobs, parallel=1, metrics_path=None, events_path=None, profile_path=None, **parser_options):
+    parser = HHParser(**parser_options)
+    metrics_by_job = {}
+    event_log = EventLog(events_path) if events_path else None
+    summaries = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+            futures = {executor.submit(run_job, parser, job, metrics_by_job, event_log): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    print(f"❌ Задание {job['name']} завершилось с ошибкой: {e}")
+                    summaries.append({'name': job['name'], 'vacancies': 0, 'success': False,
+                                      'filepath': None, 'elapsed': 0, 'error': str(e)})
+                if metrics_path:
+                    write_metrics(metrics_path, metrics_by_job)
+    finally:
+        parser.browser_pool.close()
+        if event_log:
+            event_log.close()
+    
+    print("=" * 50)
+    for summary in sorted(summaries, key=lambda summary: summary['name']):
+        status = '❌' if summary.get('error') or not summary['success'] else '✅'
+        print(f"{status} {summary['name']}: {summary['vacancies']} вакансий за {summary['elapsed']:.1f}с"
+              f"{' → ' + summary['filepath'] if summary['filepath'] else ''}")
+    
+    profiler = parser.website_finder.profiler
+    profiler.print_report()
+    if profile_path:
+        directory = os.path.dirname(profile_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(profile_path, 'w', encoding='utf-8') as f:
+            json.dump(profiler.report(), f, ensure_ascii=False, indent=2)
+        print(f"⏱️ Профиль сохранен: {os.path.abspath(profile_path)}")
+    return summaries
+
+def run_cli(argv):
+    arg_parser = argparse.ArgumentParser(prog='main.py', description='HH.ru Parser')
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+    
+    cache_parser = subparsers.add_parser('cache', help='Кэш сайтов компаний')
+    cache_parser.add_argument('action', choices=['info', 'list', 'purge'])
+    cache_parser.add_argument('--path', default=os.path.join(CACHE_DIR, 'websites.sqlite3'))
+    cache_parser.add_argument('--search', help='Фильтр по названию компании, сайту или ключу')
+    cache_parser.add_argument('--limit', type=int, default=50)
+    cache_parser.add_argument('--mode', choices=['expired', 'negative', 'all', 'match'], default='expired',
+                              help='Какие записи удалять при purge')
+    
+    brands_parser = subparsers.add_parser('brands', help='Справочник известных брендов')
+    brands_parser.add_argument('action', choices=['info', 'validate', 'import'])
+    brands_parser.add_argument('file', nargs='?', help='CSV (brand,значение) или JSON для validate/import')
+    brands_parser.add_argument('--dataset', choices=sorted(BRAND_DATASETS), default='known',
+                               help='known — бренд → домен, exceptions — бренд → латиница')
+    brands_parser.add_argument('--replace', action='store_true', help='Заменить справочник вместо слияния')
+    
+    jobs_parser = subparsers.add_parser('run', help='Запуск без GUI: задания из JSON-файла или из аргументов')
+    jobs_parser.add_argument('jobs_file', nargs='?', help='JSON-файл с заданиями')
+    jobs_parser.add_argument('-k', '--keyword', action='append', help='Ключевое слово (можно несколько)')
+    jobs_parser.add_argument('--area', default='113', help='id или название региона')
+    jobs_parser.add_argument('--per-keyword', type=int)
+    jobs_parser.add_argument('--total', type=int, help='Общий лимит вакансий')
+    jobs_parser.add_argument('-o', '--output', action='append', help='Файл результата (.xlsx, .csv, .jsonl, .parquet)')
+    jobs_parser.add_argument('--engine', choices=['threads', 'async', 'processes', 'queue'])
+    jobs_parser.add_argument('--processes', type=int, help='Число процессов для --engine processes (по умолчанию - все ядра)')
+    jobs_parser.add_argument('--queue', help='Файл очереди задач для --engine queue')
+    jobs_parser.add_argument('--run-id', help='Идентификатор запуска в очереди (для продолжения)')
+    jobs_parser.add_argument('--local-workers', type=int, help='Сколько обработчиков очереди запустить на координаторе')
+    jobs_parser.add_argument('--incremental', action='store_true')
+    jobs_parser.add_argument('--resume', action='store_true', help='Продолжить прерванный запуск с контрольной точки')
+    jobs_parser.add_argument('--parallel', type=int, default=1, help='Сколько заданий выполнять одновременно')
+    jobs_parser.add_argument('--only', action='append', help='Выполнить только задания с этим именем')
+    jobs_parser.add_argument('--metrics', help='Файл метрик: .prom (Prometheus) или .json')
+    jobs_parser.add_argument('--events', help='JSONL-файл с событиями прогресса')
+    jobs_parser.add_argument('--profile', help='JSON-файл с профилем задержек поиска сайтов')
+    
+    queue_parser = subparsers.add_parser('queue', help='Распределенная очередь задач')
+    queue_parser.add_argument('action', choices=['work', 'status'])
+    queue_parser.add_argument('--queue', default=os.path.join(CACHE_DIR, 'queue.sqlite3'))
+    queue_parser.add_argument('--run-id', help='Обрабатывать только задачи этого запуска')
+    queue_parser.add_argument('--threads', type=int, default=1, help='Сколько обработчиков запустить на узле')
+    queue_parser.add_argument('--idle-exit', type=float, default=60, help='Завершиться, если задач нет столько секунд')
+    queue_parser.add_argument('--cache', default=os.path.join(CACHE_DIR, 'websites.sqlite3'), help='Кэш сайтов')
+    
+    regions_parser = subparsers.add_parser('regions', help='Справочник регионов HH.ru')
+    regions_parser.add_argument('action', choices=['search', 'refresh'])
+    regions_parser.add_argument('query', nargs='?', help='Название региона для search')
+    regions_parser.add_argument('--limit', type=int, default=5)
+    
+    args = arg_parser.parse_args(argv)
+    
+    if args.command == 'cache':
+        cache = WebsiteCache(args.path)
+        try:
+            if args.action == 'info':
+                stats = cache.stats()
+                print(f"📦 Кэш: {os.path.abspath(cache.path)}")
+                print(f"   Всего записей: {stats['total']}")
+                print(f"   С сайтом: {stats['positive']}")
+                print(f"   Без сайта: {stats['negative']}")
+                print(f"   Устаревших: {stats['expired']}")
+            elif args.action == 'list':
+                print_cache_entries(cache.entries(args.search, args.limit))
+            elif args.action == 'purge':
+                if args.mode == 'match' and not args.search:
+                    print("❌ Для режима match укажите --search")
+                    return 1
+                removed = cache.purge(args.mode, args.search)
+                print(f"🗑️ Удалено записей: {removed}")
+        finally:
+            cache.close()
+    
+    if args.command == 'brands':
+        return run_brands_command(args)
+    
+    if args.command == 'run':
+        return run_jobs_command(args)
+    
+    if args.command == 'queue':
+        return run_queue_command(args)
+    
+    if args.command == 'regions':
+        api_client = HHApiClient()
+        if args.action == 'refresh':
+            return 0 if api_client.load_regions(refresh=True) else 1
+        
+        if not args.query:
+            print("❌ Укажите название региона")
+            return 1
+        
+        candidates = api_client.find_regions(args.query, args.limit)
+        if not candidates:
+            print(f"❌ Регион не найден: {args.query}")
+            return 1
+        for candidate in candidates:
+            print(f"   {candidate['id']:>6}  {candidate['path']}  ({candidate['score']:.2f})")
+    
+    return 0
+
+def run_jobs_command(args):
+    overrides = {}
+    if args.engine:
+        overrides['engine'] = args.engine
+    if args.processes:
+        overrides['process_workers'] = args.processes
+    if args.queue:
+        overrides['queue_path'] = args.queue
+    if args.run_id:
+        overrides['queue_run_id'] = args.run_id
+    if args.local_workers is not None:
+        overrides['queue_local_workers'] = args.local_workers
+    if args.incremental:
+        overrides['incremental'] = True
+    if args.resume:
+        overrides['resume'] = True
+    
+    try:
+        if args.jobs_file:
+            jobs = load_jobs(args.jobs_file)
+        elif args.keyword:
+            jobs = [normalize_job({'name': 'cli', 'keywords': args.keyword, 'area': args.area,
+                                   'per_keyword': args.per_keyword, 'total_vacancies': args.total,
+                                   'outputs': args.output})]
+        else:
+            print("❌ Укажите файл заданий или ключевые слова (-k)")
+            return 1
+    except (OSError, ValueError) as e:
+        print(f"❌ Не удалось загрузить задания: {e}")
+        return 1
+    
+    if args.only:
+        jobs = [job for job in jobs if job['name'] in args.only]
+    if not jobs:
+        print("❌ Нет заданий для запуска")
+        return 1
+    
+    for job in jobs:
+        job['settings'].update(overrides)
+        if args.run_id and len(jobs) > 1:
+            job['settings']['queue_run_id'] = f"{args.run_id}-{job['name']}"
+    
+    summaries = run_jobs(jobs, args.parallel, metrics_path=args.metrics, events_path=args.events,
+                         profile_path=args.profile)
+    if args.metrics:
+        print(f"📊 Метрики сохранены: {os.path.abspath(args.metrics)}")
+    return 1 if any(summary.get('error') or not summary['success'] for summary in summaries) else 0
+
+def run_queue_command(args):
+    queue = WorkQueue(args.queue)
+    try:
+        if args.action == 'status':
+            runs = queue.runs()
+            if not runs:
+                print("📭 Очередь пуста")
+            for run_id, status, created_at, finished_at in runs:
+                counts = queue.counts(run_id)
+                print(f"   {run_id}  {status:<9} {datetime.fromtimestamp(created_at):%Y-%m-%d %H:%M}  "
+                      f"ожидают {counts['pending']}, в работе {counts['leased']}, "
+                      f"готово {counts['done']}, ошибок {counts['failed']}")
+            return 0
+        
+        parser = HHParser(cache_path=args.cache)
+        print(f"🛠️ Обработчики очереди: {args.threads} ({os.path.abspath(queue.path)})")
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, args.threads)) as executor:
+                futures = [
+                    executor.submit(run_queue_worker, queue, parser.spawn(),
+                                    f"{socket.gethostname()}-{os.getpid()}-{index}", args.run_id, args.idle_exit)
+                    for index in range(max(1, args.threads))
+                ]
+                processed = sum(future.result() for future in futures)
+        finally:
+            parser.browser_pool.close()
+        print(f"✅ Выполнено задач: {processed}")
+        return 0
+    finally:
+        queue.close()
+
+def run_brands_command(args):
+    dataset_path, value_column = BRAND_DATASETS[args.dataset]
+    
+    if args.action == 'info':
+        matcher = BrandMatcher.load(dataset_path)
+        print(f"📚 Справочник: {dataset_path}")
+        print(f"   Записей: {len(matcher.entries)}")
+        print(f"   Узлов автомата: {len(matcher.transitions)}")
+        print(f"   Индекс: {os.path.abspath(BrandMatcher.index_path(dataset_path))}")
+        return 0
+    
+    source_path = args.file or dataset_path
+    if args.action == 'import' and not args.file:
+        print("❌ Укажите файл для импорта")
+        return 1
+    
+    try:
+        rows = read_brand_entries(source_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Не удалось прочитать {source_path}: {e}")
+        return 1
+    
+    entries, problems = validate_brand_entries(rows, value_column)
+    for problem in problems:
+        print(f"⚠️ {problem}")
+    
+    if args.action == 'validate':
+        print(f"{'✅' if not problems else '❌'} Проверено записей: {len(rows)}, корректных: {len(entries)}, замечаний: {len(problems)}")
+        return 0 if not problems else 1
+    
+    current = {}
+    if not args.replace and os.path.exists(dataset_path):
+        current = dict(read_brand_entries(dataset_path))
+    
+    added = sum(1 for brand in entries if brand not in current)
+    updated = sum(1 for brand, value in entries.items() if brand in current and current[brand] != value)
+    current.update(entries)
+    write_brand_entries(dataset_path, current, value_column)
+    BrandMatcher.load(dataset_path)
+    
+    print(f"✅ Импортировано в {dataset_path}: добавлено {added}, обновлено {updated}, всего {len(current)}")
+    return 0
+
+def load_tk():
+    global tk, ttk, filedialog, messagebox
+    try:
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox
+    except ImportError:
+        return False
+    return True
+
+def run_gui():
+    if not load_tk():
+        print("❌ tkinter не установлен - используйте командный режим: python main.py run --help")
+        return 1
+    
+    root = tk.Tk()
+    app = HHParserGUI(root)
+    
+    try:
+        root.mainloop()
+    finally:
+        pass
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+    
+    sys.exit(run_gui())
\ No newline at end of file
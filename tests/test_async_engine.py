@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import aiohttp  # noqa: F401 - import it up front so its one-time load does not count as loop lag
+
+import main
+import throughput
+from mock_server import MockServer
+
+SLOW = 0.3
+
+
+class Args:
+    api_rate = 1000
+    workers = 4
+    serp = False
+
+
+class SlowSink:
+    def __init__(self, path):
+        self.path = path
+        self.rows = []
+    
+    def write(self, row):
+        time.sleep(SLOW)
+        self.rows.append(row)
+    
+    def close(self):
+        time.sleep(SLOW)
+
+
+def slow(function):
+    def wrapper(*args, **kwargs):
+        time.sleep(SLOW)
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def run_with_heartbeat(parser, keywords, per_keyword, outputs):
+    lags = []
+    
+    async def heartbeat(done):
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - started - 0.01)
+    
+    async def scenario():
+        done = asyncio.Event()
+        beat = asyncio.create_task(heartbeat(done))
+        try:
+            return await main.AsyncHHParser(parser).run_parser(keywords, 113, None, per_keyword, outputs)
+        finally:
+            done.set()
+            await beat
+    
+    parser.open_journal(keywords, 113, None, per_keyword)
+    try:
+        return asyncio.run(scenario()), max(lags)
+    finally:
+        parser.close_journal()
+
+
+def test_async_engine_keeps_disk_work_off_the_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'open_export_sink', SlowSink)
+    monkeypatch.setattr(main.RunJournal, 'record_page', slow(main.RunJournal.record_page))
+    monkeypatch.setattr(main.RunJournal, 'record_website', slow(main.RunJournal.record_website))
+    monkeypatch.setattr(main.WebsiteCache, 'get', slow(main.WebsiteCache.get))
+    monkeypatch.setattr(main.WebsiteCache, 'set', slow(main.WebsiteCache.set))
+    
+    with MockServer(vacancies=100, companies=4) as mock:
+        parser = throughput.make_parser(mock, str(tmp_path), Args(), engine='async',
+                                        journal_path=str(tmp_path / 'journal.sqlite3'))
+        parser.website_cache = main.WebsiteCache(str(tmp_path / 'websites.sqlite3'))
+        parser.website_finder.cache = parser.website_cache
+        (vacancies_count, success, filepath), max_lag = run_with_heartbeat(
+            parser, ['python'], 10, [str(tmp_path / 'run.csv')]
+        )
+    
+    assert success
+    assert vacancies_count == 10
+    assert max_lag < SLOW / 2
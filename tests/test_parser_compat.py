@@ -0,0 +1,40 @@
+import os
+
+import throughput
+from mock_server import MockServer
+
+
+class Args:
+    api_rate = 1000
+    workers = 4
+    serp = False
+
+
+def test_search_then_save_to_excel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with MockServer(vacancies=200, companies=10) as mock:
+        parser = throughput.make_parser(mock, str(tmp_path), Args())
+        results = parser.search_vacancies_hybrid(['python'], 113, per_keyword=50)
+        
+        assert results is parser.results
+        assert len(parser.results) == 50
+        assert all('Сайт_компании' in row for row in parser.results)
+        
+        success, filepath = parser.save_to_excel(['python'])
+        assert success
+        assert os.path.isfile(filepath)
+
+
+def test_run_parser_streams_without_keeping_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with MockServer(vacancies=200, companies=10) as mock:
+        parser = throughput.make_parser(mock, str(tmp_path), Args())
+        vacancies_count, success, filepath = parser.run_parser(
+            ['python'], 113, per_keyword=50, outputs=[str(tmp_path / 'run.csv')]
+        )
+        
+        assert success
+        assert vacancies_count == 50
+        assert parser.results == []
+        with open(filepath, encoding='utf-8-sig') as f:
+            assert len(f.read().splitlines()) == 51
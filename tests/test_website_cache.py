@@ -0,0 +1,38 @@
+import time
+
+import main
+
+
+def make_cache(tmp_path):
+    return main.WebsiteCache(str(tmp_path / 'websites.sqlite3'), positive_ttl=100, negative_ttl=10)
+
+
+def age_employer_sites(cache, seconds):
+    cache.conn.execute('UPDATE employer_sites SET fetched_at = ?', (time.time() - seconds,))
+    cache.conn.commit()
+
+
+def test_employer_site_misses_use_negative_ttl(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set_employer_sites({'1': 'https://one.ru', '2': None})
+    age_employer_sites(cache, 50)
+    
+    assert cache.get_employer_site('1') == (True, 'https://one.ru')
+    assert cache.get_employer_site('2') == (False, None)
+    
+    age_employer_sites(cache, 150)
+    assert cache.get_employer_site('1') == (False, None)
+
+
+def test_expired_purge_removes_employer_sites(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set_employer_sites({'1': 'https://one.ru', '2': None})
+    age_employer_sites(cache, 50)
+    
+    cache.purge('expired')
+    rows = cache.conn.execute('SELECT employer_id FROM employer_sites').fetchall()
+    assert rows == [('1',)]
+    
+    age_employer_sites(cache, 150)
+    cache.purge('expired')
+    assert cache.conn.execute('SELECT COUNT(*) FROM employer_sites').fetchone()[0] == 0